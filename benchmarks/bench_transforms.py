@@ -0,0 +1,279 @@
+"""Бенчмарки чистых преобразований, выполняемых на каждом перезапуске скрипта."""
+
+from __future__ import annotations
+
+import re
+from collections import defaultdict
+
+import pandas as pd
+
+from benchmarks.harness import benchmark, check
+from benchmarks.oracles import (
+    format_search_results,
+    process_branches_changes,
+    process_product_changes,
+    regex_format_date_str,
+    regex_format_dates_inplace,
+    scan_reverse_lookup,
+    traverse_get_value,
+)
+from benchmarks.payloads import (
+    DOC_SIZES,
+    PAGE_SIZES,
+    fresh_document,
+    merged_certificate,
+    merged_declaration,
+    results_frames,
+    results_frames_selected,
+    search_items,
+)
+from src.generate_preview.new_cert_api_values import data_to_api, render_data_to_api
+from src.generate_preview.preview_templates import (
+    CERTIFICATE_PREVIEW_TEMPLATE,
+    preview_template,
+    render_certificate_preview,
+)
+from src.manual_db_update.table_diff import diff_tables
+from src.api.document_updater import Manufacturer
+from src.manual_db_update.updater_handlers import (
+    parse_branches,
+    process_table_changes,
+)
+from src.ui.model import TableColumns
+from src.ui.results_frame import format_search_results_frame
+from src.ui.ui_components import _flatten_with_paths
+from src.utils import json_path_registry
+from src.utils.json_path_registry import (
+    ALL_PATHS,
+    _format_date_str,
+    extract_many,
+    format_dates_inplace,
+    get_value,
+    reverse_lookup,
+)
+
+_EDITABLE_COLS = {
+    TableColumns.PRODUCT, TableColumns.DESCRIPTION, TableColumns.PRODUCT_COUNTRY,
+    TableColumns.TNVED, TableColumns.GENDER, TableColumns.BRANDS, TableColumns.MATERIALS, TableColumns.BRANCHES,
+}
+
+
+@benchmark("json_path_registry", DOC_SIZES, merged_certificate, reuse_setup=True)
+def get_value_all_keys(merged):
+    for key in ALL_PATHS:
+        get_value(merged, key, "")
+
+
+@benchmark("json_path_registry", DOC_SIZES, merged_certificate, reuse_setup=True)
+def extract_many_all_keys(merged):
+    extract_many(merged, ALL_PATHS)
+
+
+@benchmark("json_path_registry", DOC_SIZES, fresh_document)
+def format_dates(document):
+    format_dates_inplace(document)
+
+
+# Документы с пограничными случаями путей: пустые значения, не-списки, индекс за границей
+_EDGE_DOCUMENTS = (
+    {},
+    {"RegistryData": None, "search_Product": {"Tnveds": "6403"}},
+    {
+        "docType": "declaration",
+        "search_Product": {"Tnveds": ["6403", None, 6404, [], {}]},
+        "RegistryData": {
+            "certRegDate": "2024-02-29T10:20:30Z",
+            "certEndDate": "2024-1-5",
+            "declRegDate": "05-01-2024",
+            "declEndDate": 20240105,
+            "applicant": {"addresses": "не список", "contacts": [{"value": "e@example.ru"}]},
+            "certificationAuthority": {"contacts": [{"value": None}, {"value": "+7 495 000-00-00"}]},
+            "product": {"fullName": "", "identifications": [
+                {"name": {}, "documents": [{"name": "ГОСТ 1"}, {"name": []}, {}, {"name": "ГОСТ 2"}]},
+            ]},
+            "testingLabs": [
+                {"fullName": None, "protocols": [{"number": "1", "date": "2024-01-05"}]},
+                {"protocols": []},
+                "не словарь",
+                {"fullName": "ИЛ", "protocols": [{"date": "05-01-2024"}, {"date": "не дата"}]},
+            ],
+        },
+    },
+)
+
+# Строки около форматов дат (в т. ч. некорректные даты — ошибка должна совпадать)
+_DATE_STRINGS = (
+    "2024-01-05", "2024-01-05T10:20:30Z", "05-01-2024", "2024-1-5", "2024-01-05T10:20:30",
+    "2024-01-05 10:20:30Z", "20240105", "2024/01/05", "05.01.2024", "", "abcd-ef-gh", "2024-02-30",
+    "2024-13-01T00:00:00Z", "31-02-2024", "٢٠٢٤-٠١-٠٥", " 2024-01-05", "2024-01-05\n",
+)
+
+
+def _outcome(fn, *args):
+    try:
+        return fn(*args)
+    except ValueError as exc:
+        return type(exc)
+
+
+def _path_documents():
+    yield from _EDGE_DOCUMENTS
+    for size in (1, 100):
+        yield merged_certificate(size)
+        yield merged_declaration(size)
+        yield fresh_document(size)
+
+
+@check
+def get_value_parity():
+    """get_value (скомпилированные пути) совпадает с рекурсивным разбором пути на каждом вызове."""
+    for data in _path_documents():
+        for key in (*json_path_registry.ALL_PATHS, "unknown_key"):
+            expected = _outcome(traverse_get_value, data, key, "—")
+            assert _outcome(get_value, data, key, "—") == expected, key
+
+
+@check
+def extract_many_parity():
+    """extract_many (один обход по дереву путей) совпадает с get_value по каждому ключу."""
+    keys = (*json_path_registry.ALL_PATHS, "unknown_key")
+    for data in _path_documents():
+        expected = {key: traverse_get_value(data, key, "—") for key in keys}
+        assert extract_many(data, keys, "—") == expected
+        # подмножество ключей и повторы — свой обход, тот же результат
+        subset = keys[::3] + keys[:2]
+        assert extract_many(data, subset, "—") == {key: expected[key] for key in subset}
+
+
+@check
+def reverse_lookup_parity():
+    """Индекс «путь → ключ» совпадает с линейным поиском (при повторах пути — первый ключ)."""
+    paths = set(json_path_registry.ALL_PATHS.values())
+    for path in (*paths, "RegistryData.unknown", ""):
+        assert reverse_lookup(path) == scan_reverse_lookup(path), path
+
+
+@check
+def format_dates_parity():
+    """Разбор дат без regex совпадает с regex-версией, в том числе in-place по документу."""
+    for s in _DATE_STRINGS:
+        expected = _outcome(regex_format_date_str, s)
+        if expected is ValueError and not s.isascii():
+            # strptime отвергал ISO-дату с не-ASCII цифрами исключением; теперь это не дата
+            expected = s
+        assert _outcome(_format_date_str, s) == expected, repr(s)
+    for size in (1, 100):
+        actual, expected = fresh_document(size), fresh_document(size)
+        format_dates_inplace(actual)
+        regex_format_dates_inplace(expected)
+        assert actual == expected
+
+
+@benchmark("render", DOC_SIZES, merged_certificate, reuse_setup=True)
+def render_data_to_api_certificate(merged):
+    render_data_to_api(merged)
+
+
+@benchmark("render", DOC_SIZES, merged_declaration, reuse_setup=True)
+def render_data_to_api_declaration(merged):
+    render_data_to_api(merged)
+
+
+# Прежний путь рендеринга (regex + callback на каждый плейсхолдер) — для сравнения
+_PH_RE = re.compile(r"\{([^{}]+)\}")
+
+
+def _render_data_to_api_regex(merged, mapping):
+    def _sub(m):
+        ph = m.group(1)
+        if ph in ALL_PATHS:
+            return str(get_value(merged, ph, ""))
+        key = reverse_lookup(ph)
+        return str(get_value(merged, key, "")) if key else ""
+
+    return {k: _PH_RE.sub(_sub, v) for k, v in mapping.items()}
+
+
+@benchmark("render", DOC_SIZES, merged_certificate, reuse_setup=True)
+def render_data_to_api_certificate_regex(merged):
+    _render_data_to_api_regex(merged, data_to_api)
+
+
+def _templated_certificate(size):
+    return render_data_to_api(merged_certificate(size))
+
+
+@benchmark("render", (1,), _templated_certificate, reuse_setup=True)
+def preview_text_format_map(templated):
+    CERTIFICATE_PREVIEW_TEMPLATE.format_map(defaultdict(str, templated))
+
+
+@benchmark("render", (1,), _templated_certificate, reuse_setup=True)
+def preview_text_compiled(templated):
+    preview_template(False).render_map(templated)
+
+
+@benchmark("render", DOC_SIZES, merged_certificate, reuse_setup=True)
+def render_certificate_preview_certificate(merged):
+    render_certificate_preview(merged)
+
+
+@benchmark("ui", PAGE_SIZES, search_items, reuse_setup=True)
+def format_search_results_page(items):
+    format_search_results(items)
+
+
+@benchmark("ui", PAGE_SIZES, search_items, reuse_setup=True)
+def format_search_results_frame_page(items):
+    format_search_results_frame(items)
+
+
+@check
+def format_search_results_frame_parity():
+    edge_items = [
+        {"ID": 1},
+        {"ID": 2, "Type": "D", "RegistrationDate": None, "ValidityPeriod": "", "Product": None,
+         "Manufacturer": {"Name": None, "Branches": [{"Country": "CN"}, {"Name": "без страны"}]}},
+    ]
+    for items in (*(search_items(size) for size in PAGE_SIZES), edge_items):
+        expected = pd.DataFrame(format_search_results(items))
+        pd.testing.assert_frame_equal(format_search_results_frame(items), expected)
+
+
+@benchmark("ui", DOC_SIZES, merged_certificate, reuse_setup=True)
+def flatten_with_paths(merged):
+    _flatten_with_paths(merged)
+
+
+@benchmark("updater", PAGE_SIZES, results_frames, reuse_setup=True)
+def process_table_changes_unselected(frames):
+    original, edited = frames
+    process_table_changes(edited, original, _EDITABLE_COLS)
+
+
+@benchmark("updater", PAGE_SIZES, results_frames_selected, reuse_setup=True)
+def diff_tables_selected(frames):
+    original, edited = frames
+    diff_tables(edited, original, _EDITABLE_COLS)
+
+
+@check
+def diff_tables_parity():
+    """diff_tables совпадает с построчным сравнением (iterrows + process_*_changes)."""
+    for size in PAGE_SIZES:
+        original, edited = results_frames_selected(size)
+        expected = {}
+        for idx, row in edited.iterrows():
+            orig_row = original.loc[idx]
+            if not row[TableColumns.SELECT] or not any(row[col] != orig_row[col] for col in _EDITABLE_COLS):
+                continue
+            manufacturer = process_branches_changes(row, orig_row)
+            expected[idx] = (process_product_changes(row, orig_row), manufacturer.model_dump() if manufacturer else None)
+
+        actual = {}
+        for change in diff_tables(edited, original, _EDITABLE_COLS).changes:
+            branches = None
+            if change.branches is not None:
+                branches = Manufacturer(branches=parse_branches(change.branches)).model_dump()
+            actual[change.index] = (change.product, branches)
+        assert actual == expected, f"page {size}: {len(actual)} vs {len(expected)} changed rows"
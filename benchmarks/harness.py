@@ -0,0 +1,122 @@
+"""Минимальная обвязка для микробенчмарков: регистрация, замер, baseline.
+
+Бенчмарк — функция ``setup(size) -> arg`` и функция ``fn(arg)``;
+``setup`` выполняется вне замера перед каждым раундом (важно для
+in-place преобразований), замеряется только ``fn``.
+
+Проверки паритета (``@check``) запускаются перед замерами: оптимизированная
+реализация должна давать тот же результат, что и исходная.
+"""
+
+from __future__ import annotations
+
+import json
+import platform
+import statistics
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+
+@dataclass
+class Benchmark:
+    name: str
+    group: str
+    sizes: Iterable[Any]
+    setup: Callable[[Any], Any]
+    fn: Callable[[Any], Any]
+    # setup дорогой и fn не мутирует аргумент — готовим его один раз на размер
+    reuse_setup: bool = False
+
+
+REGISTRY: List[Benchmark] = []
+CHECKS: List[Callable[[], None]] = []
+
+
+def benchmark(group: str, sizes: Iterable[Any], setup: Callable[[Any], Any], reuse_setup: bool = False):
+    """Декоратор: регистрирует ``fn(arg)`` как бенчмарк для каждого размера."""
+
+    def decorator(fn: Callable[[Any], Any]) -> Callable[[Any], Any]:
+        REGISTRY.append(Benchmark(fn.__name__, group, list(sizes), setup, fn, reuse_setup))
+        return fn
+
+    return decorator
+
+
+def check(fn: Callable[[], None]) -> Callable[[], None]:
+    """Декоратор: регистрирует проверку паритета (бросает ``AssertionError`` при расхождении)."""
+    CHECKS.append(fn)
+    return fn
+
+
+def run_checks(pattern: Optional[str] = None) -> List[str]:
+    """Запускает проверки паритета; возвращает имена упавших."""
+    failed: List[str] = []
+    for fn in CHECKS:
+        if pattern and pattern not in fn.__name__:
+            continue
+        try:
+            fn()
+        except AssertionError as exc:
+            failed.append(fn.__name__)
+            print(f"check {fn.__name__:<62} FAILED: {exc}")
+        else:
+            print(f"check {fn.__name__:<62} ok")
+    return failed
+
+
+def measure(bench: Benchmark, size: Any, min_time: float = 0.2, max_rounds: int = 200) -> Dict[str, Any]:
+    """Выполняет раунды, пока суммарное время не превысит *min_time* (минимум 3 раунда)."""
+    timings: List[float] = []
+    total = 0.0
+    arg = bench.setup(size) if bench.reuse_setup else None
+    while len(timings) < 3 or (total < min_time and len(timings) < max_rounds):
+        if not bench.reuse_setup:
+            arg = bench.setup(size)
+        started = time.perf_counter()
+        bench.fn(arg)
+        elapsed = time.perf_counter() - started
+        timings.append(elapsed)
+        total += elapsed
+    return {
+        "rounds": len(timings),
+        "min_ms": round(min(timings) * 1000, 4),
+        "median_ms": round(statistics.median(timings) * 1000, 4),
+        "mean_ms": round(statistics.fmean(timings) * 1000, 4),
+    }
+
+
+def run(pattern: Optional[str] = None, min_time: float = 0.2) -> Dict[str, Dict[str, Any]]:
+    """Запускает все (или подходящие под *pattern*) бенчмарки."""
+    results: Dict[str, Dict[str, Any]] = {}
+    for bench in REGISTRY:
+        for size in bench.sizes:
+            key = f"{bench.group}.{bench.name}[{size}]"
+            if pattern and pattern not in key:
+                continue
+            results[key] = measure(bench, size, min_time=min_time)
+            print(f"{key:<70} median {results[key]['median_ms']:>10.3f} ms  ({results[key]['rounds']} rounds)")
+    return results
+
+
+def save(results: Dict[str, Dict[str, Any]], path: str) -> None:
+    meta = {"python": platform.python_version(), "machine": platform.machine(), "created": time.strftime("%Y-%m-%d %H:%M:%S")}
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"meta": meta, "results": results}, f, ensure_ascii=False, indent=2)
+
+
+def compare(results: Dict[str, Dict[str, Any]], path: str, threshold: float = 1.25) -> List[str]:
+    """Сравнивает медианы с baseline; возвращает список регрессий."""
+    with open(path, encoding="utf-8") as f:
+        baseline = json.load(f)["results"]
+    regressions: List[str] = []
+    for key, current in results.items():
+        base = baseline.get(key)
+        if not base or not base["median_ms"]:
+            continue
+        ratio = current["median_ms"] / base["median_ms"]
+        mark = "REGRESSION" if ratio > threshold else ""
+        print(f"{key:<70} {base['median_ms']:>10.3f} -> {current['median_ms']:>10.3f} ms  x{ratio:.2f} {mark}")
+        if mark:
+            regressions.append(key)
+    return regressions
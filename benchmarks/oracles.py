@@ -0,0 +1,242 @@
+"""Эталонные построчные реализации для проверок паритета.
+
+Здесь лежат прежние (построчные) версии преобразований, которые в приложении
+заменены векторизованными. Бенчмарки сравнивают с ними скорость, а проверки
+паритета (``@check``) — результат. В приложении они не используются.
+"""
+
+import re
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from src.api.document_updater import Manufacturer
+from src.manual_db_update.updater_handlers import parse_branches
+from src.ui.model import TableColumns
+from src.utils import json_path_registry
+from src.utils.utils import flatten_dict, format_date, generate_fsa_url
+
+
+def format_search_results(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Форматирует результаты поиска из API в формат, подходящий для отображения в таблице.
+    
+    Args:
+        items: Список элементов из результатов поиска API
+        
+    Returns:
+        Список форматированных элементов для отображения в таблице
+    """
+    formatted_results = []
+    for item in items:
+        flat_item = flatten_dict(item)
+        
+        # Обработка списковых полей с проверкой на None
+        tnveds = flat_item.get("Product_Tnveds", []) or []
+        genders = flat_item.get("Product_Genders", []) or []
+        brands = flat_item.get("Product_Brands", []) or []
+        materials = flat_item.get("Product_Materials", []) or []
+        
+        # Формирование списка филиалов
+        branches = []
+        if "Manufacturer_Branches" in flat_item and flat_item["Manufacturer_Branches"]:
+            for branch in flat_item["Manufacturer_Branches"]:
+                if "Country" in branch and "Name" in branch:
+                    branches.append(f"{branch['Country']}: {branch['Name']}")
+                elif "Country" in branch:
+                    branches.append(f"{branch['Country']}")
+
+        formatted_item = {
+            TableColumns.SELECT: False,
+            TableColumns.ID: flat_item.get("ID", ""),  # Добавляем ID обратно, он нужен для обновления
+            TableColumns.LINK: generate_fsa_url(flat_item.get("Type"), flat_item.get("ID")),
+            TableColumns.NUMBER: flat_item.get("Number", ""),
+            TableColumns.TYPE: "Д" if flat_item.get("Type") == "D" else "С",
+            TableColumns.STATUS: flat_item.get("Status", ""),
+            TableColumns.REGISTRATION_DATE: format_date(flat_item.get("RegistrationDate")),
+            TableColumns.VALID_UNTIL: format_date(flat_item.get("ValidityPeriod")),
+            TableColumns.APPLICANT: flat_item.get("Applicant", ""),
+            TableColumns.MANUFACTURER: flat_item.get("Manufacturer_Name", ""),
+            TableColumns.PRODUCT: flat_item.get("Product_Name", ""),
+            TableColumns.DESCRIPTION: flat_item.get("Product_Description", ""),
+            TableColumns.PRODUCT_COUNTRY: flat_item.get("Product_Country", ""),
+            TableColumns.TNVED: ", ".join(tnveds),  # Используем обработанное значение
+            TableColumns.GENDER: ", ".join(genders),  # Добавляем поле для гендеров
+            TableColumns.BRANDS: ", ".join(brands),  # Преобразуем список брендов в строку через запятую
+            TableColumns.BRANCHES: branches,  # Добавляем поле для филиалов как список
+            TableColumns.MATERIALS: ", ".join(flat_item.get("Product_Materials", [])),
+        }
+        formatted_results.append(formatted_item)
+    
+    return formatted_results
+
+
+def process_branches_changes(row, orig_row) -> Optional[Manufacturer]:
+    """
+    Обрабатывает изменения в филиалах производителя.
+    
+    Args:
+        row: Строка с новыми значениями
+        orig_row: Строка с исходными значениями
+        
+    Returns:
+        Объект Manufacturer с изменениями или None если изменений нет
+    """
+    if row[TableColumns.BRANCHES] != orig_row[TableColumns.BRANCHES]:
+        value = row[TableColumns.BRANCHES]
+        # Создаем объект Manufacturer только если есть изменения в филиалах
+        return Manufacturer(branches=parse_branches(value if isinstance(value, list) else []))
+    
+    return None
+
+
+def process_product_changes(row, orig_row) -> Dict[str, Any]:
+    """
+    Обрабатывает изменения в полях продукта.
+    
+    Args:
+        row: Строка с новыми значениями
+        orig_row: Строка с исходными значениями
+        
+    Returns:
+        Словарь с измененными полями продукта
+    """
+    product_changes = {}
+    
+    # Проверяем и обрабатываем изменения в полях продукта
+    if row[TableColumns.PRODUCT] != orig_row[TableColumns.PRODUCT]:
+        product_changes["name"] = row[TableColumns.PRODUCT]
+    
+    if row[TableColumns.DESCRIPTION] != orig_row[TableColumns.DESCRIPTION]:
+        product_changes["description"] = row[TableColumns.DESCRIPTION]
+    
+    if row[TableColumns.PRODUCT_COUNTRY] != orig_row[TableColumns.PRODUCT_COUNTRY]:
+        product_changes["country"] = row[TableColumns.PRODUCT_COUNTRY]
+    
+    # Проверяем и обрабатываем изменения в ТН ВЭД
+    if row[TableColumns.TNVED] != orig_row[TableColumns.TNVED]:
+        tnved_list = [t.strip() for t in row[TableColumns.TNVED].split(",") if t.strip()]
+        product_changes["tnveds"] = tnved_list
+    
+    # Проверяем и обрабатываем изменения в материалах
+    if row[TableColumns.MATERIALS] != orig_row[TableColumns.MATERIALS]:
+        materials_list = [m.strip() for m in row[TableColumns.MATERIALS].split(",") if m.strip()]
+        product_changes["materials"] = materials_list
+    
+    # Проверяем и обрабатываем изменения в полях
+    if row[TableColumns.GENDER] != orig_row[TableColumns.GENDER]:
+        gender_list = [g.strip() for g in row[TableColumns.GENDER].split(",") if g.strip()]
+        product_changes["genders"] = gender_list
+    
+    # Проверяем и обрабатываем изменения в брендах
+    if row[TableColumns.BRANDS] != orig_row[TableColumns.BRANDS]:
+        brands_list = [m.strip() for m in row[TableColumns.BRANDS].split(",") if m.strip()]
+        product_changes["brands"] = brands_list
+        
+    return product_changes
+
+
+# ---------------------------------------------------------------------------
+# json_path_registry: разбор пути на каждом вызове, даты через regex
+# ---------------------------------------------------------------------------
+
+_LIST_INDEX_RE = re.compile(r"^(\w+)\[(\d+|n)\]$")
+_ISO_DATETIME_RE = re.compile(r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}Z$")
+_ISO_DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+_DASH_DATE_RE = re.compile(r"^\d{2}-\d{2}-\d{4}$")
+
+
+def regex_format_date_str(s: str) -> str:
+    """Прежний ``_format_date_str``: формат даты определяется регулярными выражениями."""
+    if _ISO_DATETIME_RE.fullmatch(s):
+        dt = datetime.strptime(s, "%Y-%m-%dT%H:%M:%SZ")
+        return dt.strftime("%d.%m.%Y")
+    if _ISO_DATE_RE.fullmatch(s):
+        dt = datetime.strptime(s, "%Y-%m-%d")
+        return dt.strftime("%d.%m.%Y")
+    if _DASH_DATE_RE.fullmatch(s):
+        day, month, year = s.split("-")
+        return f"{day}.{month}.{year}"
+    return s
+
+
+def _traverse(current: Any, tokens: List[str]) -> List[Any]:
+    """Рекурсивно идём по *tokens* и собираем найденные значения."""
+    if not tokens:
+        return [current]
+
+    token = tokens[0]
+    list_match = _LIST_INDEX_RE.fullmatch(token)
+
+    if list_match:
+        dict_key, index_raw = list_match.group(1), list_match.group(2)
+        match current:
+            case dict() as d if dict_key in d:
+                seq = d[dict_key]
+                if not isinstance(seq, list):
+                    return []
+                # Случай key[n] – агрегируем по всем элементам
+                if index_raw == "n":
+                    collected: List[Any] = []
+                    for item in seq:
+                        collected.extend(_traverse(item, tokens[1:]))
+                    return collected
+                # Случай key[0], key[1] ...
+                idx = int(index_raw)
+                if idx < len(seq):
+                    return _traverse(seq[idx], tokens[1:])
+        return []
+    else:
+        match current:
+            case dict() as d if token in d:
+                return _traverse(d[token], tokens[1:])
+        return []
+
+
+def traverse_get_value(data: Dict[str, Any], key: str, default: Any = "") -> Any:
+    """Прежний ``get_value``: путь ключа разбирается и обходится рекурсивно на каждом вызове.
+
+    Набор путей и ключей-дат берётся из текущего состояния реестра.
+    """
+    all_paths = json_path_registry.ALL_PATHS
+    if key not in all_paths:
+        return default
+
+    tokens = [raw.replace('.[', '[') for raw in all_paths[key].split('.')]
+    values = _traverse(data, tokens)
+
+    filtered = [v for v in values if v not in (None, {}, [])]
+    if key in json_path_registry._DATE_KEYS:
+        str_values = [regex_format_date_str(str(v)) for v in filtered]
+    else:
+        str_values = [str(v) for v in filtered]
+
+    if not str_values:
+        return default
+    if len(str_values) == 1:
+        return str_values[0]
+    return ", ".join(str_values)
+
+
+def scan_reverse_lookup(path: str) -> Optional[str]:
+    """Прежний ``reverse_lookup``: линейный поиск по ``ALL_PATHS``."""
+    for k, v in json_path_registry.ALL_PATHS.items():
+        if v == path:
+            return k
+    return None
+
+
+def regex_format_dates_inplace(data: Any) -> None:
+    """Прежний ``format_dates_inplace`` (на ``regex_format_date_str``)."""
+    match data:
+        case dict():
+            for k, v in data.items():
+                if isinstance(v, (dict, list)):
+                    regex_format_dates_inplace(v)
+                elif isinstance(v, str):
+                    data[k] = regex_format_date_str(v)
+        case list():
+            for idx, item in enumerate(data):
+                if isinstance(item, (dict, list)):
+                    regex_format_dates_inplace(item)
+                elif isinstance(item, str):
+                    data[idx] = regex_format_date_str(item)
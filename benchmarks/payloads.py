@@ -0,0 +1,78 @@
+"""Синтетические входные данные для бенчмарков (кэшируются по размеру)."""
+
+from __future__ import annotations
+
+import copy
+from functools import lru_cache
+from typing import Any, Dict, List
+
+import pandas as pd
+
+from src.stand_in.data import make_registry_document, make_search_item, make_search_page
+
+# Длина списков testingLabs / standards в документе
+DOC_SIZES = (1, 100, 10_000)
+# Размер страницы результатов поиска
+PAGE_SIZES = (20, 500, 5000)
+
+
+@lru_cache(maxsize=None)
+def _merged(size: int, doc_type: str) -> Dict[str, Any]:
+    from src.api.client import FSAApiClient
+
+    details = make_registry_document(1, doc_type, labs=size, standards=size)
+    details["docType"] = doc_type
+    search_item = make_search_item(1, "D" if doc_type == "declaration" else "C")
+    return FSAApiClient.get_instance().merge_search_and_details(search_item, details)
+
+
+def merged_certificate(size: int) -> Dict[str, Any]:
+    """merged_data сертификата (поиск + детали, даты уже отформатированы)."""
+    return _merged(size, "certificate")
+
+
+def merged_declaration(size: int) -> Dict[str, Any]:
+    return _merged(size, "declaration")
+
+
+@lru_cache(maxsize=None)
+def _raw_document(size: int) -> Dict[str, Any]:
+    return make_registry_document(1, "certificate", labs=size, standards=size)
+
+
+def fresh_document(size: int) -> Dict[str, Any]:
+    """Новая копия документа с неотформатированными датами (для in-place функций)."""
+    return copy.deepcopy(_raw_document(size))
+
+
+@lru_cache(maxsize=None)
+def search_items(page_size: int) -> List[Dict[str, Any]]:
+    return make_search_page(page_size, 0, page_size)["items"]
+
+
+@lru_cache(maxsize=None)
+def results_frames(page_size: int) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """(original_df, edited_df): в каждой 10-й строке изменены бренды, строки не выбраны."""
+    from src.ui.model import TableColumns
+    from src.ui.results_frame import format_search_results_frame
+
+    original = format_search_results_frame(search_items(page_size))
+    edited = original.copy()
+    edited.loc[::10, TableColumns.BRANDS] = "EDITED"
+    return original, edited
+
+
+@lru_cache(maxsize=None)
+def results_frames_selected(page_size: int) -> tuple[pd.DataFrame, pd.DataFrame]:
+    """(original_df, edited_df): выбрана каждая 5-я строка; правки брендов, ТН ВЭД и филиалов."""
+    from src.ui.model import TableColumns
+
+    original, edited = results_frames(page_size)
+    edited = edited.copy()
+    edited.loc[::5, TableColumns.SELECT] = True
+    edited.loc[::15, TableColumns.TNVED] = "6403000000, 6404000000"
+    edited[TableColumns.BRANCHES] = [
+        branches + ["KZ: Филиал Алматы"] if i % 20 == 0 else branches
+        for i, branches in enumerate(edited[TableColumns.BRANCHES])
+    ]
+    return original, edited
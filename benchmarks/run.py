@@ -0,0 +1,62 @@
+"""Запуск микробенчмарков и сравнение с сохранённым baseline.
+
+Примеры::
+
+    python -m benchmarks.run --save benchmarks/baselines/1.0.json
+    python -m benchmarks.run --compare benchmarks/baselines/1.0.json --threshold 1.3
+    python -m benchmarks.run -k render
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import sys
+
+from benchmarks import harness
+
+# Модули с бенчмарками регистрируют их при импорте
+BENCH_MODULES = ("benchmarks.bench_transforms",)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Микробенчмарки горячих преобразований FSA Interface")
+    parser.add_argument("-k", dest="pattern", help="запускать только бенчмарки, содержащие подстроку")
+    parser.add_argument("--min-time", type=float, default=0.2, help="минимальное суммарное время на бенчмарк, с")
+    parser.add_argument("--save", help="сохранить результаты как baseline (JSON)")
+    parser.add_argument("--compare", help="сравнить с baseline (JSON)")
+    parser.add_argument("--threshold", type=float, default=1.25, help="допустимое замедление медианы")
+    parser.add_argument("--no-checks", action="store_true", help="не запускать проверки паритета")
+    args = parser.parse_args()
+
+    # Вне Streamlit-рантайма streamlit пишет предупреждения на каждый вызов st.*
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+    logging.getLogger("src").setLevel(logging.ERROR)
+
+    for module in BENCH_MODULES:
+        __import__(module)
+
+    if not args.no_checks:
+        failed = harness.run_checks(args.pattern)
+        if failed:
+            print(f"Проверки паритета не прошли: {len(failed)}")
+            return 1
+
+    results = harness.run(args.pattern, min_time=args.min_time)
+
+    if args.save:
+        os.makedirs(os.path.dirname(args.save) or ".", exist_ok=True)
+        harness.save(results, args.save)
+        print(f"Baseline сохранён: {args.save}")
+
+    if args.compare:
+        regressions = harness.compare(results, args.compare, args.threshold)
+        if regressions:
+            print(f"Регрессии: {len(regressions)}")
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -45,6 +45,10 @@ class Config:
         """Получить значение по ключу"""
         return self._config.get(key, default)
 
+    def set(self, key: str, value: Any) -> None:
+        """Переопределить значение в памяти процесса (файл не меняется)"""
+        self._config[key] = value
+
     def __getitem__(self, key: str) -> Any:
         """Поддержка доступа через квадратные скобки"""
         return self._config[key]
@@ -2,9 +2,8 @@ from src.config.page_config import init_page_config
 init_page_config()  # Должна быть первой строкой после импортов
 
 import streamlit as st
-from src.api.api import get_document_details
 from src.auth.auth import authenticator
-from src.ui.ui_components import display_search_form, display_results_table
+from src.ui.ui_components import display_search_form, display_results_table, reset_results_table_state
 from config.config import load_config
 from src.utils.document_download import clear_document_cache
 from src.utils.document_display import display_generated_documents_section, display_certificate_preview_templates
@@ -21,6 +20,28 @@ def clear_generated_documents():
     # Очищаем кэш документов
     clear_document_cache()
 
+def display_pagination():
+    """Кнопки перехода между страницами результатов поиска"""
+    total_pages = st.session_state.total_pages
+    if total_pages <= 1:
+        return
+
+    current_page = st.session_state.current_page
+    col_prev, col_info, col_next = st.columns([1, 2, 1])
+    with col_prev:
+        if st.button("← Назад", disabled=current_page <= 0):
+            change_page(current_page - 1)
+    with col_info:
+        st.write(f"Страница {current_page + 1} из {total_pages}")
+    with col_next:
+        if st.button("Вперёд →", disabled=current_page >= total_pages - 1):
+            change_page(current_page + 1)
+
+def change_page(page):
+    st.session_state.current_page = page
+    reset_results_table_state()
+    st.rerun()
+
 def main():
     st.title("Поиск в базе FSA")
 
@@ -55,12 +76,15 @@ def show_search_interface():
     if st.button("Поиск"):
         st.session_state.search_params = {k: v for k, v in search_params.items() if v}
         st.session_state.current_page = 0
+        # Таблица прошлого запроса (исходник и правки) к новым результатам не относится
+        reset_results_table_state()
 
         # Сбрасываем кэш клиента и, при необходимости, создаём новый экземпляр
         try:
             client = FSAApiClient.get_instance()
-            client._last_search_response = None  # type: ignore[attr-defined]
-            client._last_merged_data = None      # type: ignore[attr-defined]
+            # явный «Поиск» всегда идёт в search-api, минуя кэш
+            client.invalidate_search(st.session_state.search_params)
+            client.workspace.reset_results()
             clear_generated_documents()
         except RuntimeError:
             # если инстанса ещё нет, ничего делать не нужно
@@ -89,6 +113,15 @@ def show_search_interface():
                 st.subheader("Результаты поиска:")
                 st.write(f"Нйдено результатов: {total_results}")
 
+                display_pagination()
+                # Пока пользователь смотрит страницу, подгружаем соседние в кэш
+                client.prefetch_search_pages(
+                    st.session_state.search_params,
+                    st.session_state.current_page,
+                    st.session_state.total_pages,
+                    include_previous=True,
+                )
+
                 edited_df = display_results_table(items)
                 selected_items = edited_df[edited_df["Выбрать"]].index.tolist()
 
@@ -97,10 +130,15 @@ def show_search_interface():
                     selected_details = {}
                     selected_search_data = {}  # Сохраняем данные из поиска
 
-                    for index in selected_items:
-                        item = items[index]
-                        doc_type = "declaration" if item["Type"] == "D" else "certificate"
-                        details = get_document_details(item["ID"], doc_type)
+                    # Детали запрашиваем параллельно, порядок совпадает с выбранными строками
+                    selected_rows = [items[index] for index in selected_items]
+                    details_results = client.get_documents_details_many([
+                        (item["ID"], "declaration" if item["Type"] == "D" else "certificate")
+                        for item in selected_rows
+                    ])
+
+                    for item, details_result in zip(selected_rows, details_results):
+                        details = details_result["details"]
 
                         if details:
                             selected_details[item["ID"]] = details
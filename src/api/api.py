@@ -1,12 +1,13 @@
-import requests
 import streamlit as st
 import logging
-import json
 from config.config import load_config
 from src.auth.auth import authenticator
 from src.api.document_updater import DocumentUpdateRequest
-from typing import Dict, Any, Optional, Union
-from src.api.client import FSAApiClient  # NEW IMPORT
+from typing import Dict, Any, List, Optional, Sequence, Tuple, Union
+from src.api.client import FSAApiClient, report_error
+from src.core.transport import get_transport
+from src.api.batch_sync import BatchSyncer, ProgressCallback, SyncResult
+from src.core import DocumentService, FSAError
 
 logger = logging.getLogger(__name__)
 
@@ -26,31 +27,48 @@ def get_document_details(doc_id, doc_type):
     client = FSAApiClient.get_instance()
     return client.get_document_details(doc_id, doc_type)
 
-def sync_document(doc_id, doc_type):
-    url = config.get_service_url('document', 'sync_document', doc_type=doc_type, doc_id=doc_id)
+def get_documents_details_many(docs):
+    client = FSAApiClient.get_instance()
+    return client.get_documents_details_many(docs)
 
-    headers = {}
-    token = authenticator.get_token()
-    if token:
-        headers['Authorization'] = f'Bearer {token}'
+def sync_document(doc_id, doc_type):
+    """Синхронизация одного документа; ошибки показываются в UI, результат — ответ сервиса или None."""
+    try:
+        return DocumentService(authenticator.get_token).sync_document(doc_type, doc_id)
+    except FSAError as e:
+        report_error(e)
+        return None
 
-    response = requests.get(url, headers=headers)
-    if response.status_code == 200:
-        return response.json()
-    elif response.status_code == 401:
+def sync_documents(
+    docs: Sequence[Tuple[str, Any]],
+    progress: Optional[ProgressCallback] = None,
+) -> List[SyncResult]:
+    """Пакетная синхронизация ``(doc_type, doc_id)`` для UI (см. ``batch_sync.BatchSyncer``).
+
+    Возвращает итог по каждому документу; при ошибке авторизации сбрасывает
+    статус входа, как ``sync_document``.
+    """
+    results = BatchSyncer().sync_many(docs, progress=progress, token_provider=authenticator.get_token)
+    if any(result.unauthorized for result in results):
         st.error("Ошибка аутентификации. Пожалуйста, войдите в систему снова.")
         st.session_state["authentication_status"] = False
         st.rerun()
-    else:
-        st.error(f"Ошибка при синхронизации документа: {response.status_code}")
-        return None
+    return results
 
 # Новые административные функции
 
+def _admin_get(url, **kwargs):
+    """GET административного триггера: одна попытка и без таймаута чтения.
+
+    Задания loader (переиндексация, загрузка за период) выполняются долго;
+    повтор по таймауту запустил бы то же задание ещё раз.
+    """
+    return get_transport('document', retries=False).get(url, timeout=None, **kwargs)
+
 def full_reindex():
     url = f"{config['api_base_url']}{config['full_reindex_endpoint']}"
     headers = {'X-API-Key': config['admin_api_key']}
-    response = requests.get(url, headers=headers)
+    response = _admin_get(url, headers=headers)
     if response.status_code == 200:
         return True
     else:
@@ -60,7 +78,7 @@ def full_reindex():
 def restart_index_queue():
     url = f"{config['api_base_url']}{config['restart_index_queue_endpoint']}"
     headers = {'X-API-Key': config['admin_api_key']}
-    response = requests.get(url, headers=headers)
+    response = _admin_get(url, headers=headers)
     if response.status_code == 200:
         return True
     else:
@@ -70,7 +88,7 @@ def restart_index_queue():
 def clear_queues():
     url = f"{config['api_base_url']}{config['clear_queues_endpoint']}"
     headers = {'X-API-Key': config['admin_api_key']}
-    response = requests.get(url, headers=headers)
+    response = _admin_get(url, headers=headers)
     if response.status_code == 200:
         return True
     else:
@@ -81,7 +99,7 @@ def load_documents(doc_type, date):
     url = f"{config['api_base_url']}{config['load_endpoint']}"
     params = {'t': doc_type, 'dt': date}
     headers = {'X-API-Key': config['admin_api_key']}
-    response = requests.get(url, params=params, headers=headers)
+    response = _admin_get(url, params=params, headers=headers)
     if response.status_code == 200:
         return True
     else:
@@ -92,7 +110,7 @@ def load_documents_period(doc_type, start_date, end_date):
     url = f"{config['api_base_url']}{config['load_period_endpoint']}"
     params = {'t': doc_type, 'from': start_date, 'to': end_date}
     headers = {'X-API-Key': config['admin_api_key']}
-    response = requests.get(url, params=params, headers=headers)
+    response = _admin_get(url, params=params, headers=headers)
     if response.status_code == 200:
         return True
     else:
@@ -102,7 +120,7 @@ def load_documents_period(doc_type, start_date, end_date):
 def update_dictionaries():
     url = f"{config['api_base_url']}{config['update_dictionaries_endpoint']}"
     headers = {'X-API-Key': config['admin_api_key']}
-    response = requests.get(url, headers=headers)
+    response = _admin_get(url, headers=headers)
     if response.status_code == 200:
         return True
     else:
@@ -112,7 +130,7 @@ def update_dictionaries():
 def update_expired_documents():
     url = f"{config['api_base_url']}{config['update_expired_endpoint']}"
     headers = {'X-API-Key': config['admin_api_key']}
-    response = requests.get(url, headers=headers)
+    response = _admin_get(url, headers=headers)
     if response.status_code == 200:
         return True
     else:
@@ -121,53 +139,11 @@ def update_expired_documents():
 
 def update_document(doc_type: str, doc_id: str, data: Union[dict, DocumentUpdateRequest]) -> Optional[Dict[str, Any]]:
     """Обновление пользовательских данных документа через PUT-запрос"""
-    url = config.get_service_url('document', 'update_document', doc_type=doc_type, doc_id=doc_id)
-    headers = {}
-    token = authenticator.get_token()
-    if token:
-        headers['Authorization'] = f'Bearer {token}'
-    
-    # Если передан объект Pydantic, преобразуем его в словарь
-    if isinstance(data, DocumentUpdateRequest):
-        payload = data.model_dump(exclude_none=True)
-    else:
-        # Для обратной совместимости
-        payload = {"userData": data}
-    
-    # Логируем полную структуру отправляемых данных
-    logger.info(f"Отправка запроса обновления для документа {doc_id} типа {doc_type}")
-    logger.info(f"Структура payload: {json.dumps(payload, ensure_ascii=False, indent=2)}")
-    
-    # Преобразуем payload в JSON строку и обратно для удаления None значений
-    clean_payload_str = json.dumps(payload, ensure_ascii=False, skipkeys=True)
-    clean_payload = json.loads(clean_payload_str)
-    logger.info(f"Очищенная структура payload: {json.dumps(clean_payload, ensure_ascii=False, indent=2)}")
-    
-    response = requests.put(url, json=clean_payload, headers=headers)
-    
-    if response.status_code == 200:
-        logger.info(f"Документ {doc_id} успешно обновлен")
-        
-        # Проверяем наличие данных в ответе
-        if not response.text or not response.text.strip():
-            logger.info("Успешный ответ от сервера, но пустое тело ответа")
-            return {"success": True, "message": "Документ успешно обновлен"} 
-        
-        # Проверяем базовую структуру JSON без исключений
-        if not (response.text.strip().startswith('{') or response.text.strip().startswith('[')):
-            logger.warning(f"Ответ не выглядит как JSON: {response.text}")
-            return {"success": True, "message": "Ответ не является JSON"}
-            
-        # В этом месте response.json() может вызвать исключение JSONDecodeError,
-        # но мы не будем обрабатывать его, как указано в требованиях
-        return response.json()
-            
-    elif response.status_code == 401:
-        logger.error(f"Ошибка аутентификации при обновлении документа {doc_id}")
-        st.error("Ошибка аутентификации. Пожалуйста, войдите в систему снова.")
-        st.session_state["authentication_status"] = False
-        st.rerun()
-    else:
-        logger.error(f"Ошибка при обновлении документа {doc_id}: {response.status_code}, тело ответа: {response.text}")
-        st.error(f"Ошибка при обновлении документа: {response.status_code}")
-        return None
\ No newline at end of file
+    # Если передан объект Pydantic, он преобразуется в словарь без None-полей;
+    # dict — для обратной совместимости, оборачивается в userData
+    payload = data if isinstance(data, DocumentUpdateRequest) else {"userData": data}
+    try:
+        return DocumentService(authenticator.get_token).update_document(doc_type, doc_id, payload)
+    except FSAError as e:
+        report_error(e)
+        return None
@@ -0,0 +1,280 @@
+"""Пакетная синхронизация документов (``GET /sync-document/{type}/{id}``).
+
+``BatchSyncer`` синхронизирует список ``(doc_type, doc_id)``:
+
+- запросы выполняются в ограниченном пуле потоков;
+- частота запросов ограничивается token bucket (``rate`` запросов в секунду,
+  всплеск до ``burst``) — каждая попытка, включая повторы, берёт токен;
+  запросы идут через транспорт без повторов urllib3 (``retries=False``),
+  поэтому попытка — это ровно один HTTP-запрос;
+- временные ошибки (сетевые, 429 и 5xx) повторяются с экспоненциальной
+  задержкой и джиттером, ``Retry-After`` учитывается;
+- для каждого документа возвращается ``SyncResult``.
+
+Модуль не зависит от Streamlit: токен авторизации передаётся явно, прогресс
+сообщается колбэком в вызывающем потоке. В UI используется через
+``api.sync_documents``, без UI — из командной строки::
+
+    python -m src.api.batch_sync --token "$FSA_TOKEN" certificate:123 declaration:456
+    python -m src.api.batch_sync --file docs.txt --rate 5   # строки "тип:id"
+
+Параметры по умолчанию — раздел ``batch_sync`` в ``config.json``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import random
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import requests
+
+from config.config import load_config
+from src.core import codec
+from src.core.auth import TokenProvider, bearer_headers, static_token
+from src.core.registry import invalidate_document
+from src.core.transport import get_transport
+
+logger = logging.getLogger(__name__)
+
+# Колбэк прогресса: (готово, всего); вызывается в вызывающем потоке
+ProgressCallback = Callable[[int, int], None]
+
+_DEFAULT_RATE: float = 10
+_DEFAULT_TIMEOUT: float = 30
+_DEFAULT_MAX_ATTEMPTS: int = 4
+_DEFAULT_BACKOFF: float = 0.5
+_MAX_BACKOFF: float = 30
+
+# Ответы, после которых имеет смысл повторить запрос
+_TRANSIENT_STATUSES: frozenset[int] = frozenset({429, 500, 502, 503, 504})
+
+
+class TokenBucket:
+    """Потокобезопасный token bucket: *rate* токенов в секунду, не больше *burst*."""
+
+    def __init__(self, rate: float, burst: Optional[float] = None) -> None:
+        self.rate = float(rate)
+        self.capacity = float(burst if burst is not None else max(1.0, rate))
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self) -> float:
+        """Берёт один токен, при необходимости ждёт; возвращает время ожидания (с)."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+
+@dataclass
+class SyncResult:
+    """Итог синхронизации одного документа.
+
+    ``status`` — HTTP-статус последней попытки (``None``, если ответа не было);
+    ``data`` — разобранный ответ сервиса при успехе.
+    """
+
+    doc_type: str
+    doc_id: Any
+    success: bool
+    status: Optional[int] = None
+    attempts: int = 0
+    error: Optional[str] = None
+    data: Any = None
+
+    @property
+    def unauthorized(self) -> bool:
+        return self.status == 401
+
+
+def _retry_after(response: requests.Response) -> Optional[float]:
+    value = response.headers.get("Retry-After")
+    try:
+        return float(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class BatchSyncer:
+    """Синхронизация набора документов с ограничением параллельности и частоты."""
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        rate: Optional[float] = None,
+        burst: Optional[float] = None,
+        timeout: Optional[float] = None,
+        max_attempts: Optional[int] = None,
+        backoff: Optional[float] = None,
+    ) -> None:
+        self._config = load_config()
+        cfg = self._config.get("batch_sync") or {}
+        self._transport = get_transport("document", retries=False)
+        self.max_workers = max(1, int(max_workers or cfg.get("max_workers") or self._transport.pool_size))
+        self.bucket = TokenBucket(float(rate or cfg.get("rate") or _DEFAULT_RATE), burst or cfg.get("burst"))
+        self.timeout = float(timeout or cfg.get("timeout") or _DEFAULT_TIMEOUT)
+        self.max_attempts = max(1, int(max_attempts or cfg.get("max_attempts") or _DEFAULT_MAX_ATTEMPTS))
+        self.backoff = float(backoff if backoff is not None else cfg.get("backoff", _DEFAULT_BACKOFF))
+
+    def _delay(self, attempt: int, response: Optional[requests.Response]) -> float:
+        """Пауза перед повтором: ``Retry-After`` или ``backoff * 2^(attempt-1)`` с джиттером."""
+        if response is not None:
+            retry_after = _retry_after(response)
+            if retry_after is not None:
+                return min(retry_after, _MAX_BACKOFF)
+        return min(_MAX_BACKOFF, self.backoff * (2 ** (attempt - 1))) * random.uniform(0.5, 1.5)
+
+    def _sync_one(self, doc_type: str, doc_id: Any, headers: Dict[str, str]) -> SyncResult:
+        """Синхронизация с повторами (выполняется в рабочем потоке, без Streamlit)."""
+        url = self._config.get_service_url("document", "sync_document", doc_type=doc_type, doc_id=doc_id)
+        result = SyncResult(doc_type, doc_id, False)
+        while True:
+            self.bucket.acquire()
+            result.attempts += 1
+            response: Optional[requests.Response] = None
+            try:
+                response = self._transport.get(url, headers=headers, timeout=self.timeout)
+            except requests.RequestException as e:
+                result.status, result.error = None, str(e)
+            else:
+                result.status = response.status_code
+                if response.status_code == 200:
+                    result.success, result.error = True, None
+                    try:
+                        result.data = codec.decode_response(response)
+                    except ValueError:
+                        result.data = None
+                    return result
+                result.error = f"HTTP {response.status_code}"
+                if response.status_code not in _TRANSIENT_STATUSES:
+                    return result
+            if result.attempts >= self.max_attempts:
+                logger.warning("Синхронизация %s/%s не удалась после %d попыток: %s",
+                               doc_type, doc_id, result.attempts, result.error)
+                return result
+            time.sleep(self._delay(result.attempts, response))
+
+    def sync_many(
+        self,
+        docs: Sequence[Tuple[str, Any]],
+        headers: Optional[Dict[str, str]] = None,
+        progress: Optional[ProgressCallback] = None,
+        token_provider: Optional[TokenProvider] = None,
+    ) -> List[SyncResult]:
+        """Синхронизирует *docs* (``(doc_type, doc_id)``); итоги — в том же порядке.
+
+        Авторизация — готовые *headers* или *token_provider* (вызывается один
+        раз в вызывающем потоке).
+
+        Повторяющиеся документы синхронизируются один раз. Для успешно
+        синхронизированных документов сбрасывается кэш клиента.
+        """
+        total = len(docs)
+        if not total:
+            return []
+        headers = dict(headers if headers is not None else bearer_headers(token_provider))
+        unique = list(dict.fromkeys((doc_type, str(doc_id)) for doc_type, doc_id in docs))
+        by_key: Dict[Tuple[str, str], SyncResult] = {}
+
+        workers = max(1, min(len(unique), self.max_workers))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="fsa-sync") as pool:
+            pending: Dict[Future, Tuple[str, str]] = {
+                pool.submit(self._sync_one, doc_type, doc_id, headers): (doc_type, doc_id)
+                for doc_type, doc_id in unique
+            }
+            while pending:
+                finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    by_key[pending.pop(future)] = future.result()
+                if progress is not None:
+                    progress(len(by_key), len(unique))
+
+        for result in by_key.values():
+            if result.success:
+                invalidate_document(result.doc_type, result.doc_id)
+
+        results = []
+        for doc_type, doc_id in docs:
+            result = by_key[(doc_type, str(doc_id))]
+            # исходный doc_id (int/str) — как у вызывающего
+            results.append(SyncResult(**{**asdict(result), "doc_id": doc_id}))
+        return results
+
+
+# ---------------------------------------------------------------------------
+# Запуск без UI
+# ---------------------------------------------------------------------------
+
+def _parse_doc(value: str) -> Tuple[str, str]:
+    doc_type, sep, doc_id = value.strip().partition(":")
+    if not sep or doc_type not in ("certificate", "declaration") or not doc_id:
+        raise argparse.ArgumentTypeError(f"ожидается 'certificate:<id>' или 'declaration:<id>': {value!r}")
+    return doc_type, doc_id
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Пакетная синхронизация документов FSA")
+    parser.add_argument("docs", nargs="*", type=_parse_doc, help="документы вида тип:id")
+    parser.add_argument("--file", help="файл со строками тип:id ('-' — stdin)")
+    parser.add_argument("--token", default=os.environ.get("FSA_TOKEN"), help="JWT (по умолчанию $FSA_TOKEN)")
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--rate", type=float, help="запросов в секунду")
+    parser.add_argument("--max-attempts", type=int)
+    parser.add_argument("--local", action="store_true", help="использовать локальные адреса сервисов (стенд)")
+    parser.add_argument("--json", dest="json_path", help="сохранить итоги в JSON-файл")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+
+    docs = list(args.docs)
+    if args.file:
+        stream = sys.stdin if args.file == "-" else open(args.file, encoding="utf-8")
+        with stream:
+            docs.extend(_parse_doc(line) for line in stream if line.strip())
+    if not docs:
+        parser.error("не указаны документы")
+
+    if args.local:
+        from src.stand_in.server import use_local_services
+
+        use_local_services()
+
+    syncer = BatchSyncer(max_workers=args.workers, rate=args.rate, max_attempts=args.max_attempts)
+    started = time.perf_counter()
+    results = syncer.sync_many(docs, token_provider=static_token(args.token))
+    elapsed = time.perf_counter() - started
+
+    failed = [r for r in results if not r.success]
+    for r in failed:
+        print(f"{r.doc_type}:{r.doc_id}\t{r.error}\t(попыток: {r.attempts})")
+    print(f"Синхронизировано {len(results) - len(failed)} из {len(results)} за {elapsed:.1f} с")
+
+    if args.json_path:
+        with open(args.json_path, "wb") as f:
+            f.write(codec.dumps([asdict(r) for r in results], indent=True))
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,22 +1,41 @@
-"""Клиент для взаимодействия с Registry-API.
-Реализован как синглтон-объект, чтобы единообразно управлять
-заголовками, URL-ами и возможными модификациями ответа.
+"""Клиент для взаимодействия с Registry-API (Streamlit-адаптер).
+
+Сетевая часть, кэши и пулы — в ``src.core.registry.RegistryClient`` (без
+Streamlit, ошибки — исключения ``src.core.errors``). ``FSAApiClient``
+поверх него берёт токен из сессии, показывает ошибки через ``st.error``,
+при 401 сбрасывает статус входа и хранит результаты в ``SessionWorkspace``.
+
+Синглтон общий для всех сессий и содержит только потокобезопасные
+ресурсы (пул соединений, кэши). Состояние оператора (поиск, merged_data,
+overrides) хранится в ``SessionWorkspace`` текущей сессии.
 """
 
 from __future__ import annotations
 
 import logging
-import requests
 import streamlit as st
-from typing import Dict, Any, Optional, Union
+from typing import Dict, Any, Iterator, List, Optional, Sequence, Tuple, Union
 
-from config.config import load_config
 from src.auth.auth import authenticator
+from src.api.workspace import SessionWorkspace, current_workspace
+from src.core.errors import AuthenticationError, FSAError, SearchPageError  # noqa: F401 - SearchPageError реэкспортируется
+from src.core.registry import RegistryClient
 from src.utils.json_path_registry import format_dates_inplace
 
 logger = logging.getLogger(__name__)
 
 
+def report_error(error: FSAError) -> None:
+    """Показывает ошибку ядра в UI; при 401 сбрасывает статус входа и перезапускает скрипт."""
+    if isinstance(error, AuthenticationError):
+        st.error("Ошибка аутентификации. Пожалуйста, войдите в систему снова.")
+        st.session_state["authentication_status"] = False
+        st.rerun()
+    else:
+        st.error(str(error))
+        logger.error("%s", getattr(error, "body", "") or error)
+
+
 class FSAApiClient:
     """Singleton-клиент для Registry-API."""
 
@@ -26,14 +45,8 @@ class FSAApiClient:
         if FSAApiClient._instance is not None:
             # Защита от прямого создания второго экземпляра
             raise RuntimeError("Используйте get_instance() для доступа к клиенту")
-        self._config = load_config()
-        # здесь будем хранить последний ответ поиска
-        self._last_search_response: Optional[Union[Dict[str, Any], list]] = None
-        # здесь будем хранить результат последнего объединения данных поиска и деталей
-        self._last_merged_data: Optional[Dict[str, Any]] = None
-        self._last_data_to_api: Optional[Dict[str, Any]] = None
-        # overrides для шаблонных значений (doc_id -> {key: value})
-        self._template_overrides: Dict[str, Dict[str, str]] = {}
+        # Токен читается из сессии в момент вызова (в потоке скрипта текущей сессии)
+        self.core = RegistryClient(authenticator.get_token)
 
     # --------------------------- Singleton helpers ---------------------------
     @classmethod
@@ -42,35 +55,97 @@ class FSAApiClient:
             cls._instance = cls()
         return cls._instance
 
+    @property
+    def workspace(self) -> SessionWorkspace:
+        """Состояние текущей сессии (поиск, merged_data, overrides)."""
+        return current_workspace()
+
     # ------------------------------------------------------------------------
     # Public API-методы
     # ------------------------------------------------------------------------
 
     def search(self, params: Dict[str, Any], page: int = 0, page_size: int = 20) -> Optional[Union[Dict[str, Any], list]]:
-        url = self._config.get_service_url("registry", "search")
-        params = params.copy()  # чтобы не мутировать исходный dict
-        # поддержка фильтра филиалов
-        if params.get("branchCountry"):
-            params["branchCountry"] = params["branchCountry"]
-
-        response = requests.get(url, params=params, headers=self._auth_headers())
-        data = self._handle_response(response, "Ошибка при запросе поиска")
-        # сохраняем/обновляем кэш
-        self._last_search_response = data
+        try:
+            data = self.core.search(params, page, page_size)
+        except FSAError as e:
+            report_error(e)
+            data = None
+        # сохраняем/обновляем последний ответ
+        self.workspace.last_search_response = data
         return data
 
+    def prefetch_search_pages(
+        self,
+        params: Dict[str, Any],
+        page: int,
+        total_pages: int,
+        page_size: int = 20,
+        include_previous: bool = False,
+    ) -> None:
+        """Подгружает в фоне соседние страницы (см. ``RegistryClient.prefetch_search_pages``)."""
+        self.core.prefetch_search_pages(params, page, total_pages, page_size, include_previous)
+
+    def iter_search(self, params: Dict[str, Any], *args: Any, **kwargs: Any) -> Iterator[Dict[str, Any]]:
+        """Все документы по запросу (``RegistryClient.iter_search``; ошибки — ``SearchPageError``)."""
+        return self.core.iter_search(params, *args, **kwargs)
+
+    def iter_search_pages(self, params: Dict[str, Any], *args: Any, **kwargs: Any) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+        """Страницы поиска ``(page, items)`` (``RegistryClient.iter_search_pages``)."""
+        return self.core.iter_search_pages(params, *args, **kwargs)
+
     def search_one(self, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
-        url = self._config.get_service_url("registry", "search_one")
-        response = requests.get(url, params=params, headers=self._auth_headers())
-        return self._handle_response(response, "Ошибка при запросе поиска одного документа")
+        try:
+            return self.core.search_one(params)
+        except FSAError as e:
+            report_error(e)
+            return None
 
     def get_document_details(self, doc_id: str, doc_type: str) -> Optional[Dict[str, Any]]:
-        url = self._config.get_service_url("registry", "document_by_id", doc_type=doc_type, doc_id=doc_id)
-        response = requests.get(url, headers=self._auth_headers())
-        data = self._handle_response(response, "Ошибка при запросе детальной информации")
-        if isinstance(data, dict):
-            data["docType"] = doc_type
-        return data
+        try:
+            return self.core.get_document_details(doc_id, doc_type)
+        except FSAError as e:
+            report_error(e)
+            return None
+
+    def get_documents_details_many(
+        self,
+        docs: Sequence[Tuple[str, str]],
+        max_workers: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Параллельно запрашивает детали для списка ``[(doc_id, doc_type), ...]``.
+
+        Формат результата — как у ``RegistryClient.get_documents_details_many``;
+        ошибки по документам показываются в UI.
+        """
+        results = self.core.get_documents_details_many(docs, max_workers)
+        for result in results:
+            if result["exception"] is not None:
+                report_error(result["exception"])
+        return results
+
+    # ------------------------------------------------------------------------
+    # Кэши
+    # ------------------------------------------------------------------------
+
+    @classmethod
+    def normalize_search_params(cls, params: Dict[str, Any]) -> Dict[str, Any]:
+        return RegistryClient.normalize_search_params(params)
+
+    def invalidate_search(self, params: Optional[Dict[str, Any]] = None) -> None:
+        """Сбрасывает кэш поиска: для конкретного запроса (все страницы) или целиком."""
+        self.core.invalidate_search(params)
+
+    def invalidate_document(self, doc_type: str, doc_id: Any) -> None:
+        """Сбрасывает кэш деталей документа и кэш поиска (после обновления/синхронизации)."""
+        self.core.invalidate_document(doc_type, doc_id)
+
+    def cache_stats(self) -> Dict[str, Dict[str, int]]:
+        """Счётчики попаданий/промахов/вытеснений для кэшей клиента."""
+        return self.core.cache_stats()
+
+    def singleflight_stats(self) -> Dict[str, int]:
+        """Сколько GET-запросов выполнено и сколько присоединилось к уже идущим."""
+        return self.core.singleflight_stats()
 
     # ------------------------------------------------------------------------
     # Объединение данных для генератора документов
@@ -96,48 +171,19 @@ class FSAApiClient:
         # Приводим даты к формату DD.MM.YYYY (ин-плейс)
         format_dates_inplace(merged)
 
-        # кэшируем результат, чтобы переиспользовать без повторного объединения
-        self._last_merged_data = merged
+        # кэшируем результат в сессии, чтобы переиспользовать без повторного объединения
+        self.workspace.last_merged_data = merged
 
         return merged
 
-    # ------------------------------------------------------------------------
-    # Helpers
-    # ------------------------------------------------------------------------
-
-    def _auth_headers(self) -> Dict[str, str]:
-        headers: Dict[str, str] = {}
-        token = authenticator.get_token()
-        if token:
-            headers["Authorization"] = f"Bearer {token}"
-        return headers
-
-    @staticmethod
-    def _handle_response(response: requests.Response, error_prefix: str) -> Optional[Any]:  # type: ignore[arg-type]
-        """Единая проверка ответов.
-        Возвращает JSON (dict/list) при 200 OK,
-        при 401 – инициирует повторную аутентификацию,
-        иначе выводит ошибку Streamlit.
-        """
-        if response.status_code == 200:
-            return response.json()
-        if response.status_code == 401:
-            st.error("Ошибка аутентификации. Пожалуйста, войдите в систему снова.")
-            st.session_state["authentication_status"] = False
-            st.rerun()
-        else:
-            st.error(f"{error_prefix}: {response.status_code}")
-            logger.error("%s: %s", error_prefix, response.text)
-        return None
-
     # Доступ к последнему сохранённому результату поиска
     def get_last_search_response(self) -> Optional[Union[Dict[str, Any], list]]:
-        return self._last_search_response
+        return self.workspace.last_search_response
 
     # Доступ к последнему результату объединения
     def get_last_merged_data(self) -> Optional[Dict[str, Any]]:
         """Возвращает кэшированный результат последнего объединения данных."""
-        return self._last_merged_data
+        return self.workspace.last_merged_data
 
     # ---------------------------------------------------------------------
     # Работа с кэшированными merged_data
@@ -154,13 +200,14 @@ class FSAApiClient:
         просто прекращает работу, оставляя кэш неизменным.
         """
 
-        if self._last_merged_data is None:
+        merged_data = self.workspace.last_merged_data
+        if merged_data is None:
             logger.warning("Кэш merged_data отсутствует – обновление пропущено")
             return
 
         parts = path.split(".")
         logger.debug("Попытка обновить merged_data по пути %s значением %s", path, value)
-        current: Any = self._last_merged_data
+        current: Any = merged_data
 
         # Проходим все компоненты пути, кроме последнего ключа
         for idx, part in enumerate(parts):
@@ -182,6 +229,9 @@ class FSAApiClient:
                             else:
                                 current = d[key][index]
                             continue
+                        # индекс вне списка — не продолжаем обход с родительского узла
+                        logger.warning("Путь '%s' недоступен в merged_data", path)
+                        return
                     case _:
                         logger.warning("Путь '%s' недоступен в merged_data", path)
                         return
@@ -209,6 +259,7 @@ class FSAApiClient:
                         logger.warning("Путь '%s' недоступен в merged_data", path)
                         return
 
+        self.workspace.mark_merged_changed(path, value)
         logger.info("Поле '%s' успешно обновлено в merged_data", path)
 
     # ---------------------------------------------------------------------
@@ -217,11 +268,8 @@ class FSAApiClient:
 
     def get_template_overrides(self, doc_id: str) -> Dict[str, str]:
         """Возвращает dict overrides для конкретного *doc_id*."""
-        return self._template_overrides.get(doc_id, {})
+        return self.workspace.get_template_overrides(doc_id)
 
     def upsert_template_value(self, doc_id: str, key: str, value: str) -> None:  # noqa: D401
         """Создаёт/обновляет значение шаблона в overrides."""
-        if doc_id not in self._template_overrides:
-            self._template_overrides[doc_id] = {}
-        self._template_overrides[doc_id][key] = value
-        logger.info("Override шаблона обновлён: doc_id=%s, key=%s, value=%s", doc_id, key, value) 
\ No newline at end of file
+        self.workspace.upsert_template_value(doc_id, key, value)
@@ -0,0 +1,342 @@
+"""Загрузка документов за период окнами, с возобновлением после прерывания.
+
+``api.load_documents_period`` отправляет один запрос на весь период; на
+длинных диапазонах он упирается в таймаут или перегружает loader.
+``PeriodLoadJob`` разбивает ``[start, end]`` на окна по дню или неделе и
+загружает их тем же эндпоинтом loader-api (``load_period`` сервиса
+``document`` в ``config.json`` или ``--endpoint``, параметры
+``t``/``from``/``to``) с заданной параллельностью. Запросы идут через
+транспорт без повторов: неудачное окно не повторяется внутри запуска, а
+остаётся незавершённым в контрольной точке.
+
+После каждого окна прогресс сохраняется в файл контрольной точки (JSON,
+атомарная запись), поэтому прерванная загрузка продолжается с
+незавершённых окон. Для каждого окна сообщаются длительность и, если
+loader вернул число документов, скорость загрузки.
+
+Запуск без UI::
+
+    python -m src.api.period_loader certificate 2024-01-01 2024-06-30 --window week --workers 2
+    python -m src.api.period_loader certificate 2024-01-01 2024-06-30 --window week  # продолжит
+    python -m src.api.period_loader declaration 2024-01-01 2024-01-31 --endpoint http://localhost:8080/load-period
+
+Параметры по умолчанию — раздел ``period_loader`` в ``config.json``; ключ
+администратора — ``admin_api_key`` или переменная окружения ``FSA_ADMIN_API_KEY``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import asdict, dataclass
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import requests
+
+from config.config import load_config
+from src.core import codec
+from src.core.transport import get_transport
+
+logger = logging.getLogger(__name__)
+
+WINDOWS: Dict[str, int] = {"day": 1, "week": 7}
+
+_DEFAULT_TIMEOUT: float = 120
+_DEFAULT_WORKERS: int = 2
+_DEFAULT_DATE_FORMAT: str = "%Y-%m-%d"
+
+# Поля ответа loader, в которых может быть число загруженных документов
+_COUNT_FIELDS: Tuple[str, ...] = ("loaded", "count", "documents", "total")
+
+Window = Tuple[date, date]
+
+
+def split_period(start: date, end: date, window: str = "day") -> List[Window]:
+    """Окна ``(from, to)`` (обе границы включительно), покрывающие ``[start, end]``."""
+    if window not in WINDOWS:
+        raise ValueError(f"Неизвестное окно {window!r}, ожидается одно из {sorted(WINDOWS)}")
+    if end < start:
+        raise ValueError(f"Конец периода {end} раньше начала {start}")
+    step = timedelta(days=WINDOWS[window])
+    windows: List[Window] = []
+    current = start
+    while current <= end:
+        last = min(end, current + step - timedelta(days=1))
+        windows.append((current, last))
+        current = last + timedelta(days=1)
+    return windows
+
+
+@dataclass
+class WindowResult:
+    """Итог загрузки одного окна.
+
+    ``documents`` — число документов из ответа loader (если он его сообщает).
+    """
+
+    start: str
+    end: str
+    success: bool
+    status: Optional[int] = None
+    seconds: float = 0.0
+    documents: Optional[int] = None
+    error: Optional[str] = None
+
+    @property
+    def days(self) -> int:
+        return (date.fromisoformat(self.end) - date.fromisoformat(self.start)).days + 1
+
+    @property
+    def throughput(self) -> Optional[float]:
+        """Документов в секунду (``None``, если число документов неизвестно)."""
+        if self.documents is None or not self.seconds:
+            return None
+        return self.documents / self.seconds
+
+    def describe(self) -> str:
+        text = f"{self.start}..{self.end}: "
+        if not self.success:
+            return text + f"ошибка {self.error} за {self.seconds:.1f} с"
+        text += f"{self.seconds:.1f} с"
+        if self.throughput is not None:
+            text += f", {self.documents} док., {self.throughput:.1f} док./с"
+        elif self.seconds:
+            text += f", {self.days / self.seconds:.2f} дн./с"
+        return text
+
+
+class Checkpoint:
+    """Файл контрольной точки: параметры задания и завершённые окна.
+
+    Неудачные окна не сохраняются как завершённые и повторяются при
+    следующем запуске.
+    """
+
+    def __init__(self, path: str, params: Dict[str, Any]) -> None:
+        self.path = path
+        self.params = params
+        self.completed: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def load(self) -> None:
+        if not os.path.exists(self.path):
+            return
+        with open(self.path, "rb") as f:
+            data = codec.loads(f.read())
+        if data.get("params") != self.params:
+            raise ValueError(
+                f"Контрольная точка {self.path} создана для других параметров: {data.get('params')}"
+            )
+        self.completed = data.get("completed") or {}
+
+    def is_done(self, window: Window) -> bool:
+        return window[0].isoformat() in self.completed
+
+    def mark_done(self, result: WindowResult) -> None:
+        with self._lock:
+            self.completed[result.start] = asdict(result)
+            self._save()
+
+    def _save(self) -> None:
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "wb") as f:
+            f.write(codec.dumps({"params": self.params, "completed": self.completed}, indent=True))
+        os.replace(tmp, self.path)
+
+
+def default_checkpoint_path(doc_type: str, start: date, end: date, window: str) -> str:
+    cfg = load_config().get("period_loader") or {}
+    directory = cfg.get("checkpoint_dir", ".checkpoints")
+    return os.path.join(directory, f"load_{doc_type}_{start.isoformat()}_{end.isoformat()}_{window}.json")
+
+
+class PeriodLoadJob:
+    """Загрузка ``doc_type`` за ``[start, end]`` окнами ``window`` в ``workers`` потоков."""
+
+    def __init__(
+        self,
+        doc_type: str,
+        start: date,
+        end: date,
+        window: str = "day",
+        workers: Optional[int] = None,
+        checkpoint_path: Optional[str] = None,
+        timeout: Optional[float] = None,
+        api_key: Optional[str] = None,
+        endpoint: Optional[str] = None,
+    ) -> None:
+        self._config = load_config()
+        cfg = self._config.get("period_loader") or {}
+        self.doc_type = doc_type
+        self.windows = split_period(start, end, window)
+        self.workers = max(1, int(workers or cfg.get("workers") or _DEFAULT_WORKERS))
+        self.timeout = float(timeout or cfg.get("timeout") or _DEFAULT_TIMEOUT)
+        self.date_format = cfg.get("date_format") or _DEFAULT_DATE_FORMAT
+        self.api_key = api_key or self._config.get("admin_api_key") or os.environ.get("FSA_ADMIN_API_KEY")
+        self.checkpoint = Checkpoint(
+            checkpoint_path or default_checkpoint_path(doc_type, start, end, window),
+            {"doc_type": doc_type, "start": start.isoformat(), "end": end.isoformat(), "window": window},
+        )
+        self.url = endpoint or self._default_url()
+        self._transport = get_transport("document", retries=False)
+
+    def _default_url(self) -> str:
+        try:
+            return self._config.get_service_url("document", "load_period")
+        except KeyError:
+            raise ValueError("В config.json не задан эндпоинт services.document.endpoints.load_period") from None
+
+    def _load_window(self, url: str, window: Window) -> WindowResult:
+        """Загрузка одного окна (в рабочем потоке, без Streamlit)."""
+        start, end = window
+        result = WindowResult(start.isoformat(), end.isoformat(), False)
+        params = {"t": self.doc_type, "from": start.strftime(self.date_format), "to": end.strftime(self.date_format)}
+        headers = {"X-API-Key": self.api_key} if self.api_key else {}
+        started = time.perf_counter()
+        try:
+            response = self._transport.get(url, params=params, headers=headers, timeout=self.timeout)
+        except requests.RequestException as e:
+            result.error = str(e)
+        else:
+            result.status = response.status_code
+            if response.status_code == 200:
+                result.success = True
+                result.documents = _documents_count(response)
+            else:
+                result.error = f"HTTP {response.status_code}"
+        result.seconds = time.perf_counter() - started
+        return result
+
+    def pending_windows(self) -> List[Window]:
+        """Окна, ещё не завершённые по контрольной точке (читает её с диска)."""
+        self.checkpoint.load()
+        return [w for w in self.windows if not self.checkpoint.is_done(w)]
+
+    def run(self, on_window: Optional[Callable[[WindowResult, int, int], None]] = None) -> List[WindowResult]:
+        """Загружает незавершённые окна; возвращает итоги окон этого запуска.
+
+        *on_window(result, готово, всего)* вызывается в вызывающем потоке
+        после каждого окна (``готово``/``всего`` — с учётом окон из
+        контрольной точки).
+        """
+        pending = self.pending_windows()
+        total = len(self.windows)
+        done = total - len(pending)
+        if not pending:
+            return []
+
+        results: List[WindowResult] = []
+        pool = ThreadPoolExecutor(max_workers=min(self.workers, len(pending)), thread_name_prefix="fsa-period")
+        futures: Dict[Future, Window] = {pool.submit(self._load_window, self.url, w): w for w in pending}
+        try:
+            while futures:
+                finished, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    futures.pop(future)
+                    result = future.result()
+                    results.append(result)
+                    done += 1
+                    if result.success:
+                        self.checkpoint.mark_done(result)
+                    else:
+                        logger.warning("Окно %s..%s не загружено: %s", result.start, result.end, result.error)
+                    if on_window is not None:
+                        on_window(result, done, total)
+        except KeyboardInterrupt:
+            # Не ждём окон в работе: неотправленные отменяются, все незавершённые
+            # повторятся при следующем запуске
+            pool.shutdown(wait=False, cancel_futures=True)
+            raise
+        pool.shutdown()
+        results.sort(key=lambda r: r.start)
+        return results
+
+
+def _documents_count(response: requests.Response) -> Optional[int]:
+    try:
+        data = codec.decode_response(response)
+    except ValueError:
+        return None
+    if isinstance(data, dict):
+        for field in _COUNT_FIELDS:
+            if isinstance(data.get(field), int):
+                return data[field]
+    return None
+
+
+# ---------------------------------------------------------------------------
+# Запуск без UI
+# ---------------------------------------------------------------------------
+
+def _parse_date(value: str) -> date:
+    try:
+        return datetime.strptime(value, "%Y-%m-%d").date()
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"ожидается дата ГГГГ-ММ-ДД: {value!r}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Загрузка документов FSA за период окнами")
+    parser.add_argument("doc_type", choices=("certificate", "declaration"))
+    parser.add_argument("start", type=_parse_date)
+    parser.add_argument("end", type=_parse_date)
+    parser.add_argument("--window", choices=sorted(WINDOWS), default="day")
+    parser.add_argument("--workers", type=int)
+    parser.add_argument("--timeout", type=float, help="таймаут на окно, с")
+    parser.add_argument("--endpoint", help="полный URL эндпоинта загрузки (по умолчанию — load_period из config.json)")
+    parser.add_argument("--checkpoint", help="файл контрольной точки (по умолчанию — по параметрам задания)")
+    parser.add_argument("--restart", action="store_true", help="начать заново, удалив контрольную точку")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+
+    try:
+        job = PeriodLoadJob(
+            args.doc_type, args.start, args.end, args.window, args.workers, args.checkpoint, args.timeout,
+            endpoint=args.endpoint,
+        )
+    except ValueError as e:
+        parser.error(str(e))
+    if args.restart and os.path.exists(job.checkpoint.path):
+        os.remove(job.checkpoint.path)
+
+    try:
+        skipped = len(job.windows) - len(job.pending_windows())
+    except ValueError as e:
+        parser.error(f"{e}; используйте --restart или другой --checkpoint")
+    if skipped:
+        print(f"Продолжение по {job.checkpoint.path}: завершено окон {skipped} из {len(job.windows)}")
+
+    def report(result: WindowResult, done: int, total: int) -> None:
+        print(f"[{done}/{total}] {result.describe()}", flush=True)
+
+    started = time.perf_counter()
+    try:
+        results = job.run(report)
+    except KeyboardInterrupt:
+        print(f"Прервано; прогресс сохранён в {job.checkpoint.path}")
+        return 130
+    elapsed = time.perf_counter() - started
+
+    failed = [r for r in results if not r.success]
+    documents = sum(r.documents or 0 for r in results if r.success)
+    print(
+        f"Окон загружено: {len(results) - len(failed)} из {len(results)} за {elapsed:.1f} с"
+        + (f", документов: {documents} ({documents / elapsed:.1f} док./с)" if documents and elapsed else "")
+    )
+    if failed:
+        print("Незагруженные окна будут повторены при следующем запуске")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
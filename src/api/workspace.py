@@ -0,0 +1,152 @@
+"""Рабочее пространство пользовательской сессии.
+
+``FSAApiClient`` — один объект на процесс (пулы соединений, кэши), а всё,
+что относится к конкретному оператору (последний поиск, merged_data,
+overrides шаблонов), хранится здесь — по экземпляру на сессию Streamlit.
+
+Workspace кладётся в ``st.session_state``, поэтому удаляется вместе с
+сессией. Вне Streamlit (CLI, фоновые задачи) используется общий
+workspace процесса.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, List, Optional, TypeVar, Union
+
+import streamlit as st
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+
+from src.core import codec
+
+logger = logging.getLogger(__name__)
+
+_SESSION_KEY = "fsa_workspace"
+
+# Сколько документов с overrides держим в одной сессии
+_MAX_OVERRIDE_DOCS = 50
+# Сколько отрендеренных результатов (templated / предпросмотр) держим в сессии
+_MAX_RENDERED = 16
+
+T = TypeVar("T")
+
+
+class SessionWorkspace:
+    """Состояние одного оператора: поиск, merged_data, overrides шаблонов."""
+
+    def __init__(self, max_override_docs: int = _MAX_OVERRIDE_DOCS, max_rendered: int = _MAX_RENDERED) -> None:
+        # последний ответ поиска
+        self.last_search_response: Optional[Union[Dict[str, Any], list]] = None
+        # результат последнего объединения данных поиска и деталей
+        self._last_merged_data: Optional[Dict[str, Any]] = None
+        self._merged_fingerprint: Optional[str] = None
+        # пути, изменённые через update_merged_data с последнего рендеринга
+        # (None — данные заменены целиком, нужен полный рендеринг)
+        self._changed_paths: Optional[List[str]] = None
+        # состояние последнего рендеринга для повторного использования
+        # (см. generate_preview.rendering)
+        self.render_state: Dict[str, Any] = {}
+        self.last_data_to_api: Optional[Dict[str, Any]] = None
+        # overrides для шаблонных значений (doc_id -> {key: value}), LRU по doc_id
+        self._template_overrides: "OrderedDict[str, Dict[str, str]]" = OrderedDict()
+        self._max_override_docs = max_override_docs
+        # увеличивается при каждом изменении overrides
+        self.overrides_version = 0
+        # мемоизация рендеринга: (вид, отпечаток merged_data, версия overrides, ...) -> результат
+        self._rendered: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._max_rendered = max_rendered
+
+    @property
+    def last_merged_data(self) -> Optional[Dict[str, Any]]:
+        return self._last_merged_data
+
+    @last_merged_data.setter
+    def last_merged_data(self, value: Optional[Dict[str, Any]]) -> None:
+        self._last_merged_data = value
+        self._merged_fingerprint = None
+        self._changed_paths = None
+
+    def mark_merged_changed(self, path: Optional[str] = None, value: Any = None) -> None:
+        """Сообщает, что merged_data изменён на месте.
+
+        *path* / *value* — изменённый путь и новое значение. Тогда отпечаток
+        выводится из предыдущего и изменения (без повторного хеширования всего
+        документа), а следующий рендеринг будет инкрементальным. Без *path*
+        отпечаток и рендеринг пересчитываются полностью.
+        """
+        if path is None:
+            self._merged_fingerprint = None
+            self._changed_paths = None
+            return
+        if self._merged_fingerprint is not None:
+            edit = self._merged_fingerprint.encode() + path.encode() + codec.dumps(value)
+            self._merged_fingerprint = hashlib.blake2b(edit, digest_size=16).hexdigest()
+        if self._changed_paths is not None:
+            self._changed_paths.append(path)
+
+    def take_changed_paths(self) -> Optional[List[str]]:
+        """Возвращает и сбрасывает пути, изменённые с прошлого вызова.
+
+        ``None`` — изменения неизвестны (новые данные), нужен полный рендеринг.
+        """
+        changed, self._changed_paths = self._changed_paths, []
+        return changed
+
+    def merged_fingerprint(self) -> str:
+        """Стабильный отпечаток содержимого merged_data (хешируется один раз на документ)."""
+        if self._merged_fingerprint is None:
+            raw = codec.dumps(self._last_merged_data)
+            self._merged_fingerprint = hashlib.blake2b(raw, digest_size=16).hexdigest()
+        return self._merged_fingerprint
+
+    def memoized(self, key: Hashable, build: Callable[[], T]) -> T:
+        """Возвращает закэшированный результат *build* по *key* (LRU на сессию)."""
+        try:
+            value = self._rendered[key]
+        except KeyError:
+            value = build()
+            self._rendered[key] = value
+            while len(self._rendered) > self._max_rendered:
+                self._rendered.popitem(last=False)
+        else:
+            self._rendered.move_to_end(key)
+        return value
+
+    def reset_results(self) -> None:
+        """Сбрасывает результаты поиска и merged_data (новый поиск)."""
+        self.last_search_response = None
+        self.last_merged_data = None
+        self.last_data_to_api = None
+
+    def get_template_overrides(self, doc_id: str) -> Dict[str, str]:
+        overrides = self._template_overrides.get(doc_id)
+        if overrides is None:
+            return {}
+        self._template_overrides.move_to_end(doc_id)
+        return overrides
+
+    def upsert_template_value(self, doc_id: str, key: str, value: str) -> None:
+        overrides = self._template_overrides.setdefault(doc_id, {})
+        overrides[key] = value
+        self.overrides_version += 1
+        self._template_overrides.move_to_end(doc_id)
+        while len(self._template_overrides) > self._max_override_docs:
+            evicted, _ = self._template_overrides.popitem(last=False)
+            logger.debug("Overrides документа %s вытеснены из workspace", evicted)
+
+
+# Общий workspace для запуска вне Streamlit
+_headless_workspace = SessionWorkspace()
+
+
+def current_workspace() -> SessionWorkspace:
+    """Возвращает workspace текущей сессии Streamlit (или общий вне Streamlit)."""
+    if get_script_run_ctx(suppress_warning=True) is None:
+        return _headless_workspace
+    workspace = st.session_state.get(_SESSION_KEY)
+    if workspace is None:
+        workspace = SessionWorkspace()
+        st.session_state[_SESSION_KEY] = workspace
+    return workspace
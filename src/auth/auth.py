@@ -1,8 +1,9 @@
-import requests
 import streamlit as st
 from datetime import datetime, timedelta
 from config.config import load_config
 from src.auth.storage import CookieTokenStorage
+from src.core.auth import fetch_token
+from src.core.errors import ApiError, FSAError
 
 config = load_config()
 
@@ -48,32 +49,22 @@ class Authenticator:
         if st.button("Войти"):
             with st.spinner('Выполняется вход в систему...'):
                 try:
-                    response = requests.post(
-                        self.api_url, 
-                        json={"username": username, "password": password}
+                    token = fetch_token(username, password)
+                except ApiError as e:
+                    st.error(f"Ошибка при входе: {e.status}")
+                    st.write(f"Ответ сервера: {e.body}")
+                except ValueError:
+                    st.error("Ошибка при разборе JSON-ответа")
+                except FSAError as e:
+                    st.error(str(e))
+                else:
+                    # Устанавливаем срок действия токена
+                    expiry = datetime.now() + timedelta(
+                        days=30 if remember_me else 1
                     )
-
-                    if response.status_code == 200:
-                        try:
-                            data = response.json()
-                            token = data.get("access")
-                            if token:
-                                # Устанавливаем срок действия токена
-                                expiry = datetime.now() + timedelta(
-                                    days=30 if remember_me else 1
-                                )
-                                self._save_auth_data(token, expiry, remember_me)
-                                st.success("Вход выполнен успешно!")
-                                st.rerun()
-                            else:
-                                st.error("Токен отсутствует в ответе сервера")
-                        except ValueError:
-                            st.error("Ошибка при разборе JSON-ответа")
-                    else:
-                        st.error(f"Ошибка при входе: {response.status_code}")
-                        st.write(f"Ответ сервера: {response.text}")
-                except requests.exceptions.RequestException as e:
-                    st.error(f"Ошибка при отправке запроса: {str(e)}")
+                    self._save_auth_data(token, expiry, remember_me)
+                    st.success("Вход выполнен успешно!")
+                    st.rerun()
 
     def logout(self):
         if st.button("Выйти"):
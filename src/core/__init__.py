@@ -0,0 +1,38 @@
+"""Ядро клиента FSA без зависимостей от Streamlit.
+
+Пригодно для пулов потоков и процессов, CLI и фоновых задач: методы
+возвращают данные или выбрасывают типизированные ошибки (``errors``),
+токен передаётся через ``TokenProvider`` (``auth``). Здесь же общая
+инфраструктура: ``transport``, ``codec``, ``cache``, ``singleflight`` и
+``write_overlay``. Streamlit-адаптеры —
+``src.api.client.FSAApiClient``, ``src.api.api``, ``src.api.document_updater``
+и ``src.auth.auth.Authenticator``.
+"""
+
+from src.core.auth import TokenProvider, bearer_headers, env_token, fetch_token, no_token, static_token
+from src.core.documents import DocumentService
+from src.core.errors import (
+    ApiConnectionError,
+    ApiError,
+    AuthenticationError,
+    FSAError,
+    SearchPageError,
+)
+from src.core.registry import RegistryClient, invalidate_document
+
+__all__ = [
+    "ApiConnectionError",
+    "ApiError",
+    "AuthenticationError",
+    "DocumentService",
+    "FSAError",
+    "RegistryClient",
+    "SearchPageError",
+    "TokenProvider",
+    "bearer_headers",
+    "env_token",
+    "fetch_token",
+    "invalidate_document",
+    "no_token",
+    "static_token",
+]
@@ -0,0 +1,64 @@
+"""Источники токена авторизации для ядра клиента.
+
+``TokenProvider`` — любая функция без аргументов, возвращающая JWT или
+``None``. Ядро вызывает её в том потоке, где выполняется метод (для пулов
+потоков — один раз до отправки задач), поэтому провайдер, читающий
+``st.session_state``, подходит для вызовов из потока скрипта, а для
+рабочих потоков и процессов используется ``static_token``.
+"""
+
+from __future__ import annotations
+
+import os
+from typing import Callable, Dict, Optional
+
+import requests
+
+from config.config import load_config
+from src.core import codec
+from src.core.errors import ApiConnectionError, FSAError, decode_or_raise
+from src.core.transport import get_transport
+
+TokenProvider = Callable[[], Optional[str]]
+
+
+def no_token() -> Optional[str]:
+    return None
+
+
+def static_token(token: Optional[str]) -> TokenProvider:
+    """Провайдер с фиксированным токеном (сериализуемый снимок для потоков и CLI)."""
+    return lambda: token
+
+
+def env_token(variable: str = "FSA_TOKEN") -> TokenProvider:
+    """Провайдер, читающий токен из переменной окружения при каждом вызове."""
+    return lambda: os.environ.get(variable) or None
+
+
+def bearer_headers(token_provider: Optional[TokenProvider]) -> Dict[str, str]:
+    """Заголовок ``Authorization`` для текущего токена (пустой словарь без токена)."""
+    token = token_provider() if token_provider is not None else None
+    return {"Authorization": f"Bearer {token}"} if token else {}
+
+
+def fetch_token(username: str, password: str) -> str:
+    """Получает JWT у auth-api (``POST /token``).
+
+    Ошибки — ``ApiError`` / ``ApiConnectionError``; ``FSAError``, если в
+    ответе нет токена.
+    """
+    url = load_config().get_service_url("auth", "token")
+    try:
+        response = get_transport("auth").post(
+            url,
+            data=codec.dumps({"username": username, "password": password}),
+            headers=codec.JSON_HEADERS,
+        )
+    except requests.RequestException as e:
+        raise ApiConnectionError(f"Ошибка при отправке запроса: {e}", e) from e
+    data = decode_or_raise(response, "Ошибка при входе")
+    token = data.get("access") if isinstance(data, dict) else None
+    if not token:
+        raise FSAError("Токен отсутствует в ответе сервера")
+    return token
@@ -0,0 +1,127 @@
+"""Потокобезопасный LRU-кэш с TTL и ограничением по объёму.
+
+Используется клиентом Registry-API для хранения ответов между
+перезапусками Streamlit-скрипта (кэш общий на процесс).
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+
+class LRUCache:
+    """LRU-кэш с временем жизни записей и лимитами на число записей и байты.
+
+    Размер записи передаётся явно (``set(..., size=...)``), иначе
+    вычисляется функцией *sizeof* (по умолчанию — ``len``).
+    """
+
+    def __init__(
+        self,
+        ttl: float,
+        max_entries: int,
+        max_bytes: int,
+        sizeof: Callable[[Any], int] = len,
+    ) -> None:
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._sizeof = sizeof
+
+        # key -> (value, size, expires_at)
+        self._data: "OrderedDict[Hashable, Tuple[Any, int, float]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Возвращает значение или None (если записи нет или она устарела)."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            value, size, expires_at = entry
+            if expires_at <= time.monotonic():
+                self._drop(key, size)
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any, size: Optional[int] = None, ttl: Optional[float] = None) -> None:
+        """Кладёт значение в кэш, вытесняя самые старые записи при переполнении."""
+        size = self._sizeof(value) if size is None else size
+        if size > self.max_bytes:
+            # Запись больше всего кэша — не кэшируем
+            return
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        with self._lock:
+            old = self._data.pop(key, None)
+            if old is not None:
+                self._bytes -= old[1]
+            self._data[key] = (value, size, expires_at)
+            self._bytes += size
+            while self._data and (len(self._data) > self.max_entries or self._bytes > self.max_bytes):
+                old_key, (_, old_size, _) = next(iter(self._data.items()))
+                self._drop(old_key, old_size)
+                self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> bool:
+        """Удаляет запись по ключу; возвращает True, если она была."""
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None:
+                return False
+            self._drop(key, entry[1])
+            self.invalidations += 1
+            return True
+
+    def invalidate_where(self, predicate: Callable[[Hashable], bool]) -> int:
+        """Удаляет все записи, ключи которых удовлетворяют *predicate*."""
+        with self._lock:
+            keys = [k for k in self._data if predicate(k)]
+            for k in keys:
+                self._drop(k, self._data[k][1])
+            self.invalidations += len(keys)
+            return len(keys)
+
+    def clear(self) -> None:
+        with self._lock:
+            self.invalidations += len(self._data)
+            self._data.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "entries": len(self._data),
+                "bytes": self._bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
+
+    def _drop(self, key: Hashable, size: int) -> None:
+        del self._data[key]
+        self._bytes -= size
+
+    def __contains__(self, key: Hashable) -> bool:
+        with self._lock:
+            entry = self._data.get(key)
+            return entry is not None and entry[2] > time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self._data)
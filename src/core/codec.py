@@ -0,0 +1,109 @@
+"""Единый JSON-кодек для запросов, ответов и логов.
+
+Использует ``orjson``, если он установлен, иначе — стандартный ``json``.
+Результат кодирования всегда ``bytes`` в UTF-8 без экранирования кириллицы.
+
+Кодирование строгое, как у ``requests(json=...)``: значения не-JSON типов
+не превращаются молча в строки, а вызывают ``TypeError``. Скаляры numpy
+(значения из отредактированного DataFrame) кодируются как числа/bool,
+даты и ``pandas.Timestamp`` — в ISO 8601. Только ``LazyJSON`` (логи)
+выводит прочие объекты через ``str``.
+"""
+
+from __future__ import annotations
+
+import json
+from datetime import date
+from typing import Any, Callable, Dict, Union
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - зависит от окружения
+    orjson = None
+
+import requests
+
+JSON_HEADERS: Dict[str, str] = {"Content-Type": "application/json; charset=utf-8"}
+
+BACKEND: str = "orjson" if orjson is not None else "json"
+
+
+def _default(obj: Any) -> Any:
+    """Типы, которых нет в JSON, но которые приходят из pandas/numpy."""
+    if isinstance(obj, date):
+        # datetime/date, включая pandas.Timestamp (у NaT isoformat() == "NaT")
+        text = obj.isoformat()
+        if text != "NaT":
+            return text
+    elif hasattr(obj, "dtype") and hasattr(obj, "item"):
+        # скаляр numpy: int64 -> int, float64 -> float, bool_ -> bool
+        return obj.item()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+if orjson is not None:
+    _OPTS = orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+    def loads(data: Union[bytes, bytearray, str]) -> Any:
+        return orjson.loads(data)
+
+    def _dumps(obj: Any, indent: bool, default: Callable[[Any], Any]) -> bytes:
+        return orjson.dumps(obj, default=default, option=_OPTS | (orjson.OPT_INDENT_2 if indent else 0))
+
+else:
+
+    def loads(data: Union[bytes, bytearray, str]) -> Any:
+        return json.loads(data)
+
+    def _dumps(obj: Any, indent: bool, default: Callable[[Any], Any]) -> bytes:
+        text = json.dumps(
+            obj,
+            ensure_ascii=False,
+            default=default,
+            indent=2 if indent else None,
+            separators=None if indent else (",", ":"),
+        )
+        return text.encode("utf-8")
+
+
+def dumps(obj: Any, indent: bool = False) -> bytes:
+    """Кодирует *obj* в JSON (``bytes``); не-JSON типы — ``TypeError``."""
+    return _dumps(obj, indent, _default)
+
+
+def dumps_str(obj: Any, indent: bool = False) -> str:
+    """То же, что ``dumps``, но возвращает ``str``."""
+    return dumps(obj, indent=indent).decode("utf-8")
+
+
+def _log_default(obj: Any) -> Any:
+    try:
+        return _default(obj)
+    except TypeError:
+        return str(obj)
+
+
+def decode_response(response: requests.Response) -> Any:
+    """Разбирает тело ответа (аналог ``response.json()``).
+
+    Ошибки разбора — ``ValueError`` (как и у ``response.json()``).
+    """
+    return loads(response.content)
+
+
+class LazyJSON:
+    """Обёртка для логирования: сериализует объект только при выводе записи.
+
+    Пример: ``logger.debug("Payload: %s", LazyJSON(payload))`` — при
+    выключенном DEBUG кодирование не выполняется вовсе.
+    """
+
+    __slots__ = ("obj", "indent")
+
+    def __init__(self, obj: Any, indent: bool = False) -> None:
+        self.obj = obj
+        self.indent = indent
+
+    def __str__(self) -> str:
+        # в логах не падаем на не-JSON значениях — выводим их через str
+        return _dumps(self.obj, self.indent, _log_default).decode("utf-8")
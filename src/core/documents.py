@@ -0,0 +1,126 @@
+"""Операции loader-api над документами без Streamlit: обновление и синхронизация.
+
+Методы возвращают разобранный ответ или выбрасывают ошибки из
+``src.core.errors``. После успешного обновления/синхронизации сбрасывается
+общий кэш ``RegistryClient``, а отправленные userData попадают в наложение
+для результатов поиска (``src.core.write_overlay``, см. ``record_update``).
+``put_document`` — тот же запрос без этого учёта: его выполняет вызывающий
+(массовые обновления, ``src.manual_db_update.bulk_update``).
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict, Optional
+
+import requests
+
+from config.config import load_config
+from src.core import codec
+from src.core.auth import TokenProvider, bearer_headers
+from src.core.errors import ApiConnectionError, decode_or_raise, error_for_response
+from src.core.registry import invalidate_document
+from src.core.transport import get_transport
+from src.core.write_overlay import record_write
+
+logger = logging.getLogger(__name__)
+
+
+def record_update(doc_type: str, doc_id: Any, payload: Dict[str, Any]) -> None:
+    """Учёт успешного обновления: сброс кэша документа и наложение для результатов поиска."""
+    invalidate_document(doc_type, doc_id)
+    record_write(doc_type, doc_id, payload.get("userData", payload))
+
+
+def as_payload(data: Any) -> Dict[str, Any]:
+    """Тело PUT: ``DocumentUpdateRequest`` (и другие pydantic-модели) → dict без None-полей."""
+    if hasattr(data, "model_dump"):
+        return data.model_dump(exclude_none=True)
+    return dict(data)
+
+
+class DocumentService:
+    """Обновление и синхронизация документов; токен — от *token_provider*.
+
+    *retries=False* — транспорт без повторов: неуспешный запрос сразу
+    возвращается вызывающему. *timeout* — таймаут запроса (``None`` —
+    таймаут транспорта из конфига).
+    """
+
+    def __init__(
+        self,
+        token_provider: Optional[TokenProvider] = None,
+        timeout: Optional[float] = None,
+        retries: bool = True,
+    ) -> None:
+        self._config = load_config()
+        self._transport = get_transport("document", retries=retries)
+        self.token_provider = token_provider
+        self.timeout = timeout
+
+    def _request(self, method: str, url: str, message: str, **kwargs: Any) -> requests.Response:
+        if self.timeout is not None:
+            kwargs.setdefault("timeout", self.timeout)
+        try:
+            return self._transport.request(method, url, **kwargs)
+        except requests.RequestException as e:
+            raise ApiConnectionError(f"{message}: {e}", e) from e
+
+    def update_document(self, doc_type: str, doc_id: Any, data: Any) -> Dict[str, Any]:
+        """``PUT /documents/{type}/{id}``; *data* — тело (``{"userData": ...}``) или ``DocumentUpdateRequest``.
+
+        Возвращает ответ сервиса (или ``{"success": True, ...}``, если тело
+        пустое либо не JSON).
+        """
+        payload = as_payload(data)
+        result = self.put_document(doc_type, doc_id, payload)
+        record_update(doc_type, doc_id, payload)
+        return result
+
+    def put_document(
+        self, doc_type: str, doc_id: Any, data: Any, headers: Optional[Dict[str, str]] = None
+    ) -> Dict[str, Any]:
+        """Запрос ``update_document`` без сброса кэша и записи в наложение (см. ``record_update``).
+
+        *headers* — готовые заголовки авторизации вместо ``token_provider``.
+        """
+        message = f"Ошибка при обновлении документа {doc_id}"
+        url = self._config.get_service_url("document", "update_document", doc_type=doc_type, doc_id=doc_id)
+        payload = as_payload(data)
+
+        # Кодируем payload один раз; None-поля уже отброшены
+        body = codec.dumps(payload)
+
+        # Полная структура payload — на DEBUG; на INFO — сводка (разделы и размер)
+        user_data = payload.get("userData", payload)
+        logger.info(
+            "Отправка запроса обновления для документа %s типа %s: разделы %s, %d байт",
+            doc_id, doc_type, ", ".join(sorted(user_data)) if isinstance(user_data, dict) else "-", len(body),
+        )
+        logger.debug("Структура payload: %s", codec.LazyJSON(payload, indent=True))
+
+        auth = headers if headers is not None else bearer_headers(self.token_provider)
+        response = self._request("PUT", url, message, data=body, headers={**auth, **codec.JSON_HEADERS})
+        if response.status_code != 200:
+            logger.error("%s: %s, тело ответа: %s", message, response.status_code, response.text)
+            raise error_for_response(response, message)
+
+        logger.info("Документ %s успешно обновлен", doc_id)
+
+        text = response.text.strip() if response.text else ""
+        if not text:
+            logger.info("Успешный ответ от сервера, но пустое тело ответа")
+            return {"success": True, "message": "Документ успешно обновлен"}
+        if not (text.startswith("{") or text.startswith("[")):
+            logger.warning("Ответ не выглядит как JSON: %s", response.text)
+            return {"success": True, "message": "Ответ не является JSON"}
+        return codec.decode_response(response)
+
+    def sync_document(self, doc_type: str, doc_id: Any) -> Any:
+        """``GET /sync-document/{type}/{id}``; возвращает ответ сервиса."""
+        message = "Ошибка при синхронизации документа"
+        url = self._config.get_service_url("document", "sync_document", doc_type=doc_type, doc_id=doc_id)
+        response = self._request("GET", url, message, headers=bearer_headers(self.token_provider))
+        data = decode_or_raise(response, message)
+        invalidate_document(doc_type, doc_id)
+        return data
@@ -0,0 +1,78 @@
+"""Типизированные ошибки ядра клиента FSA.
+
+Ядро (``src.core``) не показывает сообщений и не обращается к Streamlit:
+при неуспешном ответе или сетевой ошибке оно выбрасывает исключения из
+этого модуля, а решение, как о них сообщить, принимает вызывающий код
+(адаптер Streamlit, CLI, фоновая задача).
+"""
+
+from __future__ import annotations
+
+from typing import Any, Optional
+
+import requests
+
+from src.core import codec
+
+
+class FSAError(Exception):
+    """Базовая ошибка обращения к сервисам FSA."""
+
+
+class ApiConnectionError(FSAError):
+    """Запрос не выполнен: сеть, таймаут, отказ в соединении."""
+
+    def __init__(self, message: str, cause: Optional[BaseException] = None) -> None:
+        super().__init__(message)
+        self.cause = cause
+
+
+class ApiError(FSAError):
+    """Сервис ответил неуспешным статусом.
+
+    ``status`` — HTTP-статус, ``detail`` — поле ``detail`` из тела ответа
+    (если есть), ``body`` — текст ответа.
+    """
+
+    def __init__(self, message: str, status: int, detail: Optional[str] = None, body: str = "") -> None:
+        super().__init__(f"{message}: {status}")
+        self.message = message
+        self.status = status
+        self.detail = detail
+        self.body = body
+
+
+class AuthenticationError(ApiError):
+    """Сервис ответил 401: токен отсутствует, неверен или истёк."""
+
+
+class SearchPageError(FSAError, RuntimeError):
+    """Страница поиска не получена после всех повторов.
+
+    ``page`` — номер страницы, с которой можно возобновить обход
+    (``iter_search(..., start_page=e.page)``).
+    """
+
+    def __init__(self, page: int, message: str) -> None:
+        super().__init__(f"Страница {page}: {message}")
+        self.page = page
+
+
+def error_for_response(response: requests.Response, message: str) -> ApiError:
+    """Исключение для неуспешного ответа (``AuthenticationError`` для 401)."""
+    detail: Any = None
+    try:
+        data = codec.decode_response(response)
+        if isinstance(data, dict):
+            detail = data.get("detail")
+    except ValueError:
+        pass
+    cls = AuthenticationError if response.status_code == 401 else ApiError
+    return cls(message, response.status_code, str(detail) if detail is not None else None, response.text)
+
+
+def decode_or_raise(response: requests.Response, message: str) -> Any:
+    """JSON ответа при 200 OK, иначе — ``ApiError`` / ``AuthenticationError``."""
+    if response.status_code == 200:
+        return codec.decode_response(response)
+    raise error_for_response(response, message)
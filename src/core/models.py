@@ -0,0 +1,81 @@
+"""Модели данных loader-api (pydantic), общие для ядра и UI."""
+
+from enum import Enum
+from typing import Any, Dict, List, Optional
+
+from pydantic import BaseModel
+
+
+class DocumentType(str, Enum):
+    CERTIFICATE = "certificate"
+    DECLARATION = "declaration"
+
+class TokenRequest(BaseModel):
+    username: str
+    password: str
+
+class TokenResponse(BaseModel):
+    access: str
+
+class Branch(BaseModel):
+    name: str
+    country: str
+
+class Manufacturer(BaseModel):
+    branches: List[Branch]
+
+class Product(BaseModel):
+    name: Optional[str] = None
+    description: Optional[str] = None
+    country: Optional[str] = None
+    tnveds: List[str] = None
+    materials: List[str] = None
+    genders: List[str] = None
+    brands: List[str] = None
+
+class UserData(BaseModel):
+    product: Optional[Product] = None
+    manufacturer: Optional[Manufacturer] = None
+
+class Document(BaseModel):
+    id: int
+    type: DocumentType
+    userData: Optional[UserData] = None
+    registryData: Optional[Dict[str, Any]] = None
+    changeLog: Optional[List[Dict[str, Any]]] = None
+
+class DocumentResponse(BaseModel):
+    success: bool
+    data: Optional[Document] = None
+    error: Optional[str] = None
+
+class DocumentUpdateRequest(BaseModel):
+    product: Optional[Product] = None
+    manufacturer: Optional[Manufacturer] = None
+
+    class Config:
+        extra = "ignore"
+        
+    def model_dump(self, **kwargs):
+        """Переопределяем метод для контроля исключения пустых полей"""
+        exclude_none = kwargs.get('exclude_none', False)
+        data = super().model_dump(**kwargs)
+        
+        # Если указано исключать None значения
+        if exclude_none:
+            # Если product существует, проверяем все его поля
+            if 'product' in data and isinstance(data['product'], dict):
+                for field in ['tnveds', 'materials', 'genders', 'brands']:
+                    if field in data['product'] and not data['product'][field]:
+                        data['product'].pop(field)
+                        
+                # Если после удаления пустых полей product пуст, удаляем его полностью
+                if not any(data['product'].values()):
+                    data.pop('product')
+                    
+            # Если manufacturer существует и у него пустые branches, удаляем его
+            if 'manufacturer' in data and isinstance(data['manufacturer'], dict):
+                if 'branches' in data['manufacturer'] and not data['manufacturer']['branches']:
+                    data.pop('manufacturer')
+                    
+        return data
@@ -0,0 +1,533 @@
+"""Клиент Registry-API без Streamlit: поиск, детали документов, кэши.
+
+``RegistryClient`` возвращает разобранные ответы или выбрасывает ошибки из
+``src.core.errors`` и берёт токен у переданного ``TokenProvider``. Клиентов
+можно создавать сколько угодно (по одному на сессию, поток или задачу):
+пулы соединений, кэши поиска/деталей, single-flight и пул фоновой
+подгрузки общие на процесс (``_shared``), поэтому инвалидация из любого
+места видна всем. Ключи кэшей включают хэш токена (``auth_scope``): ответ,
+полученный с одним токеном, не отдаётся запросам с другим.
+
+Streamlit-адаптер — ``src.api.client.FSAApiClient``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+import requests
+
+from config.config import load_config
+from src.core import codec
+from src.core.auth import TokenProvider, bearer_headers
+from src.core.cache import LRUCache
+from src.core.errors import ApiConnectionError, FSAError, SearchPageError, decode_or_raise, error_for_response
+from src.core.singleflight import SingleFlight
+from src.core.transport import ServiceTransport, get_transport
+
+logger = logging.getLogger(__name__)
+
+SearchResponse = Union[Dict[str, Any], list]
+
+
+def _build_cache(name: str, ttl: float, max_entries: int, max_bytes: int) -> LRUCache:
+    """Создаёт кэш с параметрами из ``config.json['cache'][name]``."""
+    cfg = (load_config().get("cache") or {}).get(name, {})
+    return LRUCache(
+        ttl=float(cfg.get("ttl", ttl)),
+        max_entries=int(cfg.get("max_entries", max_entries)),
+        max_bytes=int(cfg.get("max_bytes", max_bytes)),
+    )
+
+
+class _SharedResources:
+    """Потокобезопасные ресурсы, общие для всех ``RegistryClient`` процесса."""
+
+    def __init__(self) -> None:
+        self.http: ServiceTransport = get_transport("registry")
+        # без повторов urllib3: для кода с собственным циклом повторов (iter_search)
+        self.http_no_retry: ServiceTransport = get_transport("registry", retries=False)
+        # кэш деталей: (auth-scope, doc_type, doc_id) -> сырое тело ответа (bytes).
+        # Храним байты, чтобы каждый вызывающий получал свою копию dict
+        # и правки merged_data не попадали в кэш.
+        self.details_cache = _build_cache("details", ttl=300, max_entries=500, max_bytes=50 * 1024 * 1024)
+        # кэш поиска: (auth-scope, нормализованные параметры, page, page_size) -> bytes
+        self.search_cache = _build_cache("search", ttl=60, max_entries=200, max_bytes=20 * 1024 * 1024)
+        # фоновая подгрузка соседних страниц поиска
+        self.prefetch_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="fsa-prefetch")
+        # auth-scope -> (запрос, флаг отмены); новый запрос в том же scope отменяет старый
+        self.prefetch_batches: Dict[str, Tuple[Tuple[Any, ...], threading.Event]] = {}
+        self.prefetch_lock = threading.Lock()
+        # объединение одинаковых одновременных GET-запросов всех сессий
+        self.inflight = SingleFlight()
+
+
+_shared_resources: Optional[_SharedResources] = None
+_shared_lock = threading.Lock()
+
+
+def _shared() -> _SharedResources:
+    global _shared_resources
+    if _shared_resources is None:
+        with _shared_lock:
+            if _shared_resources is None:
+                _shared_resources = _SharedResources()
+    return _shared_resources
+
+
+def auth_scope(headers: Dict[str, str]) -> str:
+    """Область кэша для заголовков запроса: хэш токена (пустая строка без токена).
+
+    Ответы кэшируются отдельно для каждого токена, чтобы ответ, полученный
+    с правами одного оператора, не отдавался другому (или сессии с
+    истёкшим токеном) без обращения к серверу.
+    """
+    authorization = headers.get("Authorization")
+    if not authorization:
+        return ""
+    return hashlib.sha256(authorization.encode("utf-8")).hexdigest()[:32]
+
+
+def invalidate_document(doc_type: str, doc_id: Any) -> None:
+    """Сбрасывает кэш деталей документа для всех токенов (после обновления/синхронизации).
+
+    Кэш поиска сбрасывается целиком: документ может быть на любой странице.
+    """
+    shared = _shared()
+    doc = RegistryClient.details_key("", doc_type, doc_id)[1:]
+    if shared.details_cache.invalidate_where(lambda key: key[1:] == doc):
+        logger.debug("Кэш деталей сброшен: %s/%s", doc_type, doc_id)
+    shared.search_cache.clear()
+
+
+class RegistryClient:
+    """Клиент Registry-API; токен — от *token_provider* (по умолчанию без авторизации)."""
+
+    # Параметры-списки «через запятую», порядок элементов в которых не важен
+    _SEARCH_LIST_PARAMS: Tuple[str, ...] = ("materials", "genders")
+
+    def __init__(self, token_provider: Optional[TokenProvider] = None) -> None:
+        self._config = load_config()
+        self.token_provider = token_provider
+        shared = _shared()
+        self._http = shared.http
+        self._details_cache = shared.details_cache
+        self._search_cache = shared.search_cache
+        self._inflight = shared.inflight
+        self._shared = shared
+
+    def auth_headers(self) -> Dict[str, str]:
+        return bearer_headers(self.token_provider)
+
+    # ------------------------------------------------------------------------
+    # Поиск
+    # ------------------------------------------------------------------------
+
+    def search(self, params: Dict[str, Any], page: int = 0, page_size: int = 20) -> SearchResponse:
+        """Страница поиска (из кэша или из сети)."""
+        url = self._config.get_service_url("registry", "search")
+        params = self.normalize_search_params(params)  # копия, исходный dict не мутируем
+        headers = self.auth_headers()
+
+        key = self._search_key(auth_scope(headers), params, page, page_size)
+        raw = self._search_cache.get(key)
+        if raw is not None:
+            return codec.loads(raw)
+
+        response = self._get_checked(
+            url, "Ошибка при запросе поиска", headers, params=self._search_request_params(params, page, page_size)
+        )
+        data = decode_or_raise(response, "Ошибка при запросе поиска")
+        self._search_cache.set(key, response.content)
+        return data
+
+    def prefetch_search_pages(
+        self,
+        params: Dict[str, Any],
+        page: int,
+        total_pages: int,
+        page_size: int = 20,
+        include_previous: bool = False,
+    ) -> None:
+        """Подгружает в фоне соседние страницы (N+1 и, опционально, N-1) в кэш поиска.
+
+        Если тот же пользователь начал другой запрос, ещё не выполненная
+        подгрузка старого запроса отменяется.
+        """
+        params = self.normalize_search_params(params)
+        headers = self.auth_headers()
+        scope = auth_scope(headers)
+        query = self._search_key(scope, params, 0, 0)[1]
+        shared = self._shared
+
+        with shared.prefetch_lock:
+            previous = shared.prefetch_batches.get(scope)
+            if previous is not None and previous[0] != query:
+                previous[1].set()
+                previous = None
+            cancelled = previous[1] if previous is not None else threading.Event()
+            shared.prefetch_batches[scope] = (query, cancelled)
+
+        pages = [page + 1]
+        if include_previous:
+            pages.append(page - 1)
+        for p in pages:
+            if 0 <= p < total_pages and self._search_key(scope, params, p, page_size) not in self._search_cache:
+                shared.prefetch_pool.submit(self._prefetch_search_page, params, p, page_size, headers, cancelled)
+
+    def _prefetch_search_page(
+        self,
+        params: Dict[str, Any],
+        page: int,
+        page_size: int,
+        headers: Dict[str, str],
+        cancelled: threading.Event,
+    ) -> None:
+        """Фоновая задача: ошибки только логируются."""
+        key = self._search_key(auth_scope(headers), params, page, page_size)
+        if cancelled.is_set() or key in self._search_cache:
+            return
+        url = self._config.get_service_url("registry", "search")
+        try:
+            response = self._get(url, params=self._search_request_params(params, page, page_size), headers=headers)
+        except requests.RequestException as e:
+            logger.debug("Подгрузка страницы %s не удалась: %s", page, e)
+            return
+        if response.status_code == 200 and not cancelled.is_set():
+            self._search_cache.set(key, response.content)
+            logger.debug("Страница %s поиска подгружена в кэш", page)
+
+    def iter_search(
+        self,
+        params: Dict[str, Any],
+        page_size: Optional[int] = None,
+        start_page: int = 0,
+        read_ahead: int = 2,
+        page_retries: Optional[int] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Лениво перебирает все документы, подходящие под запрос (все страницы).
+
+        Подробности см. в ``iter_search_pages``.
+        """
+        for _, items in self.iter_search_pages(params, page_size, start_page, read_ahead, page_retries):
+            yield from items
+
+    def iter_search_pages(
+        self,
+        params: Dict[str, Any],
+        page_size: Optional[int] = None,
+        start_page: int = 0,
+        read_ahead: int = 2,
+        page_retries: Optional[int] = None,
+    ) -> Iterator[Tuple[int, List[Dict[str, Any]]]]:
+        """Генератор пар ``(page, items)`` по всем страницам ``totalPages``.
+
+        - одновременно в памяти/в работе не больше *read_ahead* страниц;
+        - каждая страница повторяется до *page_retries* раз с экспоненциальной
+          паузой (по умолчанию — ``max_retries`` из конфига); запросы идут
+          через транспорт без повторов urllib3, поэтому попыток — ровно
+          ``page_retries + 1`` HTTP-запросов;
+        - при окончательной ошибке выбрасывается ``SearchPageError`` с номером
+          страницы, обход можно продолжить через *start_page*.
+
+        Кэш поиска не используется. Токен берётся у ``token_provider`` один
+        раз, в потоке, начавшем обход; рабочие потоки получают готовые
+        заголовки. Без Streamlit (фоновые задачи, CLI) генератор работает с
+        ``static_token``/``env_token``.
+        """
+        params = self.normalize_search_params(params)
+        page_size = page_size or int(self._config.get("page_size", 20))
+        retries = self._http.max_retries if page_retries is None else page_retries
+        headers = self.auth_headers()
+
+        first = self._fetch_search_page(params, start_page, page_size, headers, retries)
+        if not isinstance(first, dict):
+            # API вернул простой список — страниц больше нет
+            yield start_page, list(first or [])
+            return
+        total_pages = int(first.get("totalPages") or 1)
+        yield start_page, first.get("items") or []
+        del first
+
+        next_page = start_page + 1
+        if next_page >= total_pages:
+            return
+
+        window: "deque[Tuple[int, Future]]" = deque()
+        with ThreadPoolExecutor(max_workers=max(1, read_ahead), thread_name_prefix="fsa-iter-search") as pool:
+            try:
+                while next_page < total_pages and len(window) < max(1, read_ahead):
+                    window.append((next_page, pool.submit(
+                        self._fetch_search_page, params, next_page, page_size, headers, retries)))
+                    next_page += 1
+                while window:
+                    page, future = window.popleft()
+                    data = future.result()
+                    if next_page < total_pages:
+                        window.append((next_page, pool.submit(
+                            self._fetch_search_page, params, next_page, page_size, headers, retries)))
+                        next_page += 1
+                    yield page, (data.get("items") or []) if isinstance(data, dict) else list(data or [])
+            finally:
+                # генератор закрыли раньше времени или упала страница — отменяем хвост
+                for _, future in window:
+                    future.cancel()
+
+    def _fetch_search_page(
+        self,
+        params: Dict[str, Any],
+        page: int,
+        page_size: int,
+        headers: Dict[str, str],
+        retries: int,
+    ) -> SearchResponse:
+        """Запрашивает одну страницу с повторами (каждая попытка — один HTTP-запрос)."""
+        url = self._config.get_service_url("registry", "search")
+        request_params = self._search_request_params(params, page, page_size)
+        error = ""
+        for attempt in range(retries + 1):
+            if attempt:
+                time.sleep(min(0.5 * 2 ** (attempt - 1), 10))
+            try:
+                response = self._get(url, params=request_params, headers=headers, retries=False)
+            except requests.RequestException as e:
+                error = str(e)
+                continue
+            if response.status_code == 200:
+                return codec.decode_response(response)
+            error = f"HTTP {response.status_code}"
+            # 4xx (кроме 429) повторять бессмысленно
+            if 400 <= response.status_code < 500 and response.status_code != 429:
+                break
+        raise SearchPageError(page, error)
+
+    def search_one(self, params: Dict[str, Any]) -> Any:
+        url = self._config.get_service_url("registry", "search_one")
+        response = self._get_checked(url, "Ошибка при запросе поиска одного документа", params=params)
+        return decode_or_raise(response, "Ошибка при запросе поиска одного документа")
+
+    # ------------------------------------------------------------------------
+    # Детали документов
+    # ------------------------------------------------------------------------
+
+    def get_document_details(self, doc_id: str, doc_type: str) -> Any:
+        """Детали документа (dict с ``docType``) из кэша или из сети."""
+        headers = self.auth_headers()
+        key = self.details_key(auth_scope(headers), doc_type, doc_id)
+        raw = self._details_cache.get(key)
+        if raw is not None:
+            return self._decode_details(raw, doc_type)
+
+        url = self._config.get_service_url("registry", "document_by_id", doc_type=doc_type, doc_id=doc_id)
+        response = self._get_checked(url, "Ошибка при запросе детальной информации", headers)
+        data = decode_or_raise(response, "Ошибка при запросе детальной информации")
+        if isinstance(data, dict):
+            self._details_cache.set(key, response.content)
+            data["docType"] = doc_type
+        return data
+
+    def get_documents_details_many(
+        self,
+        docs: Sequence[Tuple[str, str]],
+        max_workers: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Параллельно запрашивает детали для списка ``[(doc_id, doc_type), ...]``.
+
+        HTTP-запросы выполняются в пуле потоков (не больше размера пула
+        соединений registry). Ошибки по отдельным документам не прерывают
+        обработку: они попадают в результат.
+
+        Возвращает список в порядке *docs*; каждый элемент содержит:
+        - doc_id, doc_type
+        - success: True/False
+        - details: dict с деталями (или None)
+        - error: описание ошибки (если есть)
+        - exception: ``FSAError`` при ошибке (или None)
+        """
+        if not docs:
+            return []
+
+        # Токен читаем здесь, один раз: провайдер может зависеть от потока
+        headers = self.auth_headers()
+        scope = auth_scope(headers)
+
+        # Сначала отдаём то, что уже есть в кэше; в сеть идут только промахи
+        cached: Dict[int, Dict[str, Any]] = {}
+        missing: List[Tuple[str, str]] = []
+        for pos, (doc_id, doc_type) in enumerate(docs):
+            raw = self._details_cache.get(self.details_key(scope, doc_type, doc_id))
+            if raw is not None:
+                cached[pos] = self._decode_details(raw, doc_type)
+            else:
+                missing.append((doc_id, doc_type))
+
+        def _fetch(doc: Tuple[str, str]) -> requests.Response:
+            doc_id, doc_type = doc
+            url = self._config.get_service_url("registry", "document_by_id", doc_type=doc_type, doc_id=doc_id)
+            return self._get(url, headers=headers)
+
+        futures: List[Future] = []
+        if missing:
+            workers = max(1, min(len(missing), max_workers or self._http.pool_size))
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="fsa-details") as pool:
+                futures = [pool.submit(_fetch, doc) for doc in missing]
+        pending = iter(futures)
+
+        results: List[Dict[str, Any]] = []
+        for pos, (doc_id, doc_type) in enumerate(docs):
+            result: Dict[str, Any] = {
+                "doc_id": doc_id,
+                "doc_type": doc_type,
+                "success": False,
+                "details": None,
+                "error": None,
+                "exception": None,
+            }
+            results.append(result)
+            if pos in cached:
+                result["success"] = True
+                result["details"] = cached[pos]
+                continue
+
+            future = next(pending)
+            try:
+                response = future.result()
+            except requests.RequestException as e:
+                logger.error("Ошибка при запросе деталей документа %s: %s", doc_id, e)
+                result["error"] = str(e)
+                result["exception"] = ApiConnectionError(f"Ошибка при запросе детальной информации ({doc_id}): {e}", e)
+                continue
+
+            if response.status_code != 200:
+                result["error"] = f"HTTP {response.status_code}"
+                result["exception"] = error_for_response(response, f"Ошибка при запросе детальной информации ({doc_id})")
+                continue
+            data = codec.decode_response(response)
+            if isinstance(data, dict):
+                self._details_cache.set(self.details_key(scope, doc_type, doc_id), response.content)
+                data["docType"] = doc_type
+                result["success"] = True
+                result["details"] = data
+            else:
+                result["error"] = f"HTTP {response.status_code}"
+                result["exception"] = FSAError(f"Некорректный ответ для документа {doc_id}")
+
+        return results
+
+    # ------------------------------------------------------------------------
+    # Кэш поиска
+    # ------------------------------------------------------------------------
+
+    @classmethod
+    def normalize_search_params(cls, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Приводит параметры поиска к каноническому виду.
+
+        Строки обрезаются, списки ``materials``/``genders`` сортируются
+        (без дублей), пустые значения отбрасываются.
+        """
+        normalized: Dict[str, Any] = {}
+        for key, value in params.items():
+            if isinstance(value, str):
+                value = value.strip()
+                if key in cls._SEARCH_LIST_PARAMS:
+                    value = ",".join(sorted({p.strip() for p in value.split(",") if p.strip()}))
+            if value is None or value == "" or value == [] or value == {}:
+                continue
+            normalized[key] = value
+        return normalized
+
+    @staticmethod
+    def _search_request_params(normalized: Dict[str, Any], page: int, page_size: int) -> Dict[str, Any]:
+        request_params = dict(normalized)
+        if page:
+            request_params["page"] = page
+        request_params["page_size"] = page_size
+        return request_params
+
+    @staticmethod
+    def _search_key(scope: str, normalized: Dict[str, Any], page: int, page_size: int) -> Tuple[Any, ...]:
+        return scope, tuple(sorted((k, str(v)) for k, v in normalized.items())), page, page_size
+
+    def invalidate_search(self, params: Optional[Dict[str, Any]] = None) -> None:
+        """Сбрасывает кэш поиска (для всех токенов): для конкретного запроса (все страницы) или целиком."""
+        if params is None:
+            self._search_cache.clear()
+            return
+        query = self._search_key("", self.normalize_search_params(params), 0, 0)[1]
+        self._search_cache.invalidate_where(lambda key: key[1] == query)
+
+    # ------------------------------------------------------------------------
+    # Кэш деталей
+    # ------------------------------------------------------------------------
+
+    @staticmethod
+    def details_key(scope: str, doc_type: str, doc_id: Any) -> Tuple[str, str, str]:
+        """Ключ кэша деталей; *scope* — ``auth_scope`` заголовков запроса."""
+        return scope, str(doc_type), str(doc_id)
+
+    @staticmethod
+    def _decode_details(raw: bytes, doc_type: str) -> Dict[str, Any]:
+        data = codec.loads(raw)
+        data["docType"] = doc_type
+        return data
+
+    def invalidate_document(self, doc_type: str, doc_id: Any) -> None:
+        invalidate_document(doc_type, doc_id)
+
+    def cache_stats(self) -> Dict[str, Dict[str, int]]:
+        """Счётчики попаданий/промахов/вытеснений для кэшей клиента."""
+        return {
+            "details": self._details_cache.stats(),
+            "search": self._search_cache.stats(),
+        }
+
+    # ------------------------------------------------------------------------
+    # HTTP
+    # ------------------------------------------------------------------------
+
+    def _get(
+        self,
+        url: str,
+        params: Optional[Dict[str, Any]] = None,
+        headers: Optional[Dict[str, str]] = None,
+        retries: bool = True,
+    ) -> requests.Response:
+        """GET через пул соединений с объединением одинаковых одновременных запросов.
+
+        Ключ — URL, параметры, токен (чтобы не делиться ответами между
+        пользователями с разными правами) и режим повторов. Тело ответа уже
+        прочитано, поэтому один ``Response`` безопасно отдавать нескольким
+        потокам. ``retries=False`` — транспорт без повторов urllib3.
+        """
+        key = (
+            url,
+            tuple(sorted((k, str(v)) for k, v in (params or {}).items())),
+            (headers or {}).get("Authorization", ""),
+            retries,
+        )
+        http = self._http if retries else self._shared.http_no_retry
+        return self._inflight.do(key, lambda: http.get(url, params=params, headers=headers))
+
+    def _get_checked(
+        self,
+        url: str,
+        message: str,
+        headers: Optional[Dict[str, str]] = None,
+        params: Optional[Dict[str, Any]] = None,
+    ) -> requests.Response:
+        """``_get`` с заголовками авторизации (*headers* или текущий токен);
+        сетевые ошибки — ``ApiConnectionError``."""
+        try:
+            return self._get(url, params=params, headers=self.auth_headers() if headers is None else headers)
+        except requests.RequestException as e:
+            raise ApiConnectionError(f"{message}: {e}", e) from e
+
+    def singleflight_stats(self) -> Dict[str, int]:
+        """Сколько GET-запросов выполнено и сколько присоединилось к уже идущим."""
+        return self._inflight.stats()
@@ -0,0 +1,196 @@
+"""Общий HTTP-транспорт для всех сервисов FSA.
+
+Для каждого сервиса (``auth``, ``registry``, ``document``, ``certificate``)
+создаётся собственная ``requests.Session`` с пулом keep-alive соединений,
+чтобы не открывать новое TCP-соединение на каждый запрос.
+Таймаут и количество повторов берутся из ``config.json`` (``timeout``,
+``max_retries``), размеры пулов — из ``pool_sizes``, но не меньше числа
+рабочих потоков разделов, которые ходят в этот сервис (``bulk_update``,
+``batch_sync``, ``period_loader``), чтобы пул не отбрасывал соединения.
+
+Повторы. ``get_transport(service)`` повторяет ошибки соединения и ответы
+502/503/504 на уровне urllib3 — для простых вызовов без своей логики
+повторов. Таймаут чтения не повторяется: сервер мог уже принять запрос, и
+повтор запустил бы ту же операцию ещё раз. Код с собственным циклом повторов, ограничением частоты или
+бюджетом времени на запрос берёт ``get_transport(service, retries=False)``:
+тогда одна попытка — это ровно один HTTP-запрос, и повторами владеет только
+вызывающий код.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from typing import Any, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from config.config import load_config
+
+logger = logging.getLogger(__name__)
+
+SERVICES: tuple[str, ...] = ("auth", "registry", "document", "certificate")
+
+# Значения по умолчанию, если в config.json нет соответствующих полей
+_DEFAULT_TIMEOUT: float = 30
+_DEFAULT_MAX_RETRIES: int = 3
+_DEFAULT_POOL_SIZE: int = 10
+
+# Разделы config.json с рабочими потоками, обращающимися к сервису: (раздел, ключ)
+_POOL_CONSUMERS: Dict[str, tuple[tuple[str, str], ...]] = {
+    "document": (("bulk_update", "max_workers"), ("batch_sync", "max_workers"), ("period_loader", "workers")),
+}
+
+# Повторяем только «временные» ответы шлюза и только идемпотентные методы
+_RETRY_STATUSES: frozenset[int] = frozenset({502, 503, 504})
+_RETRY_METHODS: frozenset[str] = frozenset({"GET", "HEAD", "OPTIONS", "PUT"})
+
+
+class ServiceTransport:
+    """Пул соединений и политика повторов для одного сервиса."""
+
+    def __init__(self, service: str, pool_size: int, timeout: float, max_retries: int) -> None:
+        self.service = service
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.max_retries = max_retries
+
+        # max_retries=0 — без повторов: ошибка соединения сразу уходит вызывающему
+        retry: Retry | int = Retry(
+            total=max_retries,
+            read=False,  # таймаут/обрыв чтения сразу отдаём вызывающему: запрос мог дойти до сервиса
+            backoff_factor=0.3,
+            status_forcelist=_RETRY_STATUSES,
+            allowed_methods=_RETRY_METHODS,
+            raise_on_status=False,  # последний ответ отдаём вызывающему как есть
+        ) if max_retries else 0
+        self._adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=retry)
+
+        self.session = requests.Session()
+        self.session.mount("http://", self._adapter)
+        self.session.mount("https://", self._adapter)
+
+        self._lock = threading.Lock()
+        self._requests = 0
+        self._errors = 0
+
+    def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        """Выполняет запрос через пул; ``timeout`` подставляется из конфига."""
+        kwargs.setdefault("timeout", self.timeout)
+        try:
+            return self.session.request(method, url, **kwargs)
+        except requests.RequestException:
+            with self._lock:
+                self._errors += 1
+            raise
+        finally:
+            with self._lock:
+                self._requests += 1
+
+    def get(self, url: str, **kwargs: Any) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs: Any) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url: str, **kwargs: Any) -> requests.Response:
+        return self.request("PUT", url, **kwargs)
+
+    def stats(self) -> Dict[str, Any]:
+        """Статистика по сервису и по каждому пулу (хосту) внутри него."""
+        pools: Dict[str, Dict[str, int]] = {}
+        manager = self._adapter.poolmanager
+        for key in list(manager.pools.keys()):
+            pool = manager.pools.get(key)
+            if pool is None:
+                continue
+            pools[f"{pool.scheme}://{pool.host}:{pool.port}"] = {
+                "connections_opened": pool.num_connections,
+                "requests": pool.num_requests,
+                # очередь пула заранее заполнена None-слотами, считаем только живые соединения
+                "idle": sum(1 for conn in list(pool.pool.queue) if conn is not None) if pool.pool is not None else 0,
+            }
+        with self._lock:
+            return {
+                "pool_size": self.pool_size,
+                "requests": self._requests,
+                "errors": self._errors,
+                "pools": pools,
+            }
+
+    def close(self) -> None:
+        self.session.close()
+
+
+# ---------------------------------------------------------------------------
+# Реестр транспортов (по одному на сервис и режим повторов на процесс)
+# ---------------------------------------------------------------------------
+
+# (сервис, повторы) -> транспорт
+_transports: Dict[tuple[str, bool], ServiceTransport] = {}
+_transports_lock = threading.Lock()
+
+
+def _pool_size(config: Any, service: str) -> int:
+    """Размер пула: ``pool_sizes[service]``, но не меньше рабочих потоков его потребителей."""
+    pool_sizes: Dict[str, int] = config.get("pool_sizes", {}) or {}
+    size = int(pool_sizes.get(service, _DEFAULT_POOL_SIZE))
+    for section, key in _POOL_CONSUMERS.get(service, ()):
+        workers = (config.get(section) or {}).get(key)
+        if workers:
+            size = max(size, int(workers))
+    return size
+
+
+def _build_transport(service: str, retries: bool) -> ServiceTransport:
+    config = load_config()
+    return ServiceTransport(
+        service,
+        pool_size=_pool_size(config, service),
+        timeout=float(config.get("timeout", _DEFAULT_TIMEOUT)),
+        max_retries=int(config.get("max_retries", _DEFAULT_MAX_RETRIES)) if retries else 0,
+    )
+
+
+def get_transport(service: str, retries: bool = True) -> ServiceTransport:
+    """Возвращает (и при первом обращении создаёт) транспорт для *service*.
+
+    ``retries=False`` — отдельная сессия без повторов urllib3 для кода,
+    который сам повторяет запросы (см. описание модуля).
+    """
+    if service not in SERVICES:
+        raise ValueError(f"Неизвестный сервис: {service}")
+    key = (service, retries)
+    transport = _transports.get(key)
+    if transport is None:
+        with _transports_lock:
+            transport = _transports.get(key)
+            if transport is None:
+                transport = _build_transport(service, retries)
+                _transports[key] = transport
+                logger.debug("Создан HTTP-пул для сервиса %s (size=%s, retries=%s)",
+                             service, transport.pool_size, transport.max_retries)
+    return transport
+
+
+def pool_stats(service: Optional[str] = None) -> Dict[str, Dict[str, Any]]:
+    """Статистика пулов: по одному сервису или по всем уже созданным.
+
+    Транспорт без повторов того же сервиса показывается как ``<service>/no-retry``.
+    """
+    if service is not None:
+        return {service: get_transport(service).stats()}
+    return {
+        name if retries else f"{name}/no-retry": t.stats()
+        for (name, retries), t in list(_transports.items())
+    }
+
+
+def close_all() -> None:
+    """Закрывает все сессии (например, при остановке воркера)."""
+    with _transports_lock:
+        for transport in _transports.values():
+            transport.close()
+        _transports.clear()
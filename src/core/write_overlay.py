@@ -0,0 +1,153 @@
+"""Наложение недавно отправленных изменений (userData) на результаты поиска.
+
+search-api показывает изменения только после синхронизации индекса. Чтобы
+таблица сразу отражала отправленные правки без повторных запросов, после
+успешного ``PUT /documents/{type}/{id}`` тело запроса запоминается здесь
+(общий на процесс LRU с TTL, ``config.json`` → ``cache.write_overlay``), а
+``apply_write_overlay`` подставляет его в элементы ответа поиска.
+
+Запись удаляется, когда свежий ответ поиска уже содержит те же значения
+(индекс догнал), либо по истечении TTL.
+"""
+
+from __future__ import annotations
+
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from config.config import load_config
+from src.core import codec
+from src.core.cache import LRUCache
+
+logger = logging.getLogger(__name__)
+
+# Поле userData.product -> поле Product в элементе поиска
+_PRODUCT_FIELDS: Tuple[Tuple[str, str, bool], ...] = (
+    ("name", "Name", False),
+    ("description", "Description", False),
+    ("country", "Country", False),
+    ("tnveds", "Tnveds", True),
+    ("materials", "Materials", True),
+    ("genders", "Genders", True),
+    ("brands", "Brands", True),
+)
+
+
+def _build_overlay_cache() -> LRUCache:
+    cfg = (load_config().get("cache") or {}).get("write_overlay", {})
+    return LRUCache(
+        ttl=float(cfg.get("ttl", 900)),
+        max_entries=int(cfg.get("max_entries", 5000)),
+        max_bytes=int(cfg.get("max_bytes", 10 * 1024 * 1024)),
+    )
+
+
+# (doc_type, str(doc_id)) -> userData из последнего успешного PUT
+_overlay = _build_overlay_cache()
+
+
+def _key(doc_type: str, doc_id: Any) -> Tuple[str, str]:
+    return doc_type, str(doc_id)
+
+
+def _item_key(item: Dict[str, Any]) -> Tuple[str, str]:
+    return _key("declaration" if item.get("Type") == "D" else "certificate", item.get("ID"))
+
+
+def record_write(doc_type: str, doc_id: Any, user_data: Dict[str, Any]) -> None:
+    """Запоминает успешно отправленные изменения документа.
+
+    Повторная запись для того же документа объединяется с предыдущей.
+    """
+    if not user_data:
+        return
+    key = _key(doc_type, doc_id)
+    merged = dict(_overlay.get(key) or {})
+    for section, values in user_data.items():
+        if isinstance(values, dict) and isinstance(merged.get(section), dict):
+            merged[section] = {**merged[section], **values}
+        else:
+            merged[section] = values
+    _overlay.set(key, merged, size=len(codec.dumps(merged)))
+
+
+def _branches(branches: List[Dict[str, Any]]) -> List[Dict[str, str]]:
+    """Филиалы userData (``name``/``country``) в формате поиска (``Name``/``Country``)."""
+    result = []
+    for branch in branches:
+        entry = {"Country": branch.get("country", "")}
+        if branch.get("name"):
+            entry["Name"] = branch["name"]
+        result.append(entry)
+    return result
+
+
+def _branch_tuples(branches: Any) -> List[Tuple[Any, Any]]:
+    return [(b.get("Country"), b.get("Name") or "") for b in branches or () if isinstance(b, dict)]
+
+
+def _overlay_item(item: Dict[str, Any], user_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Копия *item* с наложенными *user_data* или ``None``, если значения уже совпадают."""
+    product_update: Dict[str, Any] = {}
+    product = item.get("Product") if isinstance(item.get("Product"), dict) else {}
+    for field, search_field, is_list in _PRODUCT_FIELDS:
+        if field not in (user_data.get("product") or {}):
+            continue
+        value = user_data["product"][field]
+        current = product.get(search_field)
+        if (list(current or ()) if is_list else (current or "")) != (list(value or ()) if is_list else (value or "")):
+            product_update[search_field] = value
+
+    branches_update: Optional[List[Dict[str, str]]] = None
+    manufacturer = item.get("Manufacturer") if isinstance(item.get("Manufacturer"), dict) else {}
+    branches = (user_data.get("manufacturer") or {}).get("branches")
+    if branches is not None:
+        overlay_branches = _branches(branches)
+        if _branch_tuples(manufacturer.get("Branches")) != _branch_tuples(overlay_branches):
+            branches_update = overlay_branches
+
+    if not product_update and branches_update is None:
+        return None
+    patched = dict(item)
+    if product_update:
+        patched["Product"] = {**product, **product_update}
+    if branches_update is not None:
+        patched["Manufacturer"] = {**manufacturer, "Branches": branches_update}
+    return patched
+
+
+def apply_write_overlay(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Элементы поиска с наложенными недавними изменениями.
+
+    Исходные элементы не изменяются: изменённые заменяются копиями, без
+    записей в наложении возвращается тот же список. Записи, значения которых
+    уже есть в ответе поиска, удаляются.
+    """
+    if not items or not len(_overlay):
+        return items
+    result = items
+    for pos, item in enumerate(items):
+        if not isinstance(item, dict):
+            continue
+        key = _item_key(item)
+        user_data = _overlay.get(key)
+        if user_data is None:
+            continue
+        patched = _overlay_item(item, user_data)
+        if patched is None:
+            # индекс уже содержит изменения — наложение больше не нужно
+            _overlay.invalidate(key)
+            logger.debug("Наложение изменений снято: %s/%s", *key)
+            continue
+        if result is items:
+            result = list(items)
+        result[pos] = patched
+    return result
+
+
+def write_overlay_stats() -> Dict[str, int]:
+    return _overlay.stats()
+
+
+def clear_write_overlay() -> None:
+    _overlay.clear()
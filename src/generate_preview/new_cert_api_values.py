@@ -1,7 +1,8 @@
-import re
+from functools import lru_cache
 from typing import Dict, Any
 
-from src.utils.json_path_registry import get_value as _gv, reverse_lookup as _rev, ALL_PATHS
+from src.generate_preview.template_engine import CompiledMapping, is_declaration
+from src.utils.json_path_registry import registry_version
 
 
 data_to_api = {
@@ -47,7 +48,15 @@ data_to_api_declaration = {
 }
 
 
-_PH_RE = re.compile(r"\{([^{}]+)\}")
+@lru_cache(maxsize=8)
+def _compiled_mapping(declaration: bool, version: int) -> CompiledMapping:  # noqa: ARG001 - version входит в ключ кэша
+    return CompiledMapping(data_to_api_declaration if declaration else data_to_api)
+
+
+def compiled_mapping(declaration: bool) -> CompiledMapping:
+    """Скомпилированный набор шаблонов для типа документа (кэшируется)."""
+    return _compiled_mapping(declaration, registry_version())
+
 
 def render_data_to_api(merged_data: Dict[str, Any]) -> Dict[str, str]:  # noqa: D401
     """Возвращает заполненный словарь для API в зависимости от типа документа.
@@ -55,26 +64,8 @@ def render_data_to_api(merged_data: Dict[str, Any]) -> Dict[str, str]:  # noqa:
     Если ``merged_data['docType']`` начинается с ``"declaration"`` (регистр
     игнорируется), используется словарь ``data_to_api_declaration``. Иначе
     применяем стандартный ``data_to_api`` (сертификат).
-    """
 
-    # Определяем, какой набор плейсхолдеров использовать
-    doc_type_raw = str(merged_data.get("docType", "")).lower()
-    mapping = data_to_api_declaration if doc_type_raw.startswith("declaration") else data_to_api
-
-    def _fill(text: str) -> str:
-        def _sub(m: re.Match[str]) -> str:
-            ph = m.group(1)
-            if ph in ALL_PATHS:
-                return str(_gv(merged_data, ph, ""))
-            # fallback – поддержка прямого пути
-            key = _rev(ph)
-            if key:
-                return str(_gv(merged_data, key, ""))
-            return ""
-
-        return _PH_RE.sub(_sub, text)
-
-    filled: Dict[str, str] = {}
-    for k, v in mapping.items():
-        filled[k] = _fill(v)
-    return filled
+    Шаблоны компилируются один раз, значения извлекаются одним обходом
+    ``merged_data``; плейсхолдеры, не найденные в реестре, дают ``""``.
+    """
+    return compiled_mapping(is_declaration(merged_data)).render(merged_data)
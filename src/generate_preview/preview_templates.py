@@ -1,8 +1,8 @@
-import re
 from typing import Any, Dict
 
 # --- Новое: берём ключи и функции из реестра путей
-from src.utils.json_path_registry import get_value as gv, reverse_lookup, ALL_PATHS
+from src.utils.json_path_registry import extract_many, compile_path
+from src.generate_preview.template_engine import CompiledTemplate, compile_template, is_declaration
 
 
 
@@ -68,17 +68,6 @@ CERTIFICATE_PREVIEW_TEMPLATE: str = (
 # ---------------------------------------------------------------------------
 
 
-# Паттерн для поиска плейсхолдеров вида {path.to.value}
-_PLACEHOLDER_RE = re.compile(r"\{([^{}]+)\}")
-
-# При импорте здесь возможен цикл, поэтому делаем ленивый импорт внутри функции
-
-
-def _normalize_path(path: str) -> str:
-    """Удаляет лишнюю точку перед квадратной скобкой: `.foo.[0]` → `foo[0]`."""
-    return path.replace('.[', '[')
-
-
 def _resolve_path(data: Dict[str, Any], path: str) -> str:
     """Возвращает строковое значение по заданному пути.
 
@@ -86,54 +75,21 @@ def _resolve_path(data: Dict[str, Any], path: str) -> str:
     • индексы вида `[0]`, `[1]` — обращение к конкретному элементу массива;
     • маркер `[n]` — перебор всех элементов массива с последующим объединением
       строковых представлений через запятую.
-    """
 
-    def _traverse(current: Any, tokens: list[str]) -> list[Any]:
-        if not tokens:
-            return [current]
-
-        token = tokens[0]
-
-        # Обработка токена вида key[n] (взять все элементы списка)
-        match_all = re.fullmatch(r'(\w+)\[n\]', token)
-        if match_all:
-            key = match_all.group(1)
-            next_current = []
-            if isinstance(current, dict):
-                next_current = current.get(key, [])
-            if isinstance(next_current, list):
-                results: list[Any] = []
-                for item in next_current:
-                    results.extend(_traverse(item, tokens[1:]))
-                return results
-            return []
-
-        # Обработка индекса, например protocols[0]
-        match = re.fullmatch(r'(\w+)\[(\d+)\]', token)
-        if match:
-            key, idx_str = match.group(1), match.group(2)
-            idx = int(idx_str)
-            next_current = {}
-            if isinstance(current, dict):
-                next_current = current.get(key, [])
-            if isinstance(next_current, list) and 0 <= idx < len(next_current):
-                return _traverse(next_current[idx], tokens[1:])
-            return []
-
-        # Обычный ключ словаря
-        if isinstance(current, dict):
-            return _traverse(current.get(token, ''), tokens[1:])
-
-        return []
-
-    tokens = _normalize_path(path).split('.')
-    values = _traverse(data, tokens)
+    Путь компилируется один раз (``compile_path`` кэширует результат).
+    """
+    values = compile_path(path).values(data, missing_as_empty=True)
 
     # Фильтруем пустые и преобразуем к строке
     str_values = [str(v) for v in values if v not in (None, {}, [])]
     return ', '.join(str_values)
 
 
+def preview_template(declaration: bool) -> CompiledTemplate:
+    """Скомпилированный шаблон предпросмотра для типа документа."""
+    return compile_template(DECLARATION_PREVIEW_TEMPLATE if declaration else CERTIFICATE_PREVIEW_TEMPLATE)
+
+
 def render_certificate_preview(merged_data: Dict[str, Any]) -> str:
     """Подставляет данные из *merged_data* в подходящий текстовый шаблон.
 
@@ -141,27 +97,13 @@ def render_certificate_preview(merged_data: Dict[str, Any]) -> str:
     ``DECLARATION_PREVIEW_TEMPLATE``; иначе используется
     ``CERTIFICATE_PREVIEW_TEMPLATE``.
     """
-
-    # Определяем тип документа
-    doc_type_raw = str(merged_data.get("docType", "")).lower()
-    use_declaration = doc_type_raw.startswith("declaration")
-
-    template = DECLARATION_PREVIEW_TEMPLATE if use_declaration else CERTIFICATE_PREVIEW_TEMPLATE
-
-    def _replace(match: re.Match[str]) -> str:  # noqa: D401
-        placeholder_path = match.group(1)
-
-        # 0) Если ключ зарегистрирован (в любом из словарей), берём сразу
-        if placeholder_path in ALL_PATHS:
-            return str(gv(merged_data, placeholder_path, ''))
-
-        # 1) Пытаемся найти ключ по путю и взять значение напрямую
-        key = reverse_lookup(placeholder_path)
-        if key:
-            return str(gv(merged_data, key, ''))
-
-        # 2) Fallback – старый механизм прямого разбора пути
-        return _resolve_path(merged_data, placeholder_path)
-
-    filled = _PLACEHOLDER_RE.sub(_replace, template)
-    return filled
+    template = preview_template(is_declaration(merged_data))
+
+    # Ключи реестра определены при компиляции; значения всех ключей — одним обходом.
+    values = extract_many(merged_data, [k for k in template.keys if k])
+    return template.render([
+        str(values[key]) if key
+        # Fallback – старый механизм прямого разбора пути
+        else _resolve_path(merged_data, placeholder_path)
+        for placeholder_path, key in zip(template.placeholders, template.keys)
+    ])
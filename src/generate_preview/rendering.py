@@ -0,0 +1,106 @@
+"""Мемоизированный рендеринг значений для API и предпросмотра.
+
+``render_data_to_api`` вызывается на каждом перезапуске скрипта из
+нескольких мест (редактор данных API, предпросмотр, генерация payload).
+Результаты кэшируются в workspace сессии по ключу
+«отпечаток merged_data + версия overrides + версия реестра путей»:
+
+- ``FSAApiClient.update_merged_data`` меняет отпечаток;
+- ``FSAApiClient.upsert_template_value`` увеличивает версию overrides;
+- ``register_paths`` увеличивает версию реестра.
+
+Поэтому явная инвалидация не требуется.
+
+Значения ``data_to_api`` без overrides переиспользуются, пока не изменился
+отпечаток merged_data, поэтому правка overrides их не перерендеривает. Если
+merged_data изменён через ``update_merged_data``, перерендериваются только
+выходные ключи, зависящие от изменённых путей (``DependencyGraph``). В
+предпросмотре пересобираются только изменившиеся сегменты (``PreviewState``).
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Optional
+
+from src.api.client import FSAApiClient
+from src.generate_preview.new_cert_api_values import compiled_mapping
+from src.generate_preview.preview_templates import preview_template
+from src.generate_preview.template_engine import PreviewState, is_declaration
+from src.utils.json_path_registry import registry_version
+
+
+def template_doc_id(merged_data: Dict[str, Any]) -> str:
+    """Идентификатор документа, под которым хранятся overrides шаблона."""
+    return str(
+        merged_data.get("ID")
+        or merged_data.get("search_ID")
+        or merged_data.get("RegistryID")
+        or ""
+    )
+
+
+def _render_key(kind: str, client: FSAApiClient) -> tuple:
+    workspace = client.workspace
+    return kind, workspace.merged_fingerprint(), workspace.overrides_version, registry_version()
+
+
+def _render_base(client: FSAApiClient, merged_data: Dict[str, Any]) -> Dict[str, str]:
+    """``render_data_to_api`` без overrides с инкрементальным обновлением по изменённым путям."""
+    workspace = client.workspace
+    mapping = compiled_mapping(is_declaration(merged_data))
+    changed = workspace.take_changed_paths()
+    fingerprint = workspace.merged_fingerprint()
+    previous = workspace.render_state.get("base")
+    # mapping зависит от типа документа и версии реестра — при их смене рендерим заново
+    if previous is not None and previous[0] is mapping:
+        if previous[1] == fingerprint:
+            return previous[2]
+        if changed is not None:
+            values = mapping.rerender(merged_data, previous[2], changed)
+            workspace.render_state["base"] = (mapping, fingerprint, values)
+            return values
+    values = mapping.render(merged_data)
+    workspace.render_state["base"] = (mapping, fingerprint, values)
+    return values
+
+
+def _build_templated(client: FSAApiClient, merged_data: Dict[str, Any]) -> Dict[str, str]:
+    templated = dict(_render_base(client, merged_data))
+    # добавляем пользовательские overrides, если есть
+    templated.update(client.get_template_overrides(template_doc_id(merged_data)))
+    return templated
+
+
+def templated_values(client: Optional[FSAApiClient] = None) -> Dict[str, str]:
+    """Значения ``data_to_api`` для текущего merged_data с учётом overrides.
+
+    Возвращается копия — её можно изменять.
+    """
+    client = client or FSAApiClient.get_instance()
+    merged_data = client.get_last_merged_data() or {}
+    cached = client.workspace.memoized(
+        _render_key("templated", client),
+        lambda: _build_templated(client, merged_data),
+    )
+    return dict(cached)
+
+
+def preview_text(client: Optional[FSAApiClient] = None) -> str:
+    """Текст предпросмотра для текущего merged_data с учётом overrides."""
+    client = client or FSAApiClient.get_instance()
+    merged_data = client.get_last_merged_data() or {}
+    return client.workspace.memoized(
+        _render_key("preview", client),
+        lambda: _build_preview(client, merged_data),
+    )
+
+
+def _build_preview(client: FSAApiClient, merged_data: Dict[str, Any]) -> str:
+    template = preview_template(is_declaration(merged_data))
+    templated = templated_values(client)
+    state = client.workspace.render_state.get("preview")
+    if state is not None and state.template is template:
+        return state.update(templated)
+    state = PreviewState(template, templated)
+    client.workspace.render_state["preview"] = state
+    return state.text
@@ -0,0 +1,187 @@
+"""Компиляция текстовых шаблонов с плейсхолдерами ``{key}``.
+
+Шаблон разбирается один раз в последовательность литералов и плейсхолдеров;
+для каждого плейсхолдера заранее определяется ключ реестра путей
+(сам ключ или, как fallback, ключ по прямому пути). Рендеринг — простой
+``"".join`` без регулярных выражений.
+
+Скомпилированные формы кэшируются по тексту шаблона и версии реестра путей
+(``json_path_registry.registry_version``), поэтому ``register_paths``
+автоматически приводит к перекомпиляции.
+"""
+
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Set, Tuple
+
+from src.utils.json_path_registry import (
+    Step,
+    compile_path,
+    extract_many,
+    get_path,
+    paths_overlap,
+    registry_version,
+    reverse_lookup,
+)
+
+_PH_RE = re.compile(r"\{([^{}]+)\}")
+
+
+def is_declaration(merged_data: Mapping[str, Any]) -> bool:
+    """``True``, если ``merged_data['docType']`` начинается с ``declaration`` (без учёта регистра)."""
+    return str(merged_data.get("docType", "")).lower().startswith("declaration")
+
+
+def resolve_key(placeholder: str) -> Optional[str]:
+    """Ключ реестра для плейсхолдера: сам ключ или ключ по прямому пути."""
+    if get_path(placeholder) is not None:
+        return placeholder
+    return reverse_lookup(placeholder)
+
+
+class CompiledTemplate:
+    """Шаблон, разобранный на ``literals[0] {placeholders[0]} literals[1] ... literals[N]``.
+
+    ``keys`` — ключи реестра для плейсхолдеров (``None``, если не найден).
+    """
+
+    __slots__ = ("source", "literals", "placeholders", "keys")
+
+    def __init__(self, source: str) -> None:
+        parts = _PH_RE.split(source)
+        self.source = source
+        self.literals: Tuple[str, ...] = tuple(parts[0::2])
+        self.placeholders: Tuple[str, ...] = tuple(parts[1::2])
+        self.keys: Tuple[Optional[str], ...] = tuple(resolve_key(ph) for ph in self.placeholders)
+
+    def render(self, values: Sequence[str]) -> str:
+        """Подставляет *values* (по одному на плейсхолдер, в порядке ``placeholders``)."""
+        literals = self.literals
+        if not self.placeholders:
+            return literals[0]
+        parts = [literals[0]]
+        for value, literal in zip(values, literals[1:]):
+            parts.append(value)
+            parts.append(literal)
+        return "".join(parts)
+
+    def render_map(self, values: Mapping[str, Any]) -> str:
+        """Подставляет значения по имени плейсхолдера; отсутствующие — пустая строка.
+
+        Эквивалент ``template.format_map(defaultdict(str, values))``.
+        """
+        return self.render([str(values.get(ph, "")) for ph in self.placeholders])
+
+    def __repr__(self) -> str:
+        return f"CompiledTemplate({len(self.placeholders)} placeholders)"
+
+
+class DependencyGraph:
+    """Зависимости «выходной ключ → ключи реестра → JSON-пути».
+
+    Позволяет по списку изменённых путей merged_data определить, какие
+    выходные значения нужно перерендерить.
+    """
+
+    __slots__ = ("key_outputs", "key_steps")
+
+    def __init__(self, templates: Mapping[str, CompiledTemplate]) -> None:
+        self.key_outputs: Dict[str, Set[str]] = {}
+        for out_key, tpl in templates.items():
+            for key in tpl.keys:
+                if key:
+                    self.key_outputs.setdefault(key, set()).add(out_key)
+        self.key_steps: Dict[str, Tuple[Step, ...]] = {
+            key: compile_path(get_path(key)).steps for key in self.key_outputs
+        }
+
+    def affected_keys(self, changed_paths: Iterable[str]) -> Set[str]:
+        """Ключи реестра, значения которых могли измениться."""
+        affected: Set[str] = set()
+        for path in changed_paths:
+            changed = compile_path(path).steps
+            affected.update(key for key, steps in self.key_steps.items() if paths_overlap(changed, steps))
+        return affected
+
+    def affected_outputs(self, changed_paths: Iterable[str]) -> Set[str]:
+        """Выходные ключи, которые нужно перерендерить."""
+        return {out for key in self.affected_keys(changed_paths) for out in self.key_outputs[key]}
+
+
+class CompiledMapping:
+    """Набор шаблонов «выходной ключ → шаблон» (например, ``data_to_api``)."""
+
+    __slots__ = ("templates", "keys", "dependencies")
+
+    def __init__(self, mapping: Mapping[str, str]) -> None:
+        self.templates: Dict[str, CompiledTemplate] = {k: compile_template(v) for k, v in mapping.items()}
+        # Все ключи реестра, нужные для рендеринга (без повторов)
+        self.keys: Tuple[str, ...] = tuple(dict.fromkeys(
+            key for tpl in self.templates.values() for key in tpl.keys if key
+        ))
+        self.dependencies = DependencyGraph(self.templates)
+
+    def render(self, merged_data: Mapping[str, Any], outputs: Optional[Iterable[str]] = None) -> Dict[str, str]:
+        """Значения всех ключей извлекаются одним обходом (``extract_many``).
+
+        *outputs* — рендерить только эти выходные ключи (инкрементальное обновление).
+        """
+        if outputs is None:
+            templates: Mapping[str, CompiledTemplate] = self.templates
+            keys: Iterable[str] = self.keys
+        else:
+            templates = {out: self.templates[out] for out in outputs}
+            keys = [key for tpl in templates.values() for key in tpl.keys if key]
+        values = extract_many(merged_data, keys)
+        return {
+            out_key: tpl.render([str(values[key]) if key else "" for key in tpl.keys])
+            for out_key, tpl in templates.items()
+        }
+
+    def rerender(self, merged_data: Mapping[str, Any], previous: Dict[str, str], changed_paths: Iterable[str]) -> Dict[str, str]:
+        """Обновляет *previous* после изменения *changed_paths*: рендерятся только затронутые ключи."""
+        affected = self.dependencies.affected_outputs(changed_paths)
+        if not affected:
+            return dict(previous)
+        updated = dict(previous)
+        updated.update(self.render(merged_data, affected))
+        return updated
+
+
+class PreviewState:
+    """Последний отрендеренный предпросмотр: значения плейсхолдеров (сегменты) и текст.
+
+    ``update`` заменяет только сегменты, значения которых изменились, и
+    пересобирает текст лишь при наличии изменений. Сегменты хранятся
+    строками, поэтому новые значения сравниваются после ``str``.
+    """
+
+    __slots__ = ("template", "segments", "text")
+
+    def __init__(self, template: CompiledTemplate, values: Mapping[str, Any]) -> None:
+        self.template = template
+        self.segments: List[str] = [str(values.get(ph, "")) for ph in template.placeholders]
+        self.text = template.render(self.segments)
+
+    def update(self, values: Mapping[str, Any]) -> str:
+        dirty = False
+        for pos, ph in enumerate(self.template.placeholders):
+            value = str(values.get(ph, ""))
+            if self.segments[pos] != value:
+                self.segments[pos] = value
+                dirty = True
+        if dirty:
+            self.text = self.template.render(self.segments)
+        return self.text
+
+
+@lru_cache(maxsize=256)
+def _compile(source: str, version: int) -> CompiledTemplate:  # noqa: ARG001 - version входит в ключ кэша
+    return CompiledTemplate(source)
+
+
+def compile_template(source: str) -> CompiledTemplate:
+    """Скомпилированный шаблон (кэшируется по тексту и версии реестра)."""
+    return _compile(source, registry_version())
@@ -0,0 +1,228 @@
+"""Параллельная отправка обновлений документов (``PUT /documents/{type}/{id}``).
+
+``BulkUpdateDispatcher`` отправляет задания в ограниченном пуле потоков
+(не больше пула соединений сервиса ``document``), с таймаутом на каждый
+запрос. Одиночные обновления выполняет ``DocumentService.put_document``
+с транспортом без повторов (``retries=False``): неуспешное обновление
+возвращается в итогах, а не повторяется молча внутри пула. Если в конфиге включён пакетный режим (``bulk_update.batch_endpoint``)
+и loader-api поддерживает ``PUT /documents/batch``, задания отправляются
+пачками по ``batch_size``; при 404/405 диспетчер возвращается к запросам по
+одному документу.
+
+Рабочие потоки не обращаются к Streamlit: токен читается заранее (заголовки
+или ``TokenProvider`` из ``src.core.auth``), а прогресс, учёт успешных
+обновлений (``record_update``) и разбор итогов выполняются в вызывающем потоке.
+
+Формат пакетного запроса::
+
+    {"documents": [{"type": "certificate", "id": 1, "userData": {...}}, ...]}
+
+Ответ — ``{"results": [{"type": ..., "id": ..., "success": bool, "error": str | null}, ...]}``.
+"""
+
+from __future__ import annotations
+
+import logging
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import requests
+
+from config.config import load_config
+from src.core import codec
+from src.core.auth import TokenProvider, bearer_headers
+from src.core.documents import DocumentService, record_update
+from src.core.errors import ApiConnectionError, ApiError, error_for_response
+from src.core.transport import get_transport
+
+logger = logging.getLogger(__name__)
+
+# Колбэк прогресса: (готово, всего); вызывается в вызывающем потоке
+ProgressCallback = Callable[[int, int], None]
+
+_DEFAULT_TIMEOUT: float = 15
+_DEFAULT_BATCH_SIZE: int = 50
+
+# Ответы, по которым считаем, что пакетного эндпоинта нет
+_BATCH_UNSUPPORTED: frozenset[int] = frozenset({404, 405})
+
+
+@dataclass
+class UpdateJob:
+    """Одно обновление: ``payload`` — тело PUT (``DocumentUpdateRequest.model_dump(exclude_none=True)``)."""
+
+    doc_id: Any
+    doc_type: str
+    payload: Dict[str, Any]
+
+
+@dataclass
+class UpdateOutcome:
+    """Итог обновления одного документа.
+
+    ``status`` — HTTP-статус ответа (``None``, если ответа не было).
+    """
+
+    doc_id: Any
+    doc_type: str
+    success: bool
+    status: Optional[int] = None
+    error: Optional[str] = None
+
+    @property
+    def unauthorized(self) -> bool:
+        return self.status == 401
+
+
+class _BatchUnsupported(Exception):
+    """loader-api не поддерживает пакетный эндпоинт."""
+
+
+def _failed(job: UpdateJob, error: str, status: Optional[int] = None) -> UpdateOutcome:
+    return UpdateOutcome(job.doc_id, job.doc_type, False, status, error)
+
+
+def _error_text(error: ApiError) -> str:
+    return f"HTTP {error.status}" + (f": {error.detail}" if error.detail else "")
+
+
+class BulkUpdateDispatcher:
+    """Отправка набора ``UpdateJob`` с ограниченной параллельностью.
+
+    Параметры по умолчанию берутся из раздела ``bulk_update`` в ``config.json``.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        timeout: Optional[float] = None,
+        batch_size: Optional[int] = None,
+        batch_endpoint: Optional[bool] = None,
+    ) -> None:
+        self._config = load_config()
+        cfg = self._config.get("bulk_update") or {}
+        self._transport = get_transport("document", retries=False)
+        self.max_workers = max(1, int(max_workers or cfg.get("max_workers") or self._transport.pool_size))
+        self.timeout = float(timeout or cfg.get("timeout") or _DEFAULT_TIMEOUT)
+        self.batch_size = max(1, int(batch_size or cfg.get("batch_size") or _DEFAULT_BATCH_SIZE))
+        self.batch_endpoint = bool(cfg.get("batch_endpoint", False) if batch_endpoint is None else batch_endpoint)
+        self._documents = DocumentService(timeout=self.timeout, retries=False)
+
+    # ------------------------------------------------------------------------
+    # Запросы (выполняются в рабочих потоках, без Streamlit)
+    # ------------------------------------------------------------------------
+
+    def _put_one(self, job: UpdateJob, auth: Dict[str, str]) -> UpdateOutcome:
+        try:
+            self._documents.put_document(job.doc_type, job.doc_id, job.payload, headers=auth)
+        except ApiError as e:
+            return _failed(job, _error_text(e), e.status)
+        except ApiConnectionError as e:
+            logger.error("%s", e)
+            return _failed(job, str(e.cause or e))
+        return UpdateOutcome(job.doc_id, job.doc_type, True, 200)
+
+    def _put_batch(self, jobs: Sequence[UpdateJob], headers: Dict[str, str]) -> List[UpdateOutcome]:
+        url = self._config.get_service_url("document", "update_documents_batch")
+        body = {"documents": [{"type": j.doc_type, "id": j.doc_id, "userData": j.payload} for j in jobs]}
+        try:
+            response = self._transport.put(url, data=codec.dumps(body), headers=headers, timeout=self.timeout)
+        except requests.RequestException as e:
+            logger.error("Ошибка пакетного обновления (%d документов): %s", len(jobs), e)
+            return [_failed(job, str(e)) for job in jobs]
+        if response.status_code in _BATCH_UNSUPPORTED:
+            raise _BatchUnsupported(response.status_code)
+        if response.status_code != 200:
+            error = _error_text(error_for_response(response, "Ошибка пакетного обновления"))
+            return [_failed(job, error, response.status_code) for job in jobs]
+
+        try:
+            items = codec.decode_response(response).get("results") or []
+        except (ValueError, AttributeError):
+            return [_failed(job, "Некорректный ответ пакетного обновления", 200) for job in jobs]
+        by_key = {(str(item.get("type")), str(item.get("id"))): item for item in items if isinstance(item, dict)}
+        outcomes = []
+        for job in jobs:
+            item = by_key.get((job.doc_type, str(job.doc_id)))
+            if item is None:
+                outcomes.append(_failed(job, "Документ отсутствует в ответе пакетного обновления", 200))
+            elif item.get("success"):
+                outcomes.append(UpdateOutcome(job.doc_id, job.doc_type, True, 200))
+            else:
+                outcomes.append(_failed(job, str(item.get("error") or "Ошибка обновления"), 200))
+        return outcomes
+
+    # ------------------------------------------------------------------------
+    # Диспетчеризация (вызывающий поток)
+    # ------------------------------------------------------------------------
+
+    def _run(
+        self,
+        tasks: List[Tuple[List[int], Callable[[], List[UpdateOutcome]]]],
+        outcomes: List[Optional[UpdateOutcome]],
+        done: int,
+        total: int,
+        progress: Optional[ProgressCallback],
+    ) -> None:
+        """Выполняет задачи ``(позиции, функция)`` в пуле и раскладывает итоги по позициям."""
+        workers = max(1, min(len(tasks), self.max_workers))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="fsa-bulk-update") as pool:
+            pending: Dict[Future, List[int]] = {pool.submit(fn): positions for positions, fn in tasks}
+            try:
+                while pending:
+                    finished, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in finished:
+                        positions = pending.pop(future)
+                        for pos, outcome in zip(positions, future.result()):
+                            outcomes[pos] = outcome
+                        done += len(positions)
+                    if progress is not None:
+                        progress(done, total)
+            except _BatchUnsupported:
+                for future in pending:
+                    future.cancel()
+                raise
+
+    def dispatch(
+        self,
+        jobs: Sequence[UpdateJob],
+        headers: Optional[Dict[str, str]] = None,
+        progress: Optional[ProgressCallback] = None,
+        token_provider: Optional[TokenProvider] = None,
+    ) -> List[UpdateOutcome]:
+        """Отправляет *jobs* и возвращает итоги в том же порядке.
+
+        Авторизация — готовые *headers* или *token_provider* (вызывается один
+        раз в вызывающем потоке); *progress* вызывается после каждого завершённого запроса.
+        Для успешно обновлённых документов сбрасывается кэш клиента, а
+        изменения запоминаются в ``write_overlay`` для таблицы результатов.
+        """
+        total = len(jobs)
+        if not total:
+            return []
+        auth = headers if headers is not None else bearer_headers(token_provider)
+        request_headers = {**auth, **codec.JSON_HEADERS}
+        outcomes: List[Optional[UpdateOutcome]] = [None] * total
+
+        if self.batch_endpoint and total > 1:
+            batches = [list(range(start, min(start + self.batch_size, total))) for start in range(0, total, self.batch_size)]
+            tasks = [
+                (positions, lambda positions=positions: self._put_batch([jobs[p] for p in positions], request_headers))
+                for positions in batches
+            ]
+            try:
+                self._run(tasks, outcomes, 0, total, progress)
+            except _BatchUnsupported as e:
+                logger.warning("Пакетное обновление недоступно (HTTP %s), отправляем по одному документу", e)
+                self.batch_endpoint = False
+
+        remaining = [pos for pos, outcome in enumerate(outcomes) if outcome is None]
+        if remaining:
+            tasks = [([pos], lambda pos=pos: [self._put_one(jobs[pos], auth)]) for pos in remaining]
+            self._run(tasks, outcomes, total - len(remaining), total, progress)
+
+        for job, outcome in zip(jobs, outcomes):
+            if outcome is not None and outcome.success:
+                record_update(job.doc_type, job.doc_id, job.payload)
+        return [outcome for outcome in outcomes if outcome is not None]
@@ -0,0 +1,161 @@
+"""Поиск изменений между исходной и отредактированной таблицей результатов.
+
+Сравнение выполняется по столбцам: для каждого редактируемого столбца
+строится булева маска изменений (для ``BRANCHES`` — поэлементное сравнение
+списков), и только выбранные изменённые строки превращаются в ``RowChange``.
+Модуль не зависит от Streamlit и сети — результат можно проверять и
+замерять отдельно от UI.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Any, Dict, Hashable, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from src.ui.model import TableColumns
+
+# Столбец таблицы -> поле Product; для списковых полей значение разбивается по запятой
+_PRODUCT_FIELDS = (
+    (TableColumns.PRODUCT, "name", False),
+    (TableColumns.DESCRIPTION, "description", False),
+    (TableColumns.PRODUCT_COUNTRY, "country", False),
+    (TableColumns.TNVED, "tnveds", True),
+    (TableColumns.MATERIALS, "materials", True),
+    (TableColumns.GENDER, "genders", True),
+    (TableColumns.BRANDS, "brands", True),
+)
+
+
+def _split_list(value: Any) -> List[str]:
+    """Строка ``"a, b"`` -> ``["a", "b"]``; пустая ячейка (``None`` / ``NaN``) — пустой список."""
+    if value is None or (isinstance(value, float) and np.isnan(value)):
+        return []
+    return [v.strip() for v in str(value).split(",") if v.strip()]
+
+
+def doc_type_from_label(label: Any) -> str:
+    """Тип документа для API по значению столбца «Тип» (``Д`` / ``С``)."""
+    return "declaration" if label == "Д" else "certificate"
+
+
+@dataclass
+class RowChange:
+    """Изменения одной выбранной строки.
+
+    ``product`` — изменённые поля продукта (в формате ``Product``);
+    ``branches`` — новый список филиалов (строки ``"Страна: Название"``) или
+    ``None``, если филиалы не менялись.
+    """
+
+    position: int
+    index: Hashable
+    doc_id: Any
+    doc_type: str
+    product: Dict[str, Any] = field(default_factory=dict)
+    branches: Optional[List[str]] = None
+
+    @property
+    def is_empty(self) -> bool:
+        return not self.product and self.branches is None
+
+
+@dataclass
+class TableChangeSet:
+    """Результат сравнения таблиц.
+
+    ``changes`` — выбранные строки, в которых изменился хотя бы один
+    редактируемый столбец (в порядке строк таблицы); остальные строки
+    считаются пропущенными.
+    """
+
+    changes: List[RowChange]
+    total_rows: int
+    selected_rows: int
+
+    def __len__(self) -> int:
+        return len(self.changes)
+
+
+def _as_list(value: Any) -> Any:
+    """Списковые значения (list / tuple / ndarray после data_editor) приводятся к list."""
+    if isinstance(value, (tuple, np.ndarray)):
+        return list(value)
+    return value
+
+
+def _changed_mask(column: Any, edited: pd.Series, original: pd.Series) -> np.ndarray:
+    """Поэлементное ``edited != original`` с семантикой Python ``!=``.
+
+    Для текстовых столбцов — один ``np.not_equal`` по массивам object
+    (``NaN != NaN``, ``None == None`` — как в Python). Для ``BRANCHES``
+    ячейки содержат списки, их сравниваем попарно как списки.
+    """
+    if column == TableColumns.BRANCHES:
+        pairs = ((_as_list(a), _as_list(b)) for a, b in zip(edited.to_numpy(), original.to_numpy()))
+        return np.fromiter((a != b for a, b in pairs), dtype=bool, count=len(edited))
+    return np.asarray(edited.to_numpy() != original.to_numpy(), dtype=bool)
+
+
+def diff_tables(edited_df: pd.DataFrame, original_df: pd.DataFrame, editable_cols: Iterable[str]) -> TableChangeSet:
+    """Сравнивает таблицы и возвращает изменения выбранных строк.
+
+    Строка попадает в результат, если она выбрана (``SELECT``) и хотя бы
+    один столбец из *editable_cols* отличается от исходного.
+    """
+    total_rows = len(edited_df)
+    selected = edited_df[TableColumns.SELECT].to_numpy(dtype=bool) if total_rows else np.zeros(0, dtype=bool)
+    positions = np.flatnonzero(selected)
+    if not len(positions):
+        return TableChangeSet([], total_rows, 0)
+
+    # Сравниваем только выбранные строки; исходные строки — по тем же индексам
+    edited = edited_df.iloc[positions]
+    original = original_df.loc[edited.index]
+
+    columns = [col for col in editable_cols if col in edited.columns and col in original.columns]
+    masks = {col: _changed_mask(col, edited[col], original[col]) for col in columns}
+    changed_any = np.logical_or.reduce(list(masks.values())) if masks else np.zeros(len(edited), dtype=bool)
+    offsets = np.flatnonzero(changed_any)
+    if not len(offsets):
+        return TableChangeSet([], total_rows, len(positions))
+
+    # Дальше работаем только с изменёнными строками и массивами столбцов
+    changed_edited = edited.iloc[offsets]
+    changed_original = original.iloc[offsets]
+    ids = changed_edited[TableColumns.ID].tolist()
+    labels = changed_edited[TableColumns.TYPE].tolist()
+
+    # Маски полей продукта и филиалов: для нередактируемых столбцов считаем
+    # по изменённым строкам (их мало), как и построчная версия
+    field_columns = [col for col, _, _ in _PRODUCT_FIELDS] + [TableColumns.BRANCHES]
+    field_masks: Dict[Any, np.ndarray] = {}
+    values: Dict[Any, List[Any]] = {}
+    for col in field_columns:
+        if col not in changed_edited.columns or col not in changed_original.columns:
+            continue
+        field_masks[col] = masks[col][offsets] if col in masks else _changed_mask(
+            col, changed_edited[col], changed_original[col]
+        )
+        values[col] = changed_edited[col].tolist()
+
+    changes: List[RowChange] = []
+    for i, offset in enumerate(offsets):
+        change = RowChange(
+            position=int(positions[offset]),
+            index=edited.index[offset],
+            doc_id=ids[i],
+            doc_type=doc_type_from_label(labels[i]),
+        )
+        for col, field_name, is_list in _PRODUCT_FIELDS:
+            if col in field_masks and field_masks[col][i]:
+                value = values[col][i]
+                change.product[field_name] = _split_list(value) if is_list else value
+        if TableColumns.BRANCHES in field_masks and field_masks[TableColumns.BRANCHES][i]:
+            value = _as_list(values[TableColumns.BRANCHES][i])
+            change.branches = list(value) if isinstance(value, list) else []
+        changes.append(change)
+
+    return TableChangeSet(changes, total_rows, len(positions))
@@ -0,0 +1,155 @@
+"""Синтетические документы реестра FSA для локального стенда и бенчмарков.
+
+Структура повторяет реальные ответы search-api:
+- элемент поиска (``make_search_item``) — поля, которые читает
+  ``format_search_results_frame``;
+- детали документа (``make_registry_document``) — ``RegistryData`` со всеми
+  путями из ``json_path_registry.PATHS`` / ``PATHS_DECLARAION``.
+
+Данные детерминированы по ``doc_id``: один и тот же id всегда даёт один
+и тот же документ.
+"""
+
+from __future__ import annotations
+
+import random
+from datetime import date, timedelta
+from typing import Any, Dict, List
+
+_COUNTRIES = ["CN", "TR", "IT", "DE", "VN", "IN", "BY", "KZ"]
+_BRANDS = ["ALPHA", "NORD", "VESTA", "LUMEN", "ORBITA", "KAPRIZ", "TERRA"]
+_MATERIALS = ["01", "02", "03", "05", "08", "13", "21"]
+_GENDERS = ["M", "F", "U", "K"]
+_PRODUCTS = ["Обувь мужская", "Обувь женская", "Куртки утеплённые", "Сумки текстильные", "Перчатки кожаные"]
+_CITIES = ["Москва", "Санкт-Петербург", "Казань", "Новосибирск", "Екатеринбург"]
+
+
+def _rng(doc_id: Any) -> random.Random:
+    return random.Random(str(doc_id))
+
+
+def _iso(d: date) -> str:
+    return f"{d.isoformat()}T00:00:00Z"
+
+
+def _org(rng: random.Random, prefix: str) -> Dict[str, Any]:
+    city = rng.choice(_CITIES)
+    return {
+        "fullName": f"{prefix} «{rng.choice(_BRANDS).title()}-{rng.randint(1, 999)}»",
+        "ogrn": str(rng.randint(10 ** 12, 10 ** 13 - 1)),
+        "surname": rng.choice(["Иванов", "Петров", "Сидоров", "Кузнецов"]),
+        "firstName": rng.choice(["Иван", "Пётр", "Сергей", "Алексей"]),
+        "patronimyc": rng.choice(["Иванович", "Петрович", "Сергеевич"]),
+        "patronymic": rng.choice(["Иванович", "Петрович", "Сергеевич"]),
+        "headPosition": "Генеральный директор",
+        "addresses": [{"fullAddress": f"Россия, г. {city}, ул. Ленина, д. {rng.randint(1, 200)}"}],
+        "contacts": [
+            {"type": "email", "value": f"info{rng.randint(1, 9999)}@example.ru"},
+            {"type": "phone", "value": f"+7 495 {rng.randint(100, 999)}-{rng.randint(10, 99)}-{rng.randint(10, 99)}"},
+        ],
+    }
+
+
+def make_search_item(doc_id: int, doc_type: str = "C") -> Dict[str, Any]:
+    """Элемент ответа ``/search`` для документа *doc_id*."""
+    rng = _rng(f"s{doc_id}")
+    reg = date(2020, 1, 1) + timedelta(days=rng.randint(0, 1500))
+    branches = [
+        {"Country": rng.choice(_COUNTRIES), "Name": f"Филиал {i + 1}"}
+        for i in range(rng.randint(0, 3))
+    ]
+    return {
+        "ID": doc_id,
+        "Number": f"ЕАЭС RU {doc_type}-CN.АБ{rng.randint(10, 99)}.В.{rng.randint(10000, 99999)}/{reg.year % 100}",
+        "Type": doc_type,
+        "Status": rng.choice(["Действует", "Прекращён", "Приостановлен"]),
+        "RegistrationDate": _iso(reg),
+        "ValidityPeriod": _iso(reg + timedelta(days=365 * rng.randint(1, 5))),
+        "Applicant": f"ООО «{rng.choice(_BRANDS).title()}»",
+        "Manufacturer": {
+            "Name": f"{rng.choice(_BRANDS)} MANUFACTURING CO., LTD",
+            "Country": rng.choice(_COUNTRIES),
+            "Branches": branches,
+        },
+        "Product": {
+            "Name": rng.choice(_PRODUCTS),
+            "Description": "Продукция лёгкой промышленности, артикулы согласно приложению",
+            "Country": rng.choice(_COUNTRIES),
+            "Tnveds": [f"{rng.randint(6101, 6405)}{rng.randint(100000, 999999)}" for _ in range(rng.randint(1, 4))],
+            "Genders": sorted(rng.sample(_GENDERS, rng.randint(1, 3))),
+            "Brands": sorted(rng.sample(_BRANDS, rng.randint(1, 2))),
+            "Materials": sorted(rng.sample(_MATERIALS, rng.randint(1, 3))),
+        },
+    }
+
+
+def make_registry_document(doc_id: int, doc_type: str = "certificate", labs: int = 2, standards: int = 3) -> Dict[str, Any]:
+    """Детали документа (ответ ``/documents/{doc_type}/{doc_id}``).
+
+    *labs* и *standards* задают длину списков ``testingLabs`` и
+    ``identifications[0].standards`` / ``documents`` — для нагрузочных замеров.
+    """
+    rng = _rng(f"d{doc_id}")
+    reg = date(2020, 1, 1) + timedelta(days=rng.randint(0, 1500))
+    end = reg + timedelta(days=365 * rng.randint(1, 5))
+    authority = _org(rng, "ООО «Центр сертификации")
+    authority.update({
+        "attestatRegNumber": f"RA.RU.{rng.randint(10000, 99999)}",
+        "attestatRegDate": reg.isoformat(),
+    })
+    registry_data: Dict[str, Any] = {
+        "certRegDate": reg.isoformat(),
+        "certEndDate": end.isoformat(),
+        "declRegDate": reg.isoformat(),
+        "declEndDate": end.isoformat(),
+        "certificationAuthority": authority,
+        "applicant": _org(rng, "ООО"),
+        "manufacturer": _org(rng, "Компания"),
+        "manufacturerFilials": [_org(rng, "Филиал") for _ in range(rng.randint(0, 3))],
+        "product": {
+            "fullName": rng.choice(_PRODUCTS),
+            "storageCondition": "Хранить в сухом помещении",
+            "usageCondition": "Эксплуатировать по назначению",
+            "usageScope": "Для розничной торговли",
+            "identifications": [{
+                "name": f"Артикулы {rng.randint(100, 999)}-{rng.randint(100, 999)}",
+                "documents": [
+                    {"name": f"ТР ТС 0{rng.randint(10, 19)}/2011 «О безопасности продукции»"}
+                    for _ in range(max(1, standards))
+                ],
+                "standards": [
+                    {"designation": f"ГОСТ {rng.randint(1000, 39999)}-{rng.randint(1990, 2023)}",
+                     "name": "Изделия. Общие технические условия"}
+                    for _ in range(standards)
+                ],
+            }],
+        },
+        "testingLabs": [
+            {
+                "fullName": f"Испытательная лаборатория №{rng.randint(1, 500)}",
+                "protocols": [{"number": f"{rng.randint(1000, 9999)}-ИЛ", "date": (reg - timedelta(days=rng.randint(1, 60))).isoformat()}],
+            }
+            for _ in range(labs)
+        ],
+        "experts": [{"surname": "Смирнова", "firstName": "Анна", "patronimyc": "Викторовна"}],
+    }
+    return {
+        "ID": doc_id,
+        "RegistryID": doc_id,
+        "RegistryNumber": make_search_item(doc_id)["Number"],
+        "Type": "D" if doc_type == "declaration" else "C",
+        "RegistryData": registry_data,
+    }
+
+
+def make_search_page(items_total: int, page: int, page_size: int, seed: int = 0) -> Dict[str, Any]:
+    """Страница ответа ``/search``: ``items``, ``total``, ``totalPages``."""
+    start = page * page_size
+    stop = min(start + page_size, items_total)
+    base = 1_000_000 + seed * 100_000
+    items: List[Dict[str, Any]] = [
+        make_search_item(base + i, "D" if (base + i) % 3 == 0 else "C")
+        for i in range(start, stop)
+    ]
+    total_pages = max(1, (items_total + page_size - 1) // page_size)
+    return {"items": items, "total": items_total, "totalPages": total_pages, "page": page}
@@ -0,0 +1,235 @@
+"""Нагрузочный прогон клиентских путей против локального стенда.
+
+Измеряет пропускную способность и задержки (p50/p95/p99) для сценариев
+``search``, ``details``, ``details_many``, ``update``, ``update_bulk``, ``sync``,
+``generate`` и ``download`` при заданной конкурентности.
+
+Пример (стенд поднимается внутри процесса)::
+
+    python -m src.stand_in.loadtest --start-stand-in --latency-ms 20 \\
+        --concurrency 16 --requests 500 --scenarios search,details,update
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import logging
+import random
+import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+from config.config import load_config
+from src.core import codec
+from src.stand_in.data import make_registry_document, make_search_item
+from src.stand_in.server import StandInOptions, StandInServer, local_ports, use_local_services
+
+logger = logging.getLogger(__name__)
+
+_QUERY_WORDS = ["обувь", "куртка", "сумка", "перчатки", "ALPHA", "NORD", "VESTA", "кожа", "текстиль", "детская"]
+
+
+@dataclass
+class ScenarioResult:
+    """Итог одного сценария."""
+
+    name: str
+    latencies: List[float] = field(default_factory=list)
+    errors: int = 0
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> int:
+        return len(self.latencies)
+
+    def percentile(self, q: float) -> float:
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        idx = min(len(ordered) - 1, max(0, int(round(q / 100 * len(ordered) + 0.5)) - 1))
+        return ordered[idx]
+
+    def summary(self) -> Dict[str, Any]:
+        total = self.ok + self.errors
+        return {
+            "scenario": self.name,
+            "requests": total,
+            "errors": self.errors,
+            "throughput_rps": round(total / self.elapsed, 1) if self.elapsed else 0.0,
+            "mean_ms": round(statistics.fmean(self.latencies) * 1000, 2) if self.latencies else 0.0,
+            "p50_ms": round(self.percentile(50) * 1000, 2),
+            "p95_ms": round(self.percentile(95) * 1000, 2),
+            "p99_ms": round(self.percentile(99) * 1000, 2),
+        }
+
+
+def _build_scenarios(id_pool: int, query_pool: int) -> Dict[str, Callable[[random.Random], Any]]:
+    """Сценарии — функции одного «запроса» клиента; возвращают falsy при ошибке."""
+    # Импорты здесь: модули клиента читают конфиг при импорте, а он уже переключён на стенд
+    from src.api import api
+    from src.api.client import FSAApiClient
+    from src.api.document_updater import DocumentUpdateRequest, Product, update_document
+    from src.core.transport import get_transport
+    from src.manual_db_update.bulk_update import BulkUpdateDispatcher, UpdateJob
+    from src.utils.certificate_generator import generate_documents
+
+    client = FSAApiClient.get_instance()
+    config = load_config()
+    queries = [" ".join(p) for p in itertools.islice(itertools.permutations(_QUERY_WORDS, 2), query_pool)]
+
+    # generate читает merged_data из workspace — готовим его один раз (только чтение в потоках)
+    client.merge_search_and_details(make_search_item(1), make_registry_document(1))
+    generated: List[str] = []
+
+    def search(rng: random.Random) -> Any:
+        return client.search({"q": rng.choice(queries)}, page=rng.randint(0, 4))
+
+    def details(rng: random.Random) -> Any:
+        return client.get_document_details(str(rng.randint(1, id_pool)), "certificate")
+
+    def details_many(rng: random.Random) -> Any:
+        docs = [(str(rng.randint(1, id_pool)), "certificate") for _ in range(10)]
+        return all(r["success"] for r in client.get_documents_details_many(docs))
+
+    def update(rng: random.Random) -> Any:
+        request = DocumentUpdateRequest(product=Product(brands=[rng.choice(_QUERY_WORDS[4:7])]))
+        return update_document("certificate", rng.randint(1, id_pool), request)
+
+    dispatcher = BulkUpdateDispatcher()
+
+    def update_bulk(rng: random.Random) -> Any:
+        payload = {"product": {"brands": [rng.choice(_QUERY_WORDS[4:7])]}}
+        jobs = [UpdateJob(rng.randint(1, id_pool), "certificate", payload) for _ in range(20)]
+        return all(outcome.success for outcome in dispatcher.dispatch(jobs))
+
+    def sync(rng: random.Random) -> Any:
+        return api.sync_document(rng.randint(1, id_pool), "certificate")
+
+    def generate(rng: random.Random) -> Any:
+        result = generate_documents({})
+        for doc in result.get("documents", []):
+            generated.append(doc["url"])
+        return result
+
+    def download(rng: random.Random) -> Any:
+        if not generated:
+            generate(rng)
+        url = f"{config['CERTIFICATE_API_URL']}{rng.choice(generated)}"
+        return get_transport("certificate").get(url).status_code == 200
+
+    return {
+        "search": search,
+        "details": details,
+        "details_many": details_many,
+        "update": update,
+        "update_bulk": update_bulk,
+        "sync": sync,
+        "generate": generate,
+        "download": download,
+    }
+
+
+def run_scenario(name: str, fn: Callable[[random.Random], Any], concurrency: int, requests: int) -> ScenarioResult:
+    """Выполняет *requests* вызовов *fn* в *concurrency* потоках."""
+    result = ScenarioResult(name)
+    lock = threading.Lock()
+    counter = itertools.count()
+
+    def worker(worker_id: int) -> None:
+        rng = random.Random(worker_id)
+        while next(counter) < requests:
+            started = time.perf_counter()
+            try:
+                ok = bool(fn(rng))
+            except Exception as e:  # noqa: BLE001 - считаем любые ошибки клиента
+                logger.debug("Сценарий %s: %s", name, e)
+                ok = False
+            elapsed = time.perf_counter() - started
+            with lock:
+                if ok:
+                    result.latencies.append(elapsed)
+                else:
+                    result.errors += 1
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix=f"load-{name}") as pool:
+        list(pool.map(worker, range(concurrency)))
+    result.elapsed = time.perf_counter() - started
+    return result
+
+
+def _print_table(rows: List[Dict[str, Any]]) -> None:
+    columns = ["scenario", "requests", "errors", "throughput_rps", "mean_ms", "p50_ms", "p95_ms", "p99_ms"]
+    widths = {c: max(len(c), *(len(str(r[c])) for r in rows)) for c in columns}
+    print("  ".join(c.ljust(widths[c]) for c in columns))
+    for row in rows:
+        print("  ".join(str(row[c]).ljust(widths[c]) for c in columns))
+
+
+def _size_pools(concurrency: int) -> None:
+    """Пулы соединений не меньше числа потоков прогона (иначе urllib3 отбрасывает соединения)."""
+    config = load_config()
+    pool_sizes = dict(config.get("pool_sizes") or {})
+    for service in ("registry", "document", "certificate"):
+        pool_sizes[service] = max(int(pool_sizes.get(service, 0)), concurrency)
+    config.set("pool_sizes", pool_sizes)
+
+
+def main(argv: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    parser = argparse.ArgumentParser(description="Нагрузочный прогон клиента FSA против стенда")
+    parser.add_argument("--scenarios", default="search,details,details_many,update,sync,generate,download")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=200, help="вызовов на сценарий")
+    parser.add_argument("--id-pool", type=int, default=500, help="диапазон id документов")
+    parser.add_argument("--query-pool", type=int, default=50, help="число разных поисковых запросов")
+    parser.add_argument("--start-stand-in", action="store_true", help="поднять стенд в этом процессе")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--json", dest="json_path", help="сохранить результаты в JSON-файл")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.WARNING, format="%(asctime)s - %(levelname)s - %(message)s")
+    # Вне Streamlit-рантайма st.error/st.session_state только пишут предупреждения
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+
+    use_local_services()
+    _size_pools(args.concurrency)
+    server = None
+    if args.start_stand_in:
+        options = StandInOptions(latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, error_rate=args.error_rate)
+        server = StandInServer(local_ports(), options).start()
+
+    try:
+        scenarios = _build_scenarios(args.id_pool, args.query_pool)
+        rows = []
+        for name in [s.strip() for s in args.scenarios.split(",") if s.strip()]:
+            if name not in scenarios:
+                parser.error(f"неизвестный сценарий: {name}")
+            rows.append(run_scenario(name, scenarios[name], args.concurrency, args.requests).summary())
+    finally:
+        if server is not None:
+            server.stop()
+
+    _print_table(rows)
+
+    from src.api.client import FSAApiClient
+    from src.core.transport import pool_stats
+
+    client = FSAApiClient.get_instance()
+    print("cache:", client.cache_stats())
+    print("single-flight:", client.singleflight_stats())
+    print("pools:", {name: {k: v for k, v in s.items() if k != "pools"} for name, s in pool_stats().items()})
+
+    if args.json_path:
+        with open(args.json_path, "wb") as f:
+            f.write(codec.dumps({"args": vars(args), "results": rows}, indent=True))
+    return rows
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,336 @@
+"""Локальный стенд, заменяющий auth-api, search-api, loader-api и сервис генерации.
+
+Реализует все эндпоинты из ``config.json``:
+
+- ``POST /token``
+- ``GET  /search``, ``GET /search_one``, ``GET /documents/by-number``
+- ``GET  /documents/{doc_type}/{doc_id}`` (детали) и ``PUT`` того же пути (обновление)
+- ``PUT  /documents/batch`` (пакетное обновление; можно отключить ``--no-batch``)
+- ``GET  /sync-document/{doc_type}/{doc_id}``
+- ``GET  /load-period?t=...&from=...&to=...`` (загрузка за период; ответ — ``{"loaded": N}``)
+- ``POST /generate_documents`` и ``GET /files/{name}`` (скачивание)
+
+Поддерживает искусственную задержку и инъекцию ошибок (503).
+
+Запуск на портах из ``config.json`` (``base_url`` сервисов и
+``LOCAL_CERTIFICATE_API_URL``)::
+
+    python -m src.stand_in.server --latency-ms 30 --error-rate 0.01
+"""
+
+from __future__ import annotations
+
+import argparse
+import hashlib
+import logging
+import random
+import re
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import date
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+from config.config import Config, load_config
+from src.core import codec
+from src.stand_in.data import make_registry_document, make_search_item, make_search_page
+
+logger = logging.getLogger(__name__)
+
+_DOC_RE = re.compile(r"^/documents/(certificate|declaration)/(\d+)$")
+_SYNC_RE = re.compile(r"^/sync-document/(certificate|declaration)/(\d+)$")
+_FILE_RE = re.compile(r"^/files/([\w.-]+)$")
+
+
+@dataclass
+class StandInOptions:
+    """Параметры поведения стенда."""
+
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    total_results: int = 2000
+    labs: int = 2
+    standards: int = 3
+    require_auth: bool = False
+    batch_endpoint: bool = True
+
+
+class StandInState:
+    """Общее состояние стенда: сохранённые userData и счётчики запросов."""
+
+    def __init__(self, options: StandInOptions) -> None:
+        self.options = options
+        self.lock = threading.Lock()
+        self.user_data: Dict[Tuple[str, int], Dict[str, Any]] = {}
+        self.files: Dict[str, bytes] = {}
+        self.requests: Dict[str, int] = {}
+        self.injected_errors = 0
+
+    def count(self, route: str) -> None:
+        with self.lock:
+            self.requests[route] = self.requests.get(route, 0) + 1
+
+
+class _Handler(BaseHTTPRequestHandler):
+    server_version = "FSAStandIn/1.0"
+    protocol_version = "HTTP/1.1"  # keep-alive, как у реальных сервисов
+    disable_nagle_algorithm = True  # заголовки и тело уходят разными write()
+
+    @property
+    def state(self) -> StandInState:
+        return self.server.state  # type: ignore[attr-defined]
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        logger.debug("%s - %s", self.address_string(), format % args)
+
+    # --------------------------- helpers ---------------------------
+
+    def _send(self, status: int, body: Any, content_type: str = "application/json") -> None:
+        data = body if isinstance(body, bytes) else codec.dumps(body)
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _read_json(self) -> Any:
+        length = int(self.headers.get("Content-Length") or 0)
+        raw = self.rfile.read(length) if length else b""
+        return codec.loads(raw) if raw else None
+
+    def _simulate(self, route: str) -> bool:
+        """Задержка + инъекция ошибок. Возвращает False, если ответ уже отправлен."""
+        opts = self.state.options
+        self.state.count(route)
+        delay = opts.latency_ms + (random.uniform(0, opts.jitter_ms) if opts.jitter_ms else 0)
+        if delay:
+            time.sleep(delay / 1000)
+        if opts.error_rate and random.random() < opts.error_rate:
+            with self.state.lock:
+                self.state.injected_errors += 1
+            self._send(503, {"detail": "stand-in: injected error"})
+            return False
+        if opts.require_auth and route != "token" and not self.headers.get("Authorization"):
+            self._send(401, {"detail": "Not authenticated"})
+            return False
+        return True
+
+    # --------------------------- routes ---------------------------
+
+    def do_GET(self) -> None:  # noqa: N802
+        url = urlsplit(self.path)
+        query = dict(parse_qsl(url.query))
+        path = url.path
+
+        if path == "/search":
+            if self._simulate("search"):
+                page = int(query.pop("page", 0))
+                page_size = int(query.pop("page_size", 20))
+                seed = int(hashlib.md5(codec.dumps(sorted(query.items()))).hexdigest()[:4], 16) % 1000
+                self._send(200, make_search_page(self.state.options.total_results, page, page_size, seed))
+            return
+        if path == "/search_one":
+            if self._simulate("search_one"):
+                self._send(200, make_search_item(1_000_000))
+            return
+        if path == "/documents/by-number":
+            if self._simulate("document_by_number"):
+                number = query.get("number", "")
+                doc_id = int(hashlib.md5(number.encode()).hexdigest()[:6], 16)
+                self._send(200, make_registry_document(doc_id))
+            return
+        match = _DOC_RE.match(path)
+        if match:
+            if self._simulate("document_by_id"):
+                doc_type, doc_id = match.group(1), int(match.group(2))
+                doc = make_registry_document(doc_id, doc_type, self.state.options.labs, self.state.options.standards)
+                with self.state.lock:
+                    user_data = self.state.user_data.get((doc_type, doc_id))
+                if user_data:
+                    doc["userData"] = user_data
+                self._send(200, doc)
+            return
+        match = _SYNC_RE.match(path)
+        if match:
+            if self._simulate("sync_document"):
+                self._send(200, {"status": "synced", "type": match.group(1), "id": int(match.group(2))})
+            return
+        if path == "/load-period":
+            if self._simulate("load_period"):
+                self._load_period(query)
+            return
+        match = _FILE_RE.match(path)
+        if match:
+            if self._simulate("download"):
+                with self.state.lock:
+                    content = self.state.files.get(match.group(1))
+                if content is None:
+                    self._send(404, {"detail": "file not found"})
+                else:
+                    self._send(200, content, "application/octet-stream")
+            return
+        self._send(404, {"detail": f"unknown route {path}"})
+
+    def do_PUT(self) -> None:  # noqa: N802
+        path = urlsplit(self.path).path
+        body = self._read_json()
+        if path == "/documents/batch" and self.state.options.batch_endpoint:
+            if self._simulate("update_documents_batch"):
+                self._send(200, {"results": self._update_batch((body or {}).get("documents") or [])})
+            return
+        match = _DOC_RE.match(path)
+        if not match:
+            self._send(404, {"detail": "unknown route"})
+            return
+        if self._simulate("update_document"):
+            key = (match.group(1), int(match.group(2)))
+            with self.state.lock:
+                self.state.user_data[key] = body or {}
+            self._send(200, {"success": True, "data": {"id": key[1], "type": key[0], "userData": body}})
+
+    def do_POST(self) -> None:  # noqa: N802
+        path = urlsplit(self.path).path
+        body = self._read_json()
+        if path == "/token":
+            if self._simulate("token"):
+                self._send(200, {"access": f"stand-in-{uuid.uuid4().hex}"})
+            return
+        if path == "/generate_documents":
+            if self._simulate("generate_documents"):
+                self._send(200, self._generate(body or {}))
+            return
+        self._send(404, {"detail": f"unknown route {path}"})
+
+    def _load_period(self, query: Dict[str, str]) -> None:
+        """Ответ loader на загрузку за период: по 10 документов на день окна."""
+        try:
+            start, end = date.fromisoformat(query["from"]), date.fromisoformat(query["to"])
+        except (KeyError, ValueError):
+            self._send(422, {"detail": "from/to: ожидается дата ГГГГ-ММ-ДД"})
+            return
+        if query.get("t") not in ("certificate", "declaration") or end < start:
+            self._send(422, {"detail": "invalid period"})
+            return
+        self._send(200, {"loaded": ((end - start).days + 1) * 10})
+
+    def _update_batch(self, documents: List[Any]) -> List[Dict[str, Any]]:
+        results = []
+        for doc in documents:
+            doc = doc if isinstance(doc, dict) else {}
+            doc_type, doc_id = doc.get("type"), doc.get("id")
+            try:
+                key = (str(doc_type), int(doc_id))
+            except (TypeError, ValueError):
+                key = None
+            if key is None or key[0] not in ("certificate", "declaration"):
+                results.append({"type": doc_type, "id": doc_id, "success": False, "error": "invalid document key"})
+                continue
+            with self.state.lock:
+                self.state.user_data[key] = doc.get("userData") or {}
+            results.append({"type": key[0], "id": key[1], "success": True, "error": None})
+        return results
+
+    def _generate(self, body: Dict[str, Any]) -> List[Dict[str, str]]:
+        values = (body.get("data") or {}).get("values") or {}
+        content = codec.dumps(values, indent=True)
+        documents = []
+        for fmt in ("docx", "pdf"):
+            name = f"{uuid.uuid4().hex}.{fmt}"
+            with self.state.lock:
+                self.state.files[name] = content
+            documents.append({"type": f"certificate_{fmt}", "format": fmt, "name": "Сертификат", "url": f"/files/{name}"})
+        return documents
+
+
+class StandInServer:
+    """Стенд на одном или нескольких портах с общим состоянием."""
+
+    def __init__(self, ports: List[int], options: Optional[StandInOptions] = None, host: str = "127.0.0.1") -> None:
+        self.state = StandInState(options or StandInOptions())
+        self._servers: List[ThreadingHTTPServer] = []
+        for port in ports:
+            server = ThreadingHTTPServer((host, port), _Handler)
+            server.daemon_threads = True
+            server.state = self.state  # type: ignore[attr-defined]
+            self._servers.append(server)
+        self._threads: List[threading.Thread] = []
+
+    @property
+    def ports(self) -> List[int]:
+        return [s.server_address[1] for s in self._servers]
+
+    def start(self) -> "StandInServer":
+        for server in self._servers:
+            thread = threading.Thread(target=server.serve_forever, name=f"stand-in-{server.server_address[1]}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        logger.info("Стенд запущен на портах %s", self.ports)
+        return self
+
+    def stop(self) -> None:
+        for server in self._servers:
+            server.shutdown()
+            server.server_close()
+
+    def stats(self) -> Dict[str, Any]:
+        with self.state.lock:
+            return {"requests": dict(self.state.requests), "injected_errors": self.state.injected_errors}
+
+
+# ---------------------------------------------------------------------------
+# Связка с config.json
+# ---------------------------------------------------------------------------
+
+def local_ports(config: Optional[Config] = None) -> List[int]:
+    """Порты из ``base_url`` сервисов и ``LOCAL_CERTIFICATE_API_URL``."""
+    config = config or load_config()
+    urls = [svc["base_url"] for svc in config["services"].values()]
+    urls.append(config["LOCAL_CERTIFICATE_API_URL"])
+    return sorted({urlsplit(u).port for u in urls if urlsplit(u).port})
+
+
+def use_local_services(config: Optional[Config] = None) -> None:
+    """Переключает конфиг текущего процесса на локальные адреса (стенд)."""
+    config = config or load_config()
+    config.set("mode", "local")
+    config.set("CERTIFICATE_API_URL", config["LOCAL_CERTIFICATE_API_URL"])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Локальный стенд сервисов FSA")
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="доля ответов 503 (0..1)")
+    parser.add_argument("--total-results", type=int, default=2000, help="сколько документов находит /search")
+    parser.add_argument("--labs", type=int, default=2, help="длина testingLabs в деталях")
+    parser.add_argument("--standards", type=int, default=3, help="длина standards/documents в деталях")
+    parser.add_argument("--require-auth", action="store_true")
+    parser.add_argument("--no-batch", action="store_true", help="не поддерживать PUT /documents/batch")
+    parser.add_argument("--port", type=int, action="append", help="порт (по умолчанию — из config.json)")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    options = StandInOptions(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        total_results=args.total_results,
+        labs=args.labs,
+        standards=args.standards,
+        require_auth=args.require_auth,
+        batch_endpoint=not args.no_batch,
+    )
+    server = StandInServer(args.port or local_ports(), options).start()
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""Построение таблицы результатов поиска по столбцам.
+
+``format_search_results_frame`` — единственный путь построения таблицы
+результатов. Он возвращает тот же DataFrame, что прежний построчный
+форматтер (эталон в ``benchmarks/oracles.py``), но без ``flatten_dict`` и
+словаря на каждую строку: каждый столбец собирается одним проходом по
+элементам, каждая уникальная дата разбирается один раз.
+
+``cached_results_frame`` кэширует таблицу (общий на процесс LRU) по отпечатку
+ответа поиска: на перезапусках скрипта таблица не строится заново, а
+исходная (неотредактированная) таблица восстанавливается из кэша по
+отпечатку, без отдельной копии в сессии.
+
+Перед построением на элементы накладываются недавно отправленные изменения
+(``write_overlay``); отпечаток считается уже по элементам с наложением.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from config.config import load_config
+from src.core import codec
+from src.core.cache import LRUCache
+from src.core.write_overlay import apply_write_overlay
+from src.ui.model import TableColumns
+from src.utils.utils import format_date, generate_fsa_url
+
+logger = logging.getLogger(__name__)
+
+
+def _section(items: List[Dict[str, Any]], name: str) -> List[Dict[str, Any]]:
+    """Вложенный раздел каждого элемента (``Product``, ``Manufacturer``); не-словарь → ``{}``.
+
+    ``flatten_dict`` тоже не даёт ключей ``{name}_*``, если раздел не словарь.
+    """
+    sections = []
+    for item in items:
+        value = item.get(name)
+        sections.append(value if isinstance(value, dict) else {})
+    return sections
+
+
+def _join_column(sections: List[Dict[str, Any]], key: str) -> List[str]:
+    return [", ".join(s.get(key) or ()) for s in sections]
+
+
+def _format_dates(values: List[Any]) -> List[str]:
+    """``utils.format_date`` для всего столбца.
+
+    Даты в выдаче сильно повторяются, поэтому каждое уникальное значение
+    разбирается один раз. На страницах до нескольких тысяч строк это быстрее
+    ``pd.to_datetime(...).dt.strftime`` и сохраняет поведение ``format_date``.
+    """
+    formatted: Dict[Any, str] = {}
+    result: List[str] = []
+    for value in values:
+        text = formatted.get(value)
+        if text is None:
+            text = formatted[value] = format_date(value)
+        result.append(text)
+    return result
+
+
+def _branches(branches: Any) -> List[str]:
+    result: List[str] = []
+    for branch in branches or ():
+        if "Country" in branch and "Name" in branch:
+            result.append(f"{branch['Country']}: {branch['Name']}")
+        elif "Country" in branch:
+            result.append(f"{branch['Country']}")
+    return result
+
+
+def format_search_results_frame(items: List[Dict[str, Any]]) -> pd.DataFrame:
+    """Таблица результатов поиска (столбцы ``TableColumns``) по элементам ответа API."""
+    return _build_frame(apply_write_overlay(items))
+
+
+def _build_frame(items: List[Dict[str, Any]]) -> pd.DataFrame:
+    if not items:
+        return pd.DataFrame()
+
+    types = [item.get("Type") for item in items]
+    ids = [item.get("ID") for item in items]
+    products = _section(items, "Product")
+    manufacturers = _section(items, "Manufacturer")
+
+    return pd.DataFrame({
+        TableColumns.SELECT: [False] * len(items),
+        TableColumns.ID: [item.get("ID", "") for item in items],
+        TableColumns.LINK: [generate_fsa_url(t, i) for t, i in zip(types, ids)],
+        TableColumns.NUMBER: [item.get("Number", "") for item in items],
+        TableColumns.TYPE: ["Д" if t == "D" else "С" for t in types],
+        TableColumns.STATUS: [item.get("Status", "") for item in items],
+        TableColumns.REGISTRATION_DATE: _format_dates([item.get("RegistrationDate") for item in items]),
+        TableColumns.VALID_UNTIL: _format_dates([item.get("ValidityPeriod") for item in items]),
+        TableColumns.APPLICANT: [item.get("Applicant", "") for item in items],
+        TableColumns.MANUFACTURER: [m.get("Name", "") for m in manufacturers],
+        TableColumns.PRODUCT: [p.get("Name", "") for p in products],
+        TableColumns.DESCRIPTION: [p.get("Description", "") for p in products],
+        TableColumns.PRODUCT_COUNTRY: [p.get("Country", "") for p in products],
+        TableColumns.TNVED: _join_column(products, "Tnveds"),
+        TableColumns.GENDER: _join_column(products, "Genders"),
+        TableColumns.BRANDS: _join_column(products, "Brands"),
+        TableColumns.BRANCHES: [_branches(m.get("Branches")) for m in manufacturers],
+        TableColumns.MATERIALS: _join_column(products, "Materials"),
+    })
+
+
+# ---------------------------------------------------------------------------
+# Кэш таблиц по отпечатку ответа поиска
+# ---------------------------------------------------------------------------
+
+def _frame_size(frame: pd.DataFrame) -> int:
+    return int(frame.memory_usage(index=True, deep=True).sum())
+
+
+def _build_frame_cache() -> LRUCache:
+    cfg = (load_config().get("cache") or {}).get("results_table", {})
+    return LRUCache(
+        ttl=float(cfg.get("ttl", 600)),
+        max_entries=int(cfg.get("max_entries", 50)),
+        max_bytes=int(cfg.get("max_bytes", 100 * 1024 * 1024)),
+        sizeof=_frame_size,
+    )
+
+
+# отпечаток ответа -> DataFrame (только для чтения: не изменять на месте)
+_frame_cache = _build_frame_cache()
+
+
+def results_fingerprint(items: List[Dict[str, Any]]) -> str:
+    """Стабильный отпечаток элементов ответа поиска."""
+    return hashlib.blake2b(codec.dumps(items), digest_size=16).hexdigest()
+
+
+def cached_results_frame(items: List[Dict[str, Any]]) -> Tuple[str, pd.DataFrame]:
+    """``(отпечаток, таблица)`` для элементов поиска; таблица общая — не изменять на месте."""
+    items = apply_write_overlay(items)
+    fingerprint = results_fingerprint(items)
+    frame = _frame_cache.get(fingerprint)
+    if frame is None:
+        frame = _build_frame(items)
+        _frame_cache.set(fingerprint, frame)
+    return fingerprint, frame
+
+
+def results_frame_by_fingerprint(fingerprint: str) -> Optional[pd.DataFrame]:
+    """Ранее построенная таблица или ``None``, если она вытеснена из кэша."""
+    return _frame_cache.get(fingerprint)
+
+
+def results_frame_cache_stats() -> Dict[str, Any]:
+    return _frame_cache.stats()
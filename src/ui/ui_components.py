@@ -1,25 +1,39 @@
 import streamlit as st
 import pandas as pd
 import logging
-from src.utils.utils import format_date, flatten_dict, generate_fsa_url
-from src.api.api import update_document
+from src.utils.utils import format_date
+from src.api.api import sync_documents, update_document
 from src.manual_db_update.updater_handlers import process_table_changes
 from src.api.document_updater import DocumentUpdateRequest, Product, Manufacturer, Branch
-from typing import List, Dict, Any
-from src.api.client import FSAApiClient
+from functools import lru_cache
+from typing import List, Dict, Any, Tuple
+from src.api.client import FSAApiClient, report_error
+from src.core.errors import AuthenticationError
 from src.utils.json_path_registry import PATHS, PATHS_DECLARAION, ALL_PATHS
 import pandas as pd
 import re as _re
 
 from src.ui.model import TableColumns
-from src.generate_preview.new_cert_api_values import render_data_to_api, data_to_api_declaration  # локальный импорт
+from src.ui.results_frame import cached_results_frame, results_frame_by_fingerprint
+from src.generate_preview.new_cert_api_values import data_to_api_declaration  # локальный импорт
+from src.generate_preview.rendering import template_doc_id, templated_values
 
 # Настройка логгера
 logger = logging.getLogger(__name__)
 
-# Session state keys for tracking original and edited dataframes
-_ORIGINAL_DF_KEY: str = "original_results_df"
+# Session state keys for tracking original and edited dataframes.
+# Исходная таблица не хранится в сессии: по отпечатку ответа она берётся из
+# общего кэша таблиц (src/ui/results_frame.py).
+_ORIGINAL_FP_KEY: str = "original_results_fingerprint"
 _EDITED_DF_KEY: str = "edited_results_df"
+# Успешно обновлённые документы, ожидающие синхронизации: [(doc_type, doc_id)]
+_PENDING_SYNC_KEY: str = "pending_sync_documents"
+
+# Редактируемые столбцы таблицы результатов
+_RESULTS_EDITABLE_COLS = frozenset({
+    TableColumns.PRODUCT, TableColumns.DESCRIPTION, TableColumns.PRODUCT_COUNTRY,
+    TableColumns.TNVED, TableColumns.GENDER, TableColumns.BRANDS, TableColumns.MATERIALS, TableColumns.BRANCHES
+})
 
 # Преобразуем в формат flatten-пути (addresses[0] вместо addresses.0)
 def _to_flatten_path(p: str) -> str:
@@ -86,60 +100,6 @@ def display_search_form():
     }
 
 
-def format_search_results(items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-    """
-    Форматирует результаты поиска из API в формат, подходящий для отображения в таблице.
-    
-    Args:
-        items: Список элементов из результатов поиска API
-        
-    Returns:
-        Список форматированных элементов для отображения в таблице
-    """
-    formatted_results = []
-    for item in items:
-        flat_item = flatten_dict(item)
-        
-        # Обработка списковых полей с проверкой на None
-        tnveds = flat_item.get("Product_Tnveds", []) or []
-        genders = flat_item.get("Product_Genders", []) or []
-        brands = flat_item.get("Product_Brands", []) or []
-        materials = flat_item.get("Product_Materials", []) or []
-        
-        # Формирование списка филиалов
-        branches = []
-        if "Manufacturer_Branches" in flat_item and flat_item["Manufacturer_Branches"]:
-            for branch in flat_item["Manufacturer_Branches"]:
-                if "Country" in branch and "Name" in branch:
-                    branches.append(f"{branch['Country']}: {branch['Name']}")
-                elif "Country" in branch:
-                    branches.append(f"{branch['Country']}")
-
-        formatted_item = {
-            TableColumns.SELECT: False,
-            TableColumns.ID: flat_item.get("ID", ""),  # Добавляем ID обратно, он нужен для обновления
-            TableColumns.LINK: generate_fsa_url(flat_item.get("Type"), flat_item.get("ID")),
-            TableColumns.NUMBER: flat_item.get("Number", ""),
-            TableColumns.TYPE: "Д" if flat_item.get("Type") == "D" else "С",
-            TableColumns.STATUS: flat_item.get("Status", ""),
-            TableColumns.REGISTRATION_DATE: format_date(flat_item.get("RegistrationDate")),
-            TableColumns.VALID_UNTIL: format_date(flat_item.get("ValidityPeriod")),
-            TableColumns.APPLICANT: flat_item.get("Applicant", ""),
-            TableColumns.MANUFACTURER: flat_item.get("Manufacturer_Name", ""),
-            TableColumns.PRODUCT: flat_item.get("Product_Name", ""),
-            TableColumns.DESCRIPTION: flat_item.get("Product_Description", ""),
-            TableColumns.PRODUCT_COUNTRY: flat_item.get("Product_Country", ""),
-            TableColumns.TNVED: ", ".join(tnveds),  # Используем обработанное значение
-            TableColumns.GENDER: ", ".join(genders),  # Добавляем поле для гендеров
-            TableColumns.BRANDS: ", ".join(brands),  # Преобразуем список брендов в строку через запятую
-            TableColumns.BRANCHES: branches,  # Добавляем поле для филиалов как список
-            TableColumns.MATERIALS: ", ".join(flat_item.get("Product_Materials", [])),
-        }
-        formatted_results.append(formatted_item)
-    
-    return formatted_results
-
-
 def create_table_column_config() -> Dict[str, Any]:
     """
     Создает конфигурацию столбцов для таблицы результатов поиска.
@@ -205,6 +165,39 @@ def create_table_column_config() -> Dict[str, Any]:
 
 
 
+@lru_cache(maxsize=8)
+def _results_column_config(columns: Tuple[str, ...]) -> Dict[str, Any]:
+    """Конфигурация столбцов таблицы результатов (строится один раз на набор столбцов)."""
+    column_config = create_table_column_config()
+
+    # Настраиваем остальные столбцы
+    for col in columns:
+        if col not in column_config:
+            column_config[col] = st.column_config.Column(
+                col,
+                disabled=col not in _RESULTS_EDITABLE_COLS
+            )
+    return column_config
+
+
+def reset_results_table_state() -> None:
+    """Сбрасывает сохранённые в сессии таблицы результатов (новый поиск или смена страницы)."""
+    st.session_state.pop(_ORIGINAL_FP_KEY, None)
+    st.session_state.pop(_EDITED_DF_KEY, None)
+
+
+def _original_results_frame(current_fingerprint: str, current_df: pd.DataFrame) -> pd.DataFrame:
+    """Исходная таблица (до правок) — из кэша по отпечатку, сохранённому при первом показе."""
+    fingerprint = st.session_state.get(_ORIGINAL_FP_KEY, current_fingerprint)
+    if fingerprint == current_fingerprint:
+        return current_df
+    original_df = results_frame_by_fingerprint(fingerprint)
+    if original_df is None:
+        logger.warning("Исходная таблица результатов вытеснена из кэша, сравниваем с текущей")
+        return current_df
+    return original_df
+
+
 def display_results_table(items: List[Dict[str, Any]]) -> pd.DataFrame:
     """
     Отображает результаты поиска в виде редактируемой таблицы.
@@ -215,27 +208,12 @@ def display_results_table(items: List[Dict[str, Any]]) -> pd.DataFrame:
     Returns:
         DataFrame с отредактированными данными
     """
-    # Форматируем результаты для отображения
-    formatted_results = format_search_results(items)
-    df = pd.DataFrame(formatted_results)
-    
-    # Создаем конфигурацию столбцов
-    column_config = create_table_column_config()
-    
-    # Определяем редактируемые столбцы
-    editable_cols = {
-        TableColumns.PRODUCT, TableColumns.DESCRIPTION, TableColumns.PRODUCT_COUNTRY, 
-        TableColumns.TNVED, TableColumns.GENDER, TableColumns.BRANDS, TableColumns.MATERIALS, TableColumns.BRANCHES
-    }
-    
-    # Настраиваем остальные столбцы
-    for col in df.columns:
-        if col not in column_config:
-            column_config[col] = st.column_config.Column(
-                col,
-                disabled=col not in editable_cols
-            )
-    
+    # Таблица и конфигурация столбцов берутся из кэша (по отпечатку ответа);
+    # таблица общая для сессий — st.data_editor её не изменяет
+    fingerprint, df = cached_results_frame(items)
+    column_config = dict(_results_column_config(tuple(df.columns)))
+    editable_cols = _RESULTS_EDITABLE_COLS
+
     # Отображаем редактор данных
     edited_df = st.data_editor(
         df,
@@ -243,18 +221,29 @@ def display_results_table(items: List[Dict[str, Any]]) -> pd.DataFrame:
         column_config=column_config,
         use_container_width=True
     )
-    
-    # Сохраняем оригинальную и отредактированную таблицы в сессию
-    if _ORIGINAL_DF_KEY not in st.session_state:
-        st.session_state[_ORIGINAL_DF_KEY] = df.copy()
-    st.session_state[_EDITED_DF_KEY] = edited_df.copy()
-    
+
+    # В сессии — только отпечаток исходной таблицы и отредактированная таблица
+    # (data_editor возвращает новый DataFrame, копия не нужна)
+    if _ORIGINAL_FP_KEY not in st.session_state:
+        st.session_state[_ORIGINAL_FP_KEY] = fingerprint
+    st.session_state[_EDITED_DF_KEY] = edited_df
+
     # Кнопка отправки изменений
     if st.button("Отправить изменения"):
-        original_df = st.session_state[_ORIGINAL_DF_KEY]
+        original_df = _original_results_frame(fingerprint, df)
         
-        # Обрабатываем изменения и получаем результаты
-        results = process_table_changes(edited_df, original_df, editable_cols)
+        # Обрабатываем изменения и получаем результаты (прогресс отправки — по мере ответов)
+        progress_bar = st.progress(0.0)
+
+        def _on_progress(done: int, total: int) -> None:
+            progress_bar.progress(done / total, text=f"Отправлено {done} из {total}")
+
+        results = process_table_changes(edited_df, original_df, editable_cols, progress=_on_progress)
+        progress_bar.empty()
+
+        # 401 — сброс входа и перезапуск скрипта (как и для остальных запросов)
+        if any(result["status"] == 401 for result in results):
+            report_error(AuthenticationError("Ошибка аутентификации", 401))
         
         # Обрабатываем результаты
         success_count = 0
@@ -277,15 +266,48 @@ def display_results_table(items: List[Dict[str, Any]]) -> pd.DataFrame:
         # Отображаем общую информацию о результатах
         if success_count > 0:
             st.success(f"Успешно обновлено документов: {success_count}")
+            # Таблица теперь строится с наложенными изменениями — исходной
+            # для следующих правок станет она
+            st.session_state.pop(_ORIGINAL_FP_KEY, None)
+            pending = st.session_state.setdefault(_PENDING_SYNC_KEY, [])
+            pending.extend((r["doc_type"], r["row_id"]) for r in results if r["success"] is True)
         
         if error_count == 0 and warning_count == 0:
             st.success("Все изменения успешно отправлены")
         elif error_count > 0:
             st.error(f"Ошибки при обновлении {error_count} документов")
+
+    display_pending_sync()
     
     return edited_df
 
 
+def display_pending_sync() -> None:
+    """Кнопка пакетной синхронизации документов, обновлённых из таблицы."""
+    pending = st.session_state.get(_PENDING_SYNC_KEY)
+    if not pending:
+        return
+    docs = list(dict.fromkeys(pending))
+    if not st.button(f"Синхронизировать обновлённые документы ({len(docs)})"):
+        return
+
+    progress_bar = st.progress(0.0)
+
+    def _on_progress(done: int, total: int) -> None:
+        progress_bar.progress(done / total, text=f"Синхронизировано {done} из {total}")
+
+    results = sync_documents(docs, progress=_on_progress)
+    progress_bar.empty()
+
+    failed = [r for r in results if not r.success]
+    # Неудачные остаются в очереди — их можно синхронизировать повторно
+    st.session_state[_PENDING_SYNC_KEY] = [(r.doc_type, r.doc_id) for r in failed]
+    if len(failed) < len(results):
+        st.success(f"Синхронизировано документов: {len(results) - len(failed)}")
+    for r in failed:
+        st.error(f"Ошибка при синхронизации документа {r.doc_id}: {r.error} (попыток: {r.attempts})")
+
+
 def display_document_details(details):
     st.subheader("Подробная информация о документе")
 
@@ -374,8 +396,8 @@ def _extract_doc_type(d: dict) -> str:
 def display_editable_merged_data() -> None:
     """Отображает кэшированный *merged_data* в виде редактируемой таблицы.
 
-    После нажатия кнопки «Сохранить» обновляет значения в кэше через
-    ``FSAApiClient.update_merged_data``.
+    После нажатия кнопки «Сохранить» изменённые значения сохраняются как
+    overrides шаблона (``FSAApiClient.upsert_template_value``).
     """
 
       # локальный импорт, чтобы избежать циклов
@@ -393,16 +415,9 @@ def display_editable_merged_data() -> None:
 
 
 
-    templated = render_data_to_api(merged_data)
-    doc_id_for_tpl = str(
-        merged_data.get("ID")
-        or merged_data.get("search_ID")
-        or merged_data.get("RegistryID")
-        or ""
-    )
-
-    # добавляем пользовательские overrides, если есть
-    templated.update(client.get_template_overrides(doc_id_for_tpl))
+    # render_data_to_api + пользовательские overrides (мемоизировано в сессии)
+    templated = templated_values(client)
+    doc_id_for_tpl = template_doc_id(merged_data)
 
     templ_df = pd.DataFrame(
         [{"Key": k, "Value": v} for k, v in templated.items()],
@@ -1,10 +1,11 @@
 import requests
-import json
 from typing import Dict, Any, Union, Optional, Tuple
 import logging
 from config.config import load_config
 from src.api.client import FSAApiClient  # локальный импорт, чтобы избежать циклов
-from src.generate_preview.new_cert_api_values import render_data_to_api
+from src.core import codec
+from src.core.transport import get_transport
+from src.generate_preview.rendering import templated_values
 
 
 
@@ -63,11 +64,8 @@ def build_payload() -> Tuple[Dict[str, Any], Dict[str, Any]]:
 
     utf8_data = utf8_encode_dict(merged_data)
     # Новое: формируем словарь с заполенными значениями шаблона
-    templated = render_data_to_api(merged_data)
-
-    # Применяем пользовательские overrides (редактируемые в UI)
-    doc_id = str(merged_data.get("ID") or merged_data.get("search_ID") or merged_data.get("RegistryID") or "")
-    templated.update(client.get_template_overrides(doc_id))
+    # вместе с пользовательскими overrides (редактируемые в UI)
+    templated = templated_values(client)
 
     # Добавляем values внутрь данных, чтобы не отправлять их отдельным полем
     utf8_data_with_values = dict(utf8_data)
@@ -87,19 +85,19 @@ def generate_documents(details: Dict[str, Any], search_data: Optional[Dict[str,
         generate_url = f"{config['CERTIFICATE_API_URL']}/generate_documents"
 
         logger.info("Отправка запроса на генерацию документов: %s", generate_url)
-        logger.debug("Payload: %s", json.dumps(payload, ensure_ascii=False))
+        logger.debug("Payload: %s", codec.LazyJSON(payload))
 
-        response = requests.post(
+        response = get_transport('certificate').post(
             generate_url,
-            json=payload,
-            headers={'Content-Type': 'application/json; charset=utf-8'}
+            data=codec.dumps(payload),
+            headers=codec.JSON_HEADERS
         )
 
         logger.info("Ответ API генерации: %s", response.status_code)
         response.raise_for_status()
         
         # Получаем список документов в новом формате
-        documents_list = response.json()  # Теперь это список словарей с type, format, name, url
+        documents_list = codec.decode_response(response)  # Теперь это список словарей с type, format, name, url
         
         result = {
             'documents': documents_list  # список документов
@@ -1,6 +1,6 @@
 import streamlit as st
-import requests
 from config.config import Config
+from src.core.transport import get_transport
 from datetime import datetime, timedelta
 
 config = Config.get_instance()
@@ -30,7 +30,7 @@ def get_document_content(download_url: str, doc_id: str, doc_type: str) -> bytes
         return st.session_state[content_key]
         
     # Если кэш неактуален или отсутствует - скачиваем
-    file_response = requests.get(download_url)
+    file_response = get_transport('certificate').get(download_url)
     if file_response.status_code == 200:
         st.session_state[content_key] = file_response.content
         st.session_state[timestamp_key] = current_time
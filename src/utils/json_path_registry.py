@@ -5,6 +5,11 @@
 2. Функции get_value / set_value позволяют читать и писать значения
    по *ключу*, не заботясь о синтаксисе пути.
 3. Поддерживается нотация списка: key[0].foo или key[n].foo (см. get_value).
+4. Новые ключи добавляются через register_paths — он же пересобирает
+   обратный индекс «путь → ключ» (reverse_lookup). Производные индексы
+   собираются в новый неизменяемый снимок и подменяются одной ссылкой,
+   поэтому потоки, читающие реестр без блокировки, всегда видят целый
+   снимок — старый или новый.
 
 Следующий шаг после наполнения MAP — использовать эти функции вместо прямого
 парсинга путей в:
@@ -17,8 +22,10 @@ from __future__ import annotations
 
 import logging
 import re
-from typing import Any, Dict, List
+import threading
+from typing import Any, Dict, Iterable, List, Tuple
 from datetime import datetime
+from functools import lru_cache
 
 logger = logging.getLogger(__name__)
 
@@ -130,17 +137,152 @@ _DATE_KEYS: set[str] = {
 
 _LIST_INDEX_RE = re.compile(r"^(\w+)\[(\d+|n)\]$")
 
-_ISO_DATETIME_RE = re.compile(r"^\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}Z$")
-_ISO_DATE_RE = re.compile(r"^\d{4}-\d{2}-\d{2}$")
-_DASH_DATE_RE = re.compile(r"^\d{2}-\d{2}-\d{4}$")
+# Виды шагов скомпилированного пути
+_KEY = 0    # obj[key]
+_INDEX = 1  # obj[key][i]
+_ALL = 2    # obj[key][*]
+
+Step = Tuple[int, str, int]
+
+
+def _apply_step(nodes: List[Any], kind: int, key: str, idx: int, missing_as_empty: bool = False) -> List[Any]:
+    """Применяет один шаг пути ко всем текущим узлам обхода."""
+    found: List[Any] = []
+    for node in nodes:
+        if not isinstance(node, dict):
+            continue
+        if kind == _KEY:
+            if key in node:
+                found.append(node[key])
+            elif missing_as_empty:
+                found.append("")
+            continue
+        seq = node.get(key)
+        if not isinstance(seq, list):
+            continue
+        if kind == _ALL:
+            found.extend(seq)
+        elif idx < len(seq):
+            found.append(seq[idx])
+    return found
+
+
+class PathAccessor:
+    """Путь, заранее разобранный на шаги ``(вид, ключ, индекс)``.
+
+    Разбор (и регулярное выражение) выполняется один раз при компиляции,
+    обход данных — простой цикл без разбора строк.
+    """
+
+    __slots__ = ("path", "steps")
+
+    def __init__(self, path: str, steps: Tuple[Step, ...]) -> None:
+        self.path = path
+        self.steps = steps
+
+    def values(self, data: Any, missing_as_empty: bool = False) -> List[Any]:
+        """Все значения по пути (для ``[n]`` — по каждому элементу, в порядке списка).
+
+        *missing_as_empty* — отсутствующий ключ словаря даёт ``''`` вместо
+        пропуска (поведение старого разбора путей в preview_templates).
+        """
+        current: List[Any] = [data]
+        for kind, key, idx in self.steps:
+            current = _apply_step(current, kind, key, idx, missing_as_empty)
+            if not current:
+                break
+        return current
+
+    def __repr__(self) -> str:
+        return f"PathAccessor({self.path!r})"
+
+
+@lru_cache(maxsize=1024)
+def compile_path(path: str) -> PathAccessor:
+    """Разбирает строковый путь (``a.b[0].c``, ``a[n].b``) в ``PathAccessor``."""
+    steps: List[Step] = []
+    for token in path.replace('.[', '[').split('.'):  # защита от `foo.[0]`
+        list_match = _LIST_INDEX_RE.fullmatch(token)
+        if list_match is None:
+            steps.append((_KEY, token, 0))
+        elif list_match.group(2) == "n":
+            steps.append((_ALL, list_match.group(1), 0))
+        else:
+            steps.append((_INDEX, list_match.group(1), int(list_match.group(2))))
+    return PathAccessor(path, tuple(steps))
+
+
+def paths_overlap(a: Tuple[Step, ...], b: Tuple[Step, ...]) -> bool:
+    """Пересекаются ли два скомпилированных пути.
+
+    Пути пересекаются, если один — префикс другого с точностью до индексов:
+    ``[n]`` совпадает с любым индексом, конкретные индексы — только с равными.
+    Изменение по одному пути может изменить значение по другому.
+    """
+    for (a_kind, a_key, a_idx), (b_kind, b_key, b_idx) in zip(a, b):
+        if a_key != b_key:
+            return False
+        if a_kind == b_kind == _INDEX and a_idx != b_idx:
+            return False
+    return True
+
+
+class _Snapshot:
+    """Производные индексы реестра одной версии (после создания не изменяются)."""
+
+    __slots__ = ("all_paths", "accessors", "path_index", "date_keys", "version")
+
+    def __init__(self, paths: Dict[str, str], date_keys: Iterable[str], version: int) -> None:
+        self.all_paths: Dict[str, str] = paths
+        # скомпилированные пути всех зарегистрированных ключей
+        self.accessors: Dict[str, PathAccessor] = {key: compile_path(path) for key, path in paths.items()}
+        # «путь → ключ»: при нескольких ключах на один путь побеждает первый в ALL_PATHS
+        self.path_index: Dict[str, str] = {}
+        for key, path in paths.items():
+            self.path_index.setdefault(path, key)
+        self.date_keys: frozenset[str] = frozenset(date_keys)
+        self.version = version
+
+
+class _TrieNode:
+    """Узел префиксного дерева путей: шаг, дочерние шаги и ключи, оканчивающиеся здесь."""
+
+    __slots__ = ("step", "children", "keys")
+
+    def __init__(self, step: Step | None = None) -> None:
+        self.step = step
+        self.children: Dict[Step, _TrieNode] = {}
+        self.keys: List[str] = []
+
+
+@lru_cache(maxsize=64)
+def _build_trie(snapshot: _Snapshot, keys: Tuple[str, ...]) -> _TrieNode:
+    """Дерево путей для набора ключей: общие префиксы (``RegistryData.applicant``…) — общие узлы.
+
+    Кэшируется по снимку реестра: дерево старой версии не попадёт в новую.
+    """
+    root = _TrieNode()
+    for key in keys:
+        node = root
+        for step in snapshot.accessors[key].steps:
+            child = node.children.get(step)
+            if child is None:
+                child = node.children[step] = _TrieNode(step)
+            node = child
+        node.keys.append(key)
+    return root
+
+
+def _walk_trie(node: _TrieNode, current: List[Any], out: Dict[str, List[Any]]) -> None:
+    for child in node.children.values():
+        found = _apply_step(current, *child.step)
+        if not found:
+            continue
+        for key in child.keys:
+            out[key] = found
+        if child.children:
+            _walk_trie(child, found, out)
 
-def _split_tokens(path: str) -> List[str]:
-    """Разбивает путь на токены, учитывая нотацию списков."""
-    tokens: List[str] = []
-    for raw in path.split('.'):
-        raw = raw.replace('.[', '[')  # защита от `foo.[0]`
-        tokens.append(raw)
-    return tokens
 
 def _format_date_str(s: str) -> str:
     """Преобразует дату из форматов:
@@ -148,74 +290,79 @@ def _format_date_str(s: str) -> str:
     • YYYY-MM-DD
     • DD-MM-YYYY
     в формат DD.MM.YYYY. Если строка не является датой – возвращается без изменений.
+
+    Формат определяется по длине и позициям разделителей (без regex).
+    ISO-формы принимаются только с ASCII-цифрами (как у ``strptime``).
     """
-    if _ISO_DATETIME_RE.fullmatch(s):
-        dt = datetime.strptime(s, "%Y-%m-%dT%H:%M:%SZ")
-        return dt.strftime("%d.%m.%Y")
-    if _ISO_DATE_RE.fullmatch(s):
-        dt = datetime.strptime(s, "%Y-%m-%d")
-        return dt.strftime("%d.%m.%Y")
-    if _DASH_DATE_RE.fullmatch(s):
-        day, month, year = s.split("-")
-        return f"{day}.{month}.{year}"
+    n = len(s)
+    if n == 20 and s.isascii():
+        if (s[4] == s[7] == '-' and s[10] == 'T' and s[13] == s[16] == ':' and s[19] == 'Z'
+                and s[0:4].isdecimal() and s[5:7].isdecimal() and s[8:10].isdecimal()
+                and s[11:13].isdecimal() and s[14:16].isdecimal() and s[17:19].isdecimal()):
+            dt = datetime(int(s[0:4]), int(s[5:7]), int(s[8:10]), int(s[11:13]), int(s[14:16]), int(s[17:19]))
+            return dt.strftime("%d.%m.%Y")
+    elif n == 10:
+        if s[4] == s[7] == '-' and s.isascii() and s[0:4].isdecimal() and s[5:7].isdecimal() and s[8:10].isdecimal():
+            dt = datetime(int(s[0:4]), int(s[5:7]), int(s[8:10]))
+            return dt.strftime("%d.%m.%Y")
+        if s[2] == s[5] == '-' and s[0:2].isdecimal() and s[3:5].isdecimal() and s[6:10].isdecimal():
+            return f"{s[0:2]}.{s[3:5]}.{s[6:10]}"
     return s
 
 # ---------------------------------------------------------------------------
 # Публичный API
 # ---------------------------------------------------------------------------
 
-def _traverse(current: Any, tokens: List[str]) -> List[Any]:
-    """Рекурсивно идём по *tokens* и собираем найденные значения."""
-    if not tokens:
-        return [current]
-
-    token = tokens[0]
-    list_match = _LIST_INDEX_RE.fullmatch(token)
-
-    if list_match:
-        dict_key, index_raw = list_match.group(1), list_match.group(2)
-        match current:
-            case dict() as d if dict_key in d:
-                seq = d[dict_key]
-                if not isinstance(seq, list):
-                    return []
-                # Случай key[n] – агрегируем по всем элементам
-                if index_raw == "n":
-                    collected: List[Any] = []
-                    for item in seq:
-                        collected.extend(_traverse(item, tokens[1:]))
-                    return collected
-                # Случай key[0], key[1] ...
-                idx = int(index_raw)
-                if idx < len(seq):
-                    return _traverse(seq[idx], tokens[1:])
-        return []
-    else:
-        match current:
-            case dict() as d if token in d:
-                return _traverse(d[token], tokens[1:])
-        return []
-
-
 def get_value(data: Dict[str, Any], key: str, default: Any = "") -> Any:
     """Возвращает значение по *ключу*, поддерживая индексы и [n].
 
     Теперь поддерживаются как ключи из `PATHS`, так и из `PATHS_DECLARAION`.
     """
-    if key not in ALL_PATHS:
+    snapshot = _snapshot
+    accessor = snapshot.accessors.get(key)
+    if accessor is None:
         logger.warning("Ключ '%s' не найден в ALL_PATHS", key)
         return default
 
-    path = ALL_PATHS[key]
-    tokens = _split_tokens(path)
+    return _to_result(snapshot, key, accessor.values(data), default)
 
-    values = _traverse(data, tokens)
 
+def extract_many(data: Dict[str, Any], keys: Iterable[str], default: Any = "") -> Dict[str, Any]:
+    """Значения нескольких ключей за один обход *data*.
+
+    Пути ключей собираются в префиксное дерево, поэтому общие префиксы
+    проходятся один раз. Результат для каждого ключа совпадает с
+    ``get_value(data, key, default)``.
+    """
+    snapshot = _snapshot
+    known: List[str] = []
+    result: Dict[str, Any] = {}
+    for key in dict.fromkeys(keys):
+        if key in snapshot.accessors:
+            known.append(key)
+        else:
+            logger.warning("Ключ '%s' не найден в ALL_PATHS", key)
+            result[key] = default
+
+    found: Dict[str, List[Any]] = {}
+    _walk_trie(_build_trie(snapshot, tuple(known)), [data], found)
+    for key in known:
+        result[key] = _to_result(snapshot, key, found.get(key, ()), default)
+    return result
+
+
+def get_path(key: str) -> str | None:
+    """Строковый путь зарегистрированного ключа (``None``, если ключа нет)."""
+    return _snapshot.all_paths.get(key)
+
+
+def _to_result(snapshot: _Snapshot, key: str, values: Iterable[Any], default: Any) -> Any:
+    """Фильтрует пустые значения, форматирует даты и склеивает несколько значений."""
     # 1. Фильтруем пустые
     filtered = [v for v in values if v not in (None, {}, [])]
 
     # 2. При необходимости превращаем в строку и форматируем дату
-    if key in _DATE_KEYS:
+    if key in snapshot.date_keys:
         str_values = [_format_date_str(str(v)) for v in filtered]
     else:
         str_values = [str(v) for v in filtered]
@@ -229,15 +376,63 @@ def get_value(data: Dict[str, Any], key: str, default: Any = "") -> Any:
     return ", ".join(str_values)
 
 # ---------------------------------------------------------------------------
-# Обратное отображение «путь → ключ» (генерируется по требованию)
+# Обратное отображение «путь → ключ» и расширение реестра
 # ---------------------------------------------------------------------------
 
+# Текущий снимок реестра; читается без блокировки, заменяется целиком (_rebuild_indexes)
+_snapshot: _Snapshot
+
+# Сериализует изменения реестра (register_paths)
+_registry_lock = threading.Lock()
+
+
+def _rebuild_indexes(version: int) -> None:
+    """Собирает новый снимок (ALL_PATHS, скомпилированные пути, обратный индекс) и подменяет текущий.
+
+    Новые словари строятся отдельно и публикуются одним присваиванием
+    после того, как полностью готовы; ``registry_version`` меняется вместе
+    со снимком. ``ALL_PATHS`` модуля тоже заменяется новым словарём —
+    актуальное содержимое даёт ``get_path`` (или ``json_path_registry.ALL_PATHS``),
+    а не ссылка, импортированная через ``from ... import ALL_PATHS``.
+    """
+    global _snapshot, ALL_PATHS
+    snapshot = _Snapshot({**PATHS, **PATHS_DECLARAION}, _DATE_KEYS, version)
+    ALL_PATHS = snapshot.all_paths
+    _snapshot = snapshot
+
+
+def register_paths(paths: Dict[str, str], declaration: bool = False, date_keys: Iterable[str] = ()) -> None:
+    """Добавляет (или переопределяет) ключи реестра во время работы.
+
+    *declaration* — ключи деклараций (``PATHS_DECLARAION``), иначе сертификатов
+    (``PATHS``). *date_keys* — какие из новых ключей являются датами.
+    Все производные индексы пересобираются сразу, поэтому изменять
+    словари модуля напрямую не следует.
+    """
+    unknown_dates = set(date_keys) - set(paths)
+    if unknown_dates:
+        raise ValueError(f"date_keys не входят в paths: {sorted(unknown_dates)}")
+
+    with _registry_lock:
+        target = PATHS_DECLARAION if declaration else PATHS
+        target.update(paths)
+        _DATE_KEYS.update(date_keys)
+        _rebuild_indexes(_snapshot.version + 1)
+        version = _snapshot.version
+    logger.info("Реестр путей расширен: %d ключ(ей), версия %d", len(paths), version)
+
+
+def registry_version() -> int:
+    """Номер версии реестра (для кэшей, зависящих от набора путей)."""
+    return _snapshot.version
+
+
 def reverse_lookup(path: str) -> str | None:
     """Возвращает ключ по строковому пути, если он зарегистрирован в любом из словарей."""
-    for k, v in ALL_PATHS.items():
-        if v == path:
-            return k
-    return None
+    return _snapshot.path_index.get(path)
+
+
+_rebuild_indexes(0)
 
 # ---------------------------------------------------------------------------
 # Публичная утилита: рекурсивное форматирование дат в структуре данных
@@ -0,0 +1,42 @@
+"""Общие фикстуры: локальный стенд вместо реальных сервисов FSA.
+
+Стенд запускается один раз на сессию на портах из ``config.json``
+(``base_url`` сервисов), конфиг процесса переключается на локальные адреса.
+Фикстура ``stand_in`` перед каждым тестом сбрасывает параметры стенда,
+счётчики запросов и общие кэши клиента.
+"""
+
+from __future__ import annotations
+
+import logging
+
+import pytest
+
+from src.core.registry import _shared
+from src.core.write_overlay import clear_write_overlay
+from src.stand_in.server import StandInOptions, StandInServer, local_ports, use_local_services
+
+
+@pytest.fixture(scope="session")
+def stand_in_server():
+    # Вне Streamlit-рантайма streamlit пишет предупреждения на каждый вызов st.*
+    logging.getLogger("streamlit").setLevel(logging.ERROR)
+    use_local_services()
+    server = StandInServer(local_ports()).start()
+    yield server
+    server.stop()
+
+
+@pytest.fixture
+def stand_in(stand_in_server):
+    state = stand_in_server.state
+    with state.lock:
+        state.options = StandInOptions()
+        state.requests.clear()
+        state.user_data.clear()
+        state.injected_errors = 0
+    shared = _shared()
+    shared.details_cache.clear()
+    shared.search_cache.clear()
+    clear_write_overlay()
+    return stand_in_server
@@ -0,0 +1,44 @@
+import time
+
+from src.api.batch_sync import BatchSyncer, TokenBucket
+
+_HEADERS = {"Authorization": "Bearer t"}
+
+
+def test_token_bucket_allows_a_burst_then_limits_the_rate():
+    bucket = TokenBucket(rate=20, burst=3)
+
+    assert [bucket.acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+    started = time.monotonic()
+    assert bucket.acquire() > 0
+    assert time.monotonic() - started >= 0.04
+
+
+def test_each_attempt_is_one_request(stand_in):
+    stand_in.state.options.error_rate = 1.0
+    syncer = BatchSyncer(max_workers=2, rate=1000, max_attempts=3, backoff=0.01)
+
+    results = syncer.sync_many([("certificate", 1), ("declaration", 2)], headers=_HEADERS)
+
+    assert [(r.success, r.status, r.attempts) for r in results] == [(False, 503, 3)] * 2
+    assert stand_in.state.requests == {"sync_document": 6}
+
+
+def test_client_errors_are_not_retried(stand_in):
+    stand_in.state.options.require_auth = True
+
+    [result] = BatchSyncer(rate=1000, max_attempts=3, backoff=0.01).sync_many([("certificate", 1)], headers={})
+
+    assert (result.success, result.unauthorized, result.attempts) == (False, True, 1)
+    assert stand_in.state.requests == {"sync_document": 1}
+
+
+def test_duplicates_are_synced_once_and_keep_caller_ids(stand_in):
+    docs = [("certificate", 1), ("certificate", "1"), ("declaration", 2)]
+
+    results = BatchSyncer(rate=1000).sync_many(docs, headers=_HEADERS)
+
+    assert [(r.doc_type, r.doc_id, r.success) for r in results] == [
+        ("certificate", 1, True), ("certificate", "1", True), ("declaration", 2, True),
+    ]
+    assert stand_in.state.requests == {"sync_document": 2}
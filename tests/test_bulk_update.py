@@ -0,0 +1,87 @@
+import pytest
+
+from benchmarks.bench_transforms import _EDITABLE_COLS
+from src.core import documents
+from src.manual_db_update import updater_handlers
+from src.manual_db_update.bulk_update import BulkUpdateDispatcher, UpdateJob
+from src.manual_db_update.updater_handlers import process_table_changes
+from src.stand_in.data import make_search_page
+from src.ui.model import TableColumns
+from src.ui.results_frame import format_search_results_frame
+
+_HEADERS = {"Authorization": "Bearer t"}
+
+
+def _jobs(count):
+    return [UpdateJob(doc_id, "certificate", {"product": {"name": f"Товар {doc_id}"}})
+            for doc_id in range(1, count + 1)]
+
+
+def test_batches(stand_in):
+    outcomes = BulkUpdateDispatcher(batch_endpoint=True, batch_size=2).dispatch(_jobs(5), headers=_HEADERS)
+
+    assert [o.success for o in outcomes] == [True] * 5
+    assert stand_in.state.requests == {"update_documents_batch": 3}
+    assert stand_in.state.user_data[("certificate", 5)] == {"product": {"name": "Товар 5"}}
+
+
+@pytest.mark.parametrize("status", [404, 405])
+def test_falls_back_to_single_updates_when_batch_is_unsupported(stand_in, monkeypatch, status):
+    dispatcher = BulkUpdateDispatcher(batch_endpoint=True, batch_size=2)
+    transport_put = dispatcher._transport.put
+
+    def put(url, **kwargs):
+        response = transport_put(url, **kwargs)
+        if url.endswith("/documents/batch"):
+            response.status_code = status
+        return response
+
+    monkeypatch.setattr(dispatcher._transport, "put", put)
+    outcomes = dispatcher.dispatch(_jobs(5), headers=_HEADERS)
+
+    assert [o.success for o in outcomes] == [True] * 5
+    assert stand_in.state.requests["update_document"] == 5
+    assert dispatcher.batch_endpoint is False
+
+
+def test_failed_updates_are_not_retried(stand_in):
+    stand_in.state.options.error_rate = 1.0
+
+    outcomes = BulkUpdateDispatcher(batch_endpoint=False).dispatch(_jobs(3), headers=_HEADERS)
+
+    assert [(o.success, o.status) for o in outcomes] == [(False, 503)] * 3
+    assert stand_in.state.requests == {"update_document": 3}
+
+
+def test_timeouts_are_reported_without_status(stand_in):
+    stand_in.state.options.latency_ms = 500
+
+    outcomes = BulkUpdateDispatcher(batch_endpoint=False, timeout=0.1).dispatch(_jobs(2), headers=_HEADERS)
+
+    assert [(o.success, o.status) for o in outcomes] == [(False, None)] * 2
+    assert all("timed out" in o.error for o in outcomes)
+    assert stand_in.state.requests == {"update_document": 2}
+
+
+@pytest.mark.parametrize("batch_endpoint", [True, False])
+def test_successful_updates_are_recorded_once(stand_in, monkeypatch, batch_endpoint):
+    invalidated = []
+    monkeypatch.setattr(documents, "invalidate_document", lambda doc_type, doc_id: invalidated.append(doc_id))
+
+    BulkUpdateDispatcher(batch_endpoint=batch_endpoint, batch_size=2).dispatch(_jobs(3), headers=_HEADERS)
+
+    assert sorted(invalidated) == [1, 2, 3]
+
+
+def test_process_table_changes_reports_status(stand_in, monkeypatch):
+    stand_in.state.options.require_auth = True
+    monkeypatch.setattr(updater_handlers.authenticator, "get_token", lambda: None)
+    original = format_search_results_frame(make_search_page(4, 0, 4)["items"])
+    edited = original.copy()
+    edited.loc[1, TableColumns.SELECT] = True
+    edited.loc[1, TableColumns.PRODUCT] = "Сапоги"
+
+    dispatcher = BulkUpdateDispatcher(batch_endpoint=False)
+    results = process_table_changes(edited, original, _EDITABLE_COLS, dispatcher=dispatcher)
+
+    assert [(r["success"], r["status"]) for r in results] == [(None, None), (False, 401), (None, None), (None, None)]
@@ -0,0 +1,72 @@
+from src.core.auth import static_token
+from src.core.cache import LRUCache
+from src.core.registry import RegistryClient, invalidate_document
+
+
+def test_expired_entry_is_a_miss():
+    cache = LRUCache(ttl=60, max_entries=10, max_bytes=1000)
+    cache.set("fresh", b"x")
+    cache.set("stale", b"x", ttl=0)
+
+    assert cache.get("fresh") == b"x"
+    assert cache.get("stale") is None
+    assert "stale" not in cache
+    assert cache.stats()["expirations"] == 1
+
+
+def test_evicts_least_recently_used_by_entries():
+    cache = LRUCache(ttl=60, max_entries=2, max_bytes=1000)
+    cache.set("a", b"1")
+    cache.set("b", b"2")
+    cache.get("a")  # "b" становится самым старым
+    cache.set("c", b"3")
+
+    assert cache.get("b") is None
+    assert cache.get("a") == b"1"
+    assert cache.get("c") == b"3"
+    assert cache.stats()["evictions"] == 1
+
+
+def test_evicts_by_bytes_and_skips_oversized_values():
+    cache = LRUCache(ttl=60, max_entries=10, max_bytes=10)
+    cache.set("a", b"12345")
+    cache.set("b", b"12345")
+    cache.set("c", b"123")
+    cache.set("huge", b"x" * 11)
+
+    assert cache.get("a") is None
+    assert cache.get("huge") is None
+    assert cache.stats()["bytes"] == 8
+
+
+def test_invalidate_where():
+    cache = LRUCache(ttl=60, max_entries=10, max_bytes=1000)
+    for key in (("s1", "certificate", "1"), ("s2", "certificate", "1"), ("s1", "certificate", "2")):
+        cache.set(key, b"x")
+
+    assert cache.invalidate_where(lambda key: key[1:] == ("certificate", "1")) == 2
+    assert len(cache) == 1
+
+
+def test_details_are_cached_per_token(stand_in):
+    alice = RegistryClient(static_token("alice"))
+    bob = RegistryClient(static_token("bob"))
+
+    alice.get_document_details("5", "certificate")
+    alice.get_document_details("5", "certificate")
+    assert stand_in.state.requests["document_by_id"] == 1
+
+    bob.get_document_details("5", "certificate")
+    assert stand_in.state.requests["document_by_id"] == 2
+
+    invalidate_document("certificate", "5")
+    alice.get_document_details("5", "certificate")
+    bob.get_document_details("5", "certificate")
+    assert stand_in.state.requests["document_by_id"] == 4
+
+
+def test_details_are_returned_as_copies(stand_in):
+    client = RegistryClient(static_token("alice"))
+    client.get_document_details("5", "certificate")["RegistryData"] = None
+
+    assert client.get_document_details("5", "certificate")["RegistryData"] is not None
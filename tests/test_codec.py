@@ -0,0 +1,88 @@
+import importlib.util
+import logging
+import sys
+from datetime import date, datetime
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from src.core import codec
+
+_SAMPLES = [
+    {"name": "Обувь «Зима»", "ids": [1, 2, 3], "price": 10.5, "ok": True, "none": None},
+    {"userData": {"product": {"tnveds": ["6403"], "brands": []}}, "nested": [{"a": {}}, []]},
+    {1: "ключ-число", "date": date(2024, 3, 1), "ts": datetime(2024, 3, 1, 12, 30)},
+    {"np": [np.int64(7), np.float64(0.25), np.bool_(True)], "pd": pd.Timestamp("2024-03-01 12:30")},
+    [],
+    "строка",
+]
+
+
+@pytest.fixture(scope="module")
+def stdlib_codec():
+    """Копия модуля ``codec`` без orjson (запасной путь на стандартном ``json``)."""
+    saved = sys.modules.get("orjson")
+    sys.modules["orjson"] = None  # import orjson -> ImportError
+    try:
+        spec = importlib.util.spec_from_file_location("codec_stdlib", codec.__file__)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+    finally:
+        if saved is None:
+            del sys.modules["orjson"]
+        else:
+            sys.modules["orjson"] = saved
+    assert module.BACKEND == "json"
+    return module
+
+
+def test_round_trip():
+    obj = {"name": "Обувь", "ids": [1, 2], "nested": {"x": None}}
+    assert codec.loads(codec.dumps(obj)) == obj
+    assert codec.dumps_str({"name": "Обувь"}) == '{"name":"Обувь"}'
+
+
+def test_numpy_and_dates():
+    data = codec.loads(codec.dumps(_SAMPLES[3]))
+    assert data == {"np": [7, 0.25, True], "pd": "2024-03-01T12:30:00"}
+    assert codec.loads(codec.dumps({"d": date(2024, 3, 1)})) == {"d": "2024-03-01"}
+
+
+@pytest.mark.parametrize("value", [object(), {1, 2}, pd.NaT, b"bytes"])
+def test_dumps_is_strict(value):
+    with pytest.raises(TypeError):
+        codec.dumps({"value": value})
+
+
+@pytest.mark.parametrize("indent", [False, True])
+@pytest.mark.parametrize("obj", _SAMPLES, ids=range(len(_SAMPLES)))
+def test_stdlib_backend_produces_the_same_bytes(stdlib_codec, obj, indent):
+    assert stdlib_codec.dumps(obj, indent=indent) == codec.dumps(obj, indent=indent)
+
+
+def test_stdlib_backend_is_strict(stdlib_codec):
+    with pytest.raises(TypeError):
+        stdlib_codec.dumps({"value": object()})
+
+
+class _Probe:
+    calls = 0
+
+    def __str__(self):
+        _Probe.calls += 1
+        return "probe"
+
+
+def test_lazy_json_serializes_only_when_logged(caplog):
+    logger = logging.getLogger("tests.codec")
+    _Probe.calls = 0
+
+    with caplog.at_level(logging.INFO, logger="tests.codec"):
+        logger.debug("payload: %s", codec.LazyJSON({"value": _Probe()}))
+    assert _Probe.calls == 0
+
+    with caplog.at_level(logging.DEBUG, logger="tests.codec"):
+        logger.debug("payload: %s", codec.LazyJSON({"value": _Probe()}))
+    assert _Probe.calls > 0  # по разу на каждый обработчик caplog
+    assert 'payload: {"value":"probe"}' in caplog.text
@@ -0,0 +1,52 @@
+import pytest
+
+from src.core.auth import static_token
+from src.core.errors import SearchPageError
+from src.core.registry import RegistryClient
+
+_PARAMS = {"q": "обувь"}
+
+
+def _ids(items):
+    return [item["ID"] for item in items]
+
+
+def test_iterates_all_pages(stand_in):
+    stand_in.state.options.total_results = 95
+    client = RegistryClient(static_token("t"))
+
+    pages = list(client.iter_search_pages(_PARAMS, page_size=20, read_ahead=2))
+
+    assert [page for page, _ in pages] == [0, 1, 2, 3, 4]
+    assert len(_ids(item for _, items in pages for item in items)) == 95
+    assert stand_in.state.requests["search"] == 5
+
+
+def test_failed_page_is_retried_without_transport_retries(stand_in):
+    stand_in.state.options.error_rate = 1.0
+    client = RegistryClient(static_token("t"))
+
+    with pytest.raises(SearchPageError) as error:
+        list(client.iter_search(_PARAMS, page_size=20, page_retries=2))
+
+    assert error.value.page == 0
+    assert stand_in.state.requests["search"] == 3
+
+
+def test_resumes_from_the_failed_page(stand_in):
+    stand_in.state.options.total_results = 100
+    client = RegistryClient(static_token("t"))
+    expected = _ids(client.iter_search(_PARAMS, page_size=20))
+
+    pages = client.iter_search_pages(_PARAMS, page_size=20, read_ahead=1, page_retries=0)
+    received = list(next(pages)[1])
+    # первая страница получена, следующие — с ошибкой
+    stand_in.state.options.error_rate = 1.0
+    with pytest.raises(SearchPageError) as error:
+        for _, items in pages:
+            received.extend(items)
+    assert error.value.page == 1
+
+    stand_in.state.options.error_rate = 0.0
+    received.extend(client.iter_search(_PARAMS, page_size=20, start_page=error.value.page))
+    assert _ids(received) == expected
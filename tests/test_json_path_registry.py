@@ -0,0 +1,129 @@
+import pytest
+
+from benchmarks.oracles import scan_reverse_lookup, traverse_get_value
+from src.generate_preview.new_cert_api_values import compiled_mapping
+from src.generate_preview.template_engine import compile_template
+from src.utils import json_path_registry
+from src.utils.json_path_registry import extract_many, get_value
+
+LABS = {
+    "RegistryData": {
+        "testingLabs": [
+            {"fullName": "ИЛ-1", "protocols": [{"number": "11", "date": "2024-01-05T00:00:00Z"}, {"number": "12"}]},
+            {"fullName": None, "protocols": []},
+            {"fullName": "ИЛ-3", "protocols": [{"number": "31", "date": "05-02-2024"}]},
+        ],
+        "applicant": {"contacts": [{"value": "mail@example.ru"}, {"value": "+7 495 000-00-00"}]},
+    },
+    "search_Product": {"Tnveds": ["6403", None, {}, [], 6404]},
+}
+
+
+@pytest.mark.parametrize("key, expected", [
+    ("applicant_email", "mail@example.ru"),                  # contacts[0]
+    ("applicant_phone", "+7 495 000-00-00"),                 # contacts[1]
+    ("testing_labs_number", "11, 31"),                       # testingLabs[n].protocols[0]
+    ("testing_labs_fullname", "ИЛ-1, ИЛ-3"),                 # None пропускается
+    ("product_codes_tnveds", "6403, 6404"),                  # None, {} и [] пропускаются
+    ("testing_labs_date", "05.01.2024, 05.02.2024"),         # ключ-дата: оба формата
+    ("applicant_address", "—"),                              # нет ключа в данных
+    ("unknown_key", "—"),                                    # нет ключа в реестре
+])
+def test_get_value(key, expected):
+    assert get_value(LABS, key, "—") == expected
+    assert traverse_get_value(LABS, key, "—") == expected
+
+
+def test_index_out_of_range_and_not_a_list():
+    data = {"RegistryData": {"applicant": {"contacts": [{"value": "a"}], "addresses": "не список"}}}
+    assert get_value(data, "applicant_phone", None) is None
+    assert get_value(data, "applicant_address", None) is None
+
+
+def test_single_value_is_returned_as_is():
+    data = {"search_Product": {"Tnveds": [6403]}}
+    assert get_value(data, "product_codes_tnveds") == "6403"
+    assert get_value({"search_Product": {"Tnveds": [""]}}, "product_codes_tnveds", "—") == ""
+
+
+def test_dates_are_formatted_only_for_date_keys():
+    data = {"RegistryData": {"certRegDate": "2024-01-05", "product": {"fullName": "2024-01-05"}}}
+    assert get_value(data, "issue_date") == "05.01.2024"
+    assert get_value(data, "product_fullname") == "2024-01-05"
+
+
+def test_extract_many_matches_get_value():
+    keys = ["testing_labs_number", "testing_labs_date", "testing_labs_fullname", "applicant_email",
+            "applicant_phone", "applicant_address", "product_codes_tnveds", "unknown_key", "applicant_email"]
+    result = extract_many(LABS, keys, "—")
+    assert result.keys() == set(keys)
+    assert result == {key: get_value(LABS, key, "—") for key in keys}
+
+
+def test_extract_many_shared_prefix_with_different_indexes():
+    data = {"RegistryData": {"testingLabs": [
+        {"fullName": "ИЛ-1", "protocols": [{"number": "1", "date": "2024-01-05"}]},
+        {"fullName": "ИЛ-2", "protocols": [{"number": "2"}]},
+    ]}}
+    assert extract_many(data, ["testing_labs_fullname", "testing_labs_number", "testing_labs_date"]) == {
+        "testing_labs_fullname": "ИЛ-1, ИЛ-2",
+        "testing_labs_number": "1, 2",
+        "testing_labs_date": "05.01.2024",
+    }
+
+
+@pytest.fixture
+def registry():
+    """Восстанавливает реестр путей после теста, меняющего его через register_paths."""
+    saved = (dict(json_path_registry.PATHS), dict(json_path_registry.PATHS_DECLARAION),
+             set(json_path_registry._DATE_KEYS))
+    yield json_path_registry
+    paths, declaration, date_keys = saved
+    for target, source in ((json_path_registry.PATHS, paths), (json_path_registry.PATHS_DECLARAION, declaration),
+                           (json_path_registry._DATE_KEYS, date_keys)):
+        target.clear()
+        target.update(source)
+    json_path_registry._rebuild_indexes(json_path_registry.registry_version() + 1)
+
+
+def test_register_paths_updates_lookups(registry):
+    version = registry.registry_version()
+    assert registry.reverse_lookup("RegistryData.extra.checkDate") is None
+
+    registry.register_paths({"extra_check_date": "RegistryData.extra.checkDate"}, date_keys=["extra_check_date"])
+
+    assert registry.registry_version() == version + 1
+    assert registry.reverse_lookup("RegistryData.extra.checkDate") == "extra_check_date"
+    assert registry.reverse_lookup("RegistryData.extra.checkDate") == scan_reverse_lookup("RegistryData.extra.checkDate")
+    assert registry.get_path("extra_check_date") == registry.ALL_PATHS["extra_check_date"]
+    data = {"RegistryData": {"extra": {"checkDate": "2024-03-01"}}}
+    assert get_value(data, "extra_check_date") == "01.03.2024"
+    assert extract_many(data, ["extra_check_date"]) == {"extra_check_date": "01.03.2024"}
+
+
+def test_register_paths_declaration_overrides_certificate_key(registry):
+    registry.register_paths({"applicant_email": "RegistryData.applicant.email"}, declaration=True)
+    assert registry.get_path("applicant_email") == "RegistryData.applicant.email"
+    assert registry.reverse_lookup("RegistryData.applicant.email") == "applicant_email"
+
+
+def test_register_paths_rejects_unknown_date_keys(registry):
+    version = registry.registry_version()
+    with pytest.raises(ValueError):
+        registry.register_paths({"extra_code": "RegistryData.extra.code"}, date_keys=["other"])
+    assert registry.registry_version() == version
+    assert registry.get_path("extra_code") is None
+
+
+def test_register_paths_recompiles_templates(registry):
+    template = compile_template("Код: {RegistryData.extra.code}")
+    mapping = compiled_mapping(declaration=False)
+    assert template.keys == (None,)
+
+    registry.register_paths({"extra_code": "RegistryData.extra.code"})
+
+    recompiled = compile_template("Код: {RegistryData.extra.code}")
+    assert recompiled is not template
+    assert recompiled.keys == ("extra_code",)
+    assert recompiled.render_map({"RegistryData.extra.code": "42"}) == "Код: 42"
+    assert compiled_mapping(declaration=False) is not mapping
@@ -0,0 +1,15 @@
+"""Проверки паритета из ``benchmarks/`` (``@check``) в составе тестов.
+
+Каждая проверка сравнивает векторизованную реализацию с построчным
+эталоном из ``benchmarks/oracles.py`` на синтетических страницах поиска.
+"""
+
+import pytest
+
+import benchmarks.bench_transforms  # noqa: F401 - регистрирует проверки
+from benchmarks.harness import CHECKS
+
+
+@pytest.mark.parametrize("check", CHECKS, ids=lambda fn: fn.__name__)
+def test_parity(check):
+    check()
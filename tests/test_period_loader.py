@@ -0,0 +1,79 @@
+from datetime import date
+
+import pytest
+
+from src.api.period_loader import Checkpoint, PeriodLoadJob, WindowResult, main, split_period
+
+
+def test_split_period_by_day_and_week():
+    assert split_period(date(2024, 1, 1), date(2024, 1, 3)) == [
+        (date(2024, 1, 1), date(2024, 1, 1)),
+        (date(2024, 1, 2), date(2024, 1, 2)),
+        (date(2024, 1, 3), date(2024, 1, 3)),
+    ]
+    weeks = split_period(date(2024, 1, 1), date(2024, 1, 17), "week")
+    assert weeks == [
+        (date(2024, 1, 1), date(2024, 1, 7)),
+        (date(2024, 1, 8), date(2024, 1, 14)),
+        (date(2024, 1, 15), date(2024, 1, 17)),
+    ]
+
+
+@pytest.mark.parametrize("start, end, window", [
+    (date(2024, 1, 2), date(2024, 1, 1), "day"),
+    (date(2024, 1, 1), date(2024, 1, 2), "month"),
+])
+def test_split_period_rejects_bad_input(start, end, window):
+    with pytest.raises(ValueError):
+        split_period(start, end, window)
+
+
+def test_checkpoint_round_trip(tmp_path):
+    path = str(tmp_path / "load.json")
+    params = {"doc_type": "certificate", "start": "2024-01-01", "end": "2024-01-31", "window": "week"}
+    Checkpoint(path, params).mark_done(WindowResult("2024-01-08", "2024-01-14", True, 200, 1.0, 70))
+
+    checkpoint = Checkpoint(path, params)
+    checkpoint.load()
+    assert checkpoint.is_done((date(2024, 1, 8), date(2024, 1, 14)))
+    assert not checkpoint.is_done((date(2024, 1, 1), date(2024, 1, 7)))
+
+    with pytest.raises(ValueError):
+        Checkpoint(path, {**params, "window": "day"}).load()
+
+
+def _job(tmp_path):
+    return PeriodLoadJob("certificate", date(2024, 1, 1), date(2024, 1, 17), "week",
+                         checkpoint_path=str(tmp_path / "load.json"))
+
+
+def test_failed_windows_are_resumed(stand_in, tmp_path):
+    stand_in.state.options.error_rate = 1.0
+    failed = _job(tmp_path).run()
+    assert [r.success for r in failed] == [False] * 3
+    assert stand_in.state.requests == {"load_period": 3}  # без повторов транспорта
+
+    stand_in.state.options.error_rate = 0.0
+    job = _job(tmp_path)
+    reported = []
+    loaded = job.run(lambda result, done, total: reported.append((done, total)))
+    assert [(r.start, r.documents) for r in loaded] == [("2024-01-01", 70), ("2024-01-08", 70), ("2024-01-15", 30)]
+    assert reported == [(1, 3), (2, 3), (3, 3)]
+
+    assert _job(tmp_path).run() == []
+    assert stand_in.state.requests == {"load_period": 6}
+
+
+def test_endpoint_option(stand_in, tmp_path):
+    job = PeriodLoadJob("declaration", date(2024, 1, 1), date(2024, 1, 1), endpoint="http://127.0.0.1:1/nowhere",
+                        checkpoint_path=str(tmp_path / "load.json"))
+    [result] = job.run()
+    assert job.url == "http://127.0.0.1:1/nowhere"
+    assert not result.success and result.error
+
+
+def test_cli_reports_bad_arguments(capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        main(["certificate", "2024-02-01", "2024-01-01"])
+    assert exit_info.value.code == 2
+    assert "раньше начала" in capsys.readouterr().err
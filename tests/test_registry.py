@@ -0,0 +1,97 @@
+import time
+
+from src.core.auth import static_token
+from src.core.errors import ApiError
+from src.core.registry import RegistryClient, auth_scope
+
+
+def _wait_for(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "условие не выполнилось"
+        time.sleep(0.01)
+
+
+def _cached(client, params, page, page_size=20):
+    scope = auth_scope(client.auth_headers())
+    key = client._search_key(scope, client.normalize_search_params(params), page, page_size)
+    return key in client._search_cache
+
+
+def test_normalize_search_params():
+    params = {"q": "  обувь ", "materials": "кожа, текстиль,кожа", "genders": "", "status": None, "page": 0}
+
+    assert RegistryClient.normalize_search_params(params) == {"q": "обувь", "materials": "кожа,текстиль", "page": 0}
+    assert params["q"] == "  обувь "
+
+
+def test_equivalent_queries_share_the_cache(stand_in):
+    client = RegistryClient()
+
+    first = client.search({"q": "обувь", "materials": "текстиль,кожа"})
+    again = client.search({"q": " обувь ", "materials": "кожа, текстиль", "genders": ""})
+
+    assert again == first
+    assert stand_in.state.requests == {"search": 1}
+
+    client.search({"q": "обувь", "materials": "кожа"})
+    client.search({"q": "обувь", "materials": "кожа, текстиль"}, page=1)
+    assert stand_in.state.requests == {"search": 3}
+
+
+def test_invalidate_search(stand_in):
+    client = RegistryClient()
+    for params in ({"q": "обувь"}, {"q": "сумки"}):
+        client.search(params)
+        client.search(params, page=1)
+
+    client.invalidate_search({"q": " обувь"})
+    assert not _cached(client, {"q": "обувь"}, 0) and not _cached(client, {"q": "обувь"}, 1)
+    assert _cached(client, {"q": "сумки"}, 0)
+
+    client.invalidate_search()
+    assert not _cached(client, {"q": "сумки"}, 0)
+
+
+def test_prefetch_fills_the_cache(stand_in):
+    client = RegistryClient()
+    client.search({"q": "обувь"}, page=3)
+
+    client.prefetch_search_pages({"q": "обувь"}, page=3, total_pages=10, include_previous=True)
+    _wait_for(lambda: _cached(client, {"q": "обувь"}, 2) and _cached(client, {"q": "обувь"}, 4))
+
+    client.search({"q": "обувь"}, page=4)
+    assert stand_in.state.requests == {"search": 3}
+
+    # последняя страница: следующей нет
+    client.prefetch_search_pages({"q": "обувь"}, page=9, total_pages=10)
+    time.sleep(0.1)
+    assert stand_in.state.requests == {"search": 3}
+
+
+def test_prefetch_is_cancelled_when_the_query_changes(stand_in):
+    stand_in.state.options.latency_ms = 200
+    client = RegistryClient(static_token("t"))
+
+    client.prefetch_search_pages({"q": "обувь"}, page=0, total_pages=10)
+    client.prefetch_search_pages({"q": "сумки"}, page=0, total_pages=10)
+    _wait_for(lambda: _cached(client, {"q": "сумки"}, 1))
+    time.sleep(0.3)  # отменённая подгрузка, если уже ушла в сеть, успела бы ответить
+
+    assert not _cached(client, {"q": "обувь"}, 1)
+
+
+def test_details_many_keeps_order_and_reports_errors(stand_in):
+    client = RegistryClient(static_token("t"))
+    client.get_document_details("2", "declaration")  # из кэша
+
+    docs = [("1", "certificate"), ("2", "declaration"), ("bad", "certificate"), ("3", "certificate")]
+    results = client.get_documents_details_many(docs, max_workers=3)
+
+    assert [(r["doc_id"], r["doc_type"], r["success"]) for r in results] == [
+        ("1", "certificate", True), ("2", "declaration", True), ("bad", "certificate", False), ("3", "certificate", True),
+    ]
+    assert results[1]["details"]["docType"] == "declaration"
+    assert isinstance(results[2]["exception"], ApiError) and results[2]["exception"].status == 404
+    # "bad" не совпадает с маршрутом стенда (404 без счётчика), "2" — из кэша
+    assert stand_in.state.requests == {"document_by_id": 3}
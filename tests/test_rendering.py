@@ -0,0 +1,86 @@
+import copy
+
+import pytest
+
+from benchmarks.payloads import merged_certificate
+from src.api import workspace as workspace_module
+from src.api.client import FSAApiClient
+from src.api.workspace import SessionWorkspace
+from src.generate_preview import rendering
+from src.generate_preview.new_cert_api_values import compiled_mapping, render_data_to_api
+from src.generate_preview.template_engine import CompiledMapping
+
+
+@pytest.fixture
+def client(monkeypatch):
+    monkeypatch.setattr(workspace_module, "_headless_workspace", SessionWorkspace())
+    client = FSAApiClient.get_instance()
+    client.workspace.last_merged_data = copy.deepcopy(merged_certificate(3))
+    return client
+
+
+@pytest.fixture
+def rendered_outputs(monkeypatch):
+    """Выходные ключи, переданные в CompiledMapping.render (None — полный рендеринг)."""
+    calls = []
+    original = CompiledMapping.render
+
+    def render(self, merged_data, outputs=None):
+        calls.append(None if outputs is None else set(outputs))
+        return original(self, merged_data, outputs)
+
+    monkeypatch.setattr(CompiledMapping, "render", render)
+    return calls
+
+
+def test_edit_rerenders_only_affected_outputs(client, rendered_outputs):
+    rendering.templated_values(client)
+    assert rendered_outputs == [None]
+
+    client.update_merged_data("RegistryData.applicant.contacts[0].value", "new@example.ru")
+    values = rendering.templated_values(client)
+
+    expected_outputs = compiled_mapping(False).dependencies.affected_outputs(
+        ["RegistryData.applicant.contacts[0].value"]
+    )
+    assert rendered_outputs[1:] == [expected_outputs]
+    assert expected_outputs and expected_outputs < set(values)
+    assert all("new@example.ru" in values[out] for out in expected_outputs)
+    assert values == render_data_to_api(client.get_last_merged_data())
+
+
+def test_edit_outside_templates_renders_nothing(client, rendered_outputs):
+    before = rendering.templated_values(client)
+    client.update_merged_data("RegistryData.manufacturer.ogrn", "1234567890123")
+    assert rendering.templated_values(client) == before
+    assert rendered_outputs == [None]
+
+
+def test_list_edit_invalidates_every_index(client, rendered_outputs):
+    rendering.templated_values(client)
+    labs = client.get_last_merged_data()["RegistryData"]["testingLabs"]
+    client.update_merged_data("RegistryData.testingLabs", labs[:1])
+    values = rendering.templated_values(client)
+
+    assert rendered_outputs[1] == compiled_mapping(False).dependencies.affected_outputs(["RegistryData.testingLabs"])
+    assert values == render_data_to_api(client.get_last_merged_data())
+
+
+def test_replaced_data_is_rendered_in_full(client, rendered_outputs):
+    rendering.templated_values(client)
+    client.workspace.last_merged_data = copy.deepcopy(merged_certificate(1))
+    rendering.templated_values(client)
+    assert rendered_outputs == [None, None]
+
+
+@pytest.mark.parametrize("changed, affected", [
+    ("RegistryData.applicant.contacts[0].value", {"applicant_email"}),
+    ("RegistryData.applicant.contacts[1]", {"applicant_phone"}),
+    ("RegistryData.applicant", {"applicant_email", "applicant_phone", "applicant_address", "applicant_ogrn",
+                                "applicant_fullname"}),
+    ("RegistryData.testingLabs[2].protocols[0].date", {"test_reports_date"}),
+    ("RegistryData.certRegDate", {"issue_date"}),
+    ("RegistryData.unknown", set()),
+])
+def test_affected_keys(changed, affected):
+    assert compiled_mapping(False).dependencies.affected_keys([changed]) == affected
@@ -0,0 +1,69 @@
+import pandas as pd
+import pytest
+
+from benchmarks.oracles import format_search_results
+from src.core.write_overlay import clear_write_overlay, record_write
+from src.ui.model import TableColumns
+from src.ui.results_frame import cached_results_frame, format_search_results_frame, results_frame_by_fingerprint
+
+
+@pytest.fixture(autouse=True)
+def _empty_overlay():
+    clear_write_overlay()
+    yield
+    clear_write_overlay()
+
+
+def _item(doc_id=1, **product):
+    return {
+        "ID": doc_id,
+        "Type": "D",
+        "Number": "ЕАЭС N RU Д-CN.1",
+        "RegistrationDate": "2024-03-01T00:00:00Z",
+        "ValidityPeriod": None,
+        "Manufacturer": {"Name": "ACME", "Branches": [{"Country": "CN", "Name": "Завод 1"}, {"Country": "VN"}]},
+        "Product": {"Name": "Обувь", "Tnveds": ["6403", "6404"], "Brands": None, **product},
+    }
+
+
+def test_row_values():
+    row = format_search_results_frame([_item()]).iloc[0]
+
+    assert not row[TableColumns.SELECT]
+    assert row[TableColumns.TYPE] == "Д"
+    assert row[TableColumns.REGISTRATION_DATE] == "01.03.2024"
+    assert row[TableColumns.VALID_UNTIL] == ""
+    assert row[TableColumns.TNVED] == "6403, 6404"
+    assert row[TableColumns.BRANDS] == ""
+    assert row[TableColumns.BRANCHES] == ["CN: Завод 1", "VN"]
+    assert row[TableColumns.LINK].endswith("/declaration/view/1/common")
+
+
+def test_empty_page():
+    assert format_search_results_frame([]).empty
+
+
+def test_write_overlay_is_applied_on_the_frame_path():
+    items = [_item(1), _item(2)]
+    record_write("declaration", 2, {"product": {"name": "Сапоги", "brands": ["ACME"]}})
+
+    frame = format_search_results_frame(items)
+
+    assert frame[TableColumns.PRODUCT].tolist() == ["Обувь", "Сапоги"]
+    assert frame[TableColumns.BRANDS].tolist() == ["", "ACME"]
+    # исходные элементы не изменяются; эталон наложение не применяет
+    assert items[1]["Product"]["Name"] == "Обувь"
+    assert pd.DataFrame(format_search_results(items))[TableColumns.PRODUCT].tolist() == ["Обувь", "Обувь"]
+
+
+def test_cached_frame_fingerprint_follows_the_overlay():
+    items = [_item(1)]
+    fingerprint, frame = cached_results_frame(items)
+    assert cached_results_frame(items)[0] == fingerprint
+    assert results_frame_by_fingerprint(fingerprint) is frame
+
+    record_write("declaration", 1, {"product": {"name": "Сапоги"}})
+    new_fingerprint, new_frame = cached_results_frame(items)
+
+    assert new_fingerprint != fingerprint
+    assert new_frame[TableColumns.PRODUCT].tolist() == ["Сапоги"]
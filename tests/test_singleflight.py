@@ -0,0 +1,64 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from src.core.singleflight import SingleFlight
+
+_CALLERS = 8
+
+
+def _run_concurrently(flight, fn):
+    """Вызывает ``flight.do("key", fn)`` из _CALLERS потоков; *fn* ждёт, пока присоединятся все."""
+    release = threading.Event()
+
+    def leader():
+        release.wait(5)
+        return fn()
+
+    def call():
+        return flight.do("key", leader)
+
+    with ThreadPoolExecutor(max_workers=_CALLERS) as pool:
+        futures = [pool.submit(call) for _ in range(_CALLERS)]
+        deadline = time.monotonic() + 5
+        while flight.stats()["coalesced"] < _CALLERS - 1 and time.monotonic() < deadline:
+            time.sleep(0.01)
+        release.set()
+    return futures
+
+
+def test_concurrent_calls_with_the_same_key_run_once():
+    flight = SingleFlight()
+    calls = []
+
+    def fetch():
+        calls.append(1)
+        return object()
+
+    futures = _run_concurrently(flight, fetch)
+
+    assert len(calls) == 1
+    assert len({id(f.result()) for f in futures}) == 1
+    assert flight.stats() == {"executed": 1, "coalesced": _CALLERS - 1, "in_flight": 0}
+
+
+def test_error_is_shared_by_waiters():
+    flight = SingleFlight()
+
+    def fail():
+        raise ValueError("boom")
+
+    for future in _run_concurrently(flight, fail):
+        with pytest.raises(ValueError, match="boom"):
+            future.result()
+    assert flight.stats()["executed"] == 1
+
+
+def test_sequential_calls_are_not_coalesced():
+    flight = SingleFlight()
+    assert flight.do("key", lambda: 1) == 1
+    assert flight.do("key", lambda: 2) == 2
+    assert flight.do("other", lambda: 3) == 3
+    assert flight.stats()["executed"] == 3
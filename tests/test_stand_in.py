@@ -0,0 +1,56 @@
+import pytest
+import requests
+
+from config.config import load_config
+
+
+def _url(service, endpoint, **path_vars):
+    return load_config().get_service_url(service, endpoint, **path_vars)
+
+
+def test_search_pages_are_deterministic(stand_in):
+    stand_in.state.options.total_results = 45
+    first = requests.get(_url("registry", "search"), params={"q": "обувь", "page": 0, "page_size": 20}).json()
+    again = requests.get(_url("registry", "search"), params={"q": "обувь", "page": 0, "page_size": 20}).json()
+    last = requests.get(_url("registry", "search"), params={"q": "обувь", "page": 2, "page_size": 20}).json()
+
+    assert first == again
+    assert first["totalPages"] == 3
+    assert len(first["items"]) == 20
+    assert len(last["items"]) == 5
+    assert stand_in.state.requests["search"] == 3
+
+
+def test_update_is_visible_in_details(stand_in):
+    user_data = {"product": {"name": "Новое"}}
+    response = requests.put(_url("document", "update_document", doc_type="certificate", doc_id=7), json=user_data)
+    details = requests.get(_url("registry", "document_by_id", doc_type="certificate", doc_id=7)).json()
+
+    assert response.status_code == 200
+    assert details["userData"] == user_data
+
+
+@pytest.mark.parametrize("batch_endpoint, status", [(True, 200), (False, 404)])
+def test_batch_endpoint_can_be_disabled(stand_in, batch_endpoint, status):
+    stand_in.state.options.batch_endpoint = batch_endpoint
+    body = {"documents": [{"type": "certificate", "id": 1, "userData": {}}]}
+    assert requests.put(_url("document", "update_documents_batch"), json=body).status_code == status
+
+
+def test_error_injection_and_auth(stand_in):
+    stand_in.state.options.error_rate = 1.0
+    assert requests.get(_url("document", "sync_document", doc_type="certificate", doc_id=1)).status_code == 503
+    assert stand_in.state.injected_errors == 1
+
+    stand_in.state.options.error_rate = 0.0
+    stand_in.state.options.require_auth = True
+    url = _url("document", "sync_document", doc_type="certificate", doc_id=1)
+    assert requests.get(url).status_code == 401
+    assert requests.get(url, headers={"Authorization": "Bearer t"}).status_code == 200
+
+
+def test_load_period(stand_in):
+    url = _url("document", "load_period")
+    response = requests.get(url, params={"t": "declaration", "from": "2024-01-01", "to": "2024-01-07"})
+    assert response.json() == {"loaded": 70}
+    assert requests.get(url, params={"t": "declaration", "from": "2024-01-07", "to": "2024-01-01"}).status_code == 422
@@ -0,0 +1,64 @@
+import numpy as np
+import pytest
+
+from benchmarks.bench_transforms import _EDITABLE_COLS
+from src.manual_db_update.table_diff import diff_tables
+from src.ui.model import TableColumns
+from src.stand_in.data import make_search_page
+from src.ui.results_frame import format_search_results_frame
+
+
+@pytest.fixture
+def frames():
+    original = format_search_results_frame(make_search_page(10, 0, 10)["items"])
+    return original, original.copy()
+
+
+def test_only_selected_changed_rows(frames):
+    original, edited = frames
+    edited.loc[0, TableColumns.BRANDS] = "A, B"   # не выбрана
+    edited.loc[1, TableColumns.SELECT] = True     # выбрана, без изменений
+    edited.loc[2, TableColumns.SELECT] = True
+    edited.loc[2, TableColumns.PRODUCT] = "Сапоги"
+    edited.loc[2, TableColumns.TNVED] = " 6403,, 6404 "
+
+    result = diff_tables(edited, original, _EDITABLE_COLS)
+
+    assert (result.total_rows, result.selected_rows) == (10, 2)
+    [change] = result.changes
+    assert (change.position, change.doc_id) == (2, original.loc[2, TableColumns.ID])
+    assert change.doc_type == {"Д": "declaration", "С": "certificate"}[original.loc[2, TableColumns.TYPE]]
+    assert change.product == {"name": "Сапоги", "tnveds": ["6403", "6404"]}
+    assert change.branches is None
+
+
+def test_branches_change(frames):
+    original, edited = frames
+    edited.loc[3, TableColumns.SELECT] = True
+    edited.at[3, TableColumns.BRANCHES] = ["CN: Завод", "VN"]
+
+    [change] = diff_tables(edited, original, _EDITABLE_COLS).changes
+
+    assert change.product == {}
+    assert change.branches == ["CN: Завод", "VN"]
+
+
+@pytest.mark.parametrize("empty", [None, np.nan])
+def test_empty_list_cells_become_empty_lists(frames, empty):
+    original, edited = frames
+    edited.loc[4, TableColumns.SELECT] = True
+    edited.loc[4, TableColumns.GENDER] = empty
+    edited.loc[4, TableColumns.MATERIALS] = empty
+
+    [change] = diff_tables(edited, original, _EDITABLE_COLS).changes
+
+    assert change.product == {"genders": [], "materials": []}
+
+
+def test_nothing_selected(frames):
+    original, edited = frames
+    edited.loc[:, TableColumns.BRANDS] = "EDITED"
+
+    result = diff_tables(edited, original, _EDITABLE_COLS)
+
+    assert not result.changes and result.selected_rows == 0
@@ -0,0 +1,44 @@
+import pytest
+import requests
+
+from config.config import load_config
+from src.core.transport import ServiceTransport, get_transport
+
+
+def _sync_url():
+    return load_config().get_service_url("document", "sync_document", doc_type="certificate", doc_id=1)
+
+
+def test_read_timeout_is_not_retried(stand_in):
+    stand_in.state.options.latency_ms = 1000
+    transport = ServiceTransport("document", pool_size=2, timeout=0.3, max_retries=3)
+
+    with pytest.raises(requests.ReadTimeout):
+        transport.get(_sync_url())
+
+    assert stand_in.state.requests == {"sync_document": 1}
+
+
+def test_gateway_errors_are_retried(stand_in):
+    stand_in.state.options.error_rate = 1.0
+    transport = ServiceTransport("document", pool_size=2, timeout=5, max_retries=2)
+
+    assert transport.get(_sync_url()).status_code == 503
+    assert stand_in.state.requests == {"sync_document": 3}
+
+
+def test_no_retry_transport_sends_one_request(stand_in):
+    stand_in.state.options.error_rate = 1.0
+
+    assert get_transport("document", retries=False).get(_sync_url()).status_code == 503
+    assert stand_in.state.requests == {"sync_document": 1}
+
+
+def test_admin_triggers_are_sent_once(stand_in):
+    from src.api.api import _admin_get
+
+    stand_in.state.options.error_rate = 1.0
+    url = load_config().get_service_url("document", "load_period")
+
+    assert _admin_get(url, params={"t": "certificate", "from": "2024-01-01", "to": "2024-01-31"}).status_code == 503
+    assert stand_in.state.requests == {"load_period": 1}
@@ -0,0 +1,50 @@
+import pytest
+
+from src.core.write_overlay import apply_write_overlay, clear_write_overlay, record_write, write_overlay_stats
+
+
+@pytest.fixture(autouse=True)
+def _empty_overlay():
+    clear_write_overlay()
+    yield
+    clear_write_overlay()
+
+
+def _item(doc_id, doc_type="C", **product):
+    return {"ID": doc_id, "Type": doc_type, "Product": {"Name": "Обувь", **product}, "Manufacturer": {"Name": "ACME"}}
+
+
+def test_without_writes_returns_the_same_list():
+    items = [_item(1)]
+    assert apply_write_overlay(items) is items
+
+
+def test_overlays_only_the_written_document():
+    items = [_item(1), _item(1, "D"), _item(2)]
+    record_write("certificate", "1", {"product": {"name": "Сапоги", "tnveds": ["6403"]}})
+
+    result = apply_write_overlay(items)
+
+    assert result is not items
+    assert result[0]["Product"] == {"Name": "Сапоги", "Tnveds": ["6403"]}
+    assert result[1] is items[1] and result[2] is items[2]
+    assert items[0]["Product"] == {"Name": "Обувь"}
+
+
+def test_repeated_writes_are_merged():
+    record_write("certificate", 1, {"product": {"name": "Сапоги"}})
+    record_write("certificate", 1, {"product": {"brands": ["ACME"]}, "manufacturer": {"branches": [{"country": "CN"}]}})
+
+    [item] = apply_write_overlay([_item(1)])
+
+    assert item["Product"]["Name"] == "Сапоги"
+    assert item["Product"]["Brands"] == ["ACME"]
+    assert item["Manufacturer"] == {"Name": "ACME", "Branches": [{"Country": "CN"}]}
+
+
+def test_entry_is_dropped_once_search_has_the_values():
+    record_write("certificate", 1, {"product": {"name": "Сапоги"}})
+    fresh = [_item(1, Name="Сапоги")]
+
+    assert apply_write_overlay(fresh) is fresh
+    assert write_overlay_stats()["entries"] == 0